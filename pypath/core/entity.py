@@ -24,13 +24,13 @@ A molecular entity is defined by its identifier, type and taxon.
 
 from future.utils import iteritems
 
+import sys
 import itertools
 import importlib as imp
 import collections
 
 import pypath.share.common as common
 import pypath_common._constants as _const
-import pypath.share.session as session_mod
 import pypath.utils.mapping as mapping
 import pypath.share.settings as settings
 import pypath.core.attrs as attrs_mod
@@ -47,11 +47,15 @@ EntityKey = collections.namedtuple(
 )
 
 
-class Entity(session_mod.Logger, attrs_mod.AttributeHandler):
+class Entity(attrs_mod.AttributeHandler):
     """
     Represents a molecular entity such as protein, miRNA, lncRNA or small
     molecule.
 
+    The instances have no ``__dict__``, only the attributes listed in
+    ``__slots__``, and the string attributes are interned, as networks
+    contain many copies of the same entities.
+
     :arg str identifier:
         An identifier from the reference database e.g. UniProt ID for
         proteins.
@@ -92,6 +96,7 @@ class Entity(session_mod.Logger, attrs_mod.AttributeHandler):
     }
 
     _label_types = set(mapping.Mapper.label_type_to_id_type.keys())
+    _slot_names = set(__slots__) | set(attrs_mod.AttributeHandler.__slots__)
 
 
     def __init__(
@@ -128,6 +133,138 @@ class Entity(session_mod.Logger, attrs_mod.AttributeHandler):
         self.set_label()
 
 
+    @classmethod
+    def from_many(
+            cls,
+            identifiers,
+            entity_type = None,
+            id_type = None,
+            taxon = 9606,
+            attrs = None,
+            cache = None,
+        ):
+        """
+        Creates entities from many identifiers at once. The identifier and
+        entity types, the primary identifiers and the labels are looked up
+        only once for each distinct input, and identical entities without
+        attributes are represented by the same object.
+
+        :arg list identifiers:
+            Identifiers of the entities.
+        :arg str,list entity_type:
+            The entity type, either one for all identifiers, or a list with
+            one element for each identifier.
+        :arg str,list id_type:
+            The identifier type, one or a list, as above.
+        :arg int,list taxon:
+            The NCBI Taxonomy ID, one or a list, as above.
+        :arg NoneType,list attrs:
+            A list of attribute dicts, one for each identifier.
+        :arg NoneType,dict cache:
+            A dict to keep the resolved keys and labels, so they can be
+            reused across calls, e.g. while loading a resource.
+
+        :return:
+            A list of ``Entity`` objects in the order of ``identifiers``.
+        """
+
+        cache = {} if cache is None else cache
+
+        inputs = list(zip(
+            identifiers,
+            *(
+                param
+                    if isinstance(param, (list, tuple)) else
+                itertools.repeat(param)
+                for param in (id_type, entity_type, taxon)
+            )
+        ))
+
+        cls.resolve_many(inputs, cache = cache)
+
+        attrs = itertools.repeat(None) if attrs is None else attrs
+        shared = {}
+        result = []
+
+        for inp, _attrs in zip(inputs, attrs):
+
+            key, label = cache[inp]
+
+            if _attrs:
+
+                result.append(cls.from_key(key, label, attrs = _attrs))
+
+            else:
+
+                if key not in shared:
+
+                    shared[key] = cls.from_key(key, label)
+
+                result.append(shared[key])
+
+        return result
+
+
+    @classmethod
+    def resolve_many(cls, inputs, cache = None):
+        """
+        Resolves the keys and labels of entities, doing the lookups only
+        once for each distinct input.
+
+        :arg iterable inputs:
+            Tuples of identifier, identifier type, entity type and taxon,
+            as the arguments of ``Entity``.
+        :arg NoneType,dict cache:
+            A dict of already resolved inputs, it will be updated by the
+            new ones.
+
+        :return:
+            The cache, a dict with the input tuples as keys, and tuples of
+            ``EntityKey`` and label as values.
+        """
+
+        cache = {} if cache is None else cache
+        labels = {}
+
+        for inp in inputs:
+
+            if inp in cache:
+
+                continue
+
+            key = cls._resolve(*inp)
+
+            if key not in labels:
+
+                labels[key] = cls._get_label(*key)
+
+            cache[inp] = (key, labels[key])
+
+        return cache
+
+
+    @classmethod
+    def from_key(cls, key, label = None, attrs = None):
+        """
+        Creates an entity from an already resolved key, without any lookup.
+
+        :arg EntityKey key:
+            The key of the entity, as returned by ``resolve_many``.
+        :arg str label:
+            The label of the entity, by default the identifier.
+        :arg NoneType,dict attrs:
+            A dictionary of additional attributes.
+        """
+
+        new = cls.__new__(cls)
+        new.identifier, new.id_type, new.entity_type, new.taxon = key
+        new.key = EntityKey(*key)
+        new.label = label or new.identifier
+        attrs_mod.AttributeHandler.__init__(new, attrs)
+
+        return new
+
+
     def reload(self):
 
         modname = self.__class__.__module__
@@ -140,7 +277,22 @@ class Entity(session_mod.Logger, attrs_mod.AttributeHandler):
 
     def _bootstrap(self, identifier, id_type, entity_type, taxon):
 
-        if self._is_complex(identifier):
+        (
+            self.identifier,
+            self.id_type,
+            self.entity_type,
+            self.taxon,
+        ) = self._resolve(identifier, id_type, entity_type, taxon)
+
+
+    @classmethod
+    def _resolve(cls, identifier, id_type, entity_type, taxon):
+        """
+        Guesses the missing identifier and entity types, translates labels
+        to primary identifiers and returns the key of the entity.
+        """
+
+        if cls._is_complex(identifier):
 
             entity_type = 'complex'
             id_type = 'complex'
@@ -150,7 +302,7 @@ class Entity(session_mod.Logger, attrs_mod.AttributeHandler):
                 taxon
             )
 
-        if entity_type in self._smol_types:
+        if entity_type in cls._smol_types:
 
             taxon = _const.NOT_ORGANISM_SPECIFIC
 
@@ -158,9 +310,9 @@ class Entity(session_mod.Logger, attrs_mod.AttributeHandler):
 
         if not entity_type:
 
-            if id_type and id_type in self._id_type_to_entity_type:
+            if id_type and id_type in cls._id_type_to_entity_type:
 
-                entity_type = self._id_type_to_entity_type[id_type]
+                entity_type = cls._id_type_to_entity_type[id_type]
 
 
         if not id_type:
@@ -174,7 +326,7 @@ class Entity(session_mod.Logger, attrs_mod.AttributeHandler):
 
             id_type, entity_type = 'genesymbol', 'protein'
 
-        if id_type in self._label_types:
+        if id_type in cls._label_types:
 
             _identifier = mapping.id_from_label0(
                 label = identifier,
@@ -203,12 +355,44 @@ class Entity(session_mod.Logger, attrs_mod.AttributeHandler):
                     identifier = _identifier
                     id_type = 'mirbase'
 
-        entity_type = entity_type or self._get_entity_type(identifier)
+        entity_type = entity_type or cls._get_entity_type(identifier)
 
-        self.identifier = identifier
-        self.id_type = id_type
-        self.entity_type = entity_type
-        self.taxon = taxon
+        return EntityKey(
+            identifier = cls._intern(identifier),
+            id_type = cls._intern(id_type),
+            entity_type = cls._intern(entity_type),
+            taxon = taxon,
+        )
+
+
+    @staticmethod
+    def _intern(value):
+
+        return sys.intern(value) if isinstance(value, str) else value
+
+
+    def __setstate__(self, state):
+        """
+        Restores the attributes from a pickle, including pickles created
+        by earlier versions where entities had a ``__dict__``.
+        """
+
+        dict_state, slot_state = (
+            state
+                if isinstance(state, tuple) else
+            (state, None)
+        )
+
+        for attr, value in itertools.chain(
+            iteritems(dict_state or {}),
+            iteritems(slot_state or {}),
+        ):
+
+            # attributes not in the slots, e.g. the ones of the former
+            # `Logger` base class, are dropped
+            if attr in self._slot_names:
+
+                setattr(self, attr, self._intern(value))
 
 
     @staticmethod
@@ -461,23 +645,34 @@ class Entity(session_mod.Logger, attrs_mod.AttributeHandler):
 
     def set_label(self):
 
-        if self.entity_type in self._smol_types:
+        self.label = self._get_label(
+            self.identifier,
+            self.id_type,
+            self.entity_type,
+            self.taxon,
+        )
+
+
+    @classmethod
+    def _get_label(cls, identifier, id_type, entity_type, taxon):
+
+        if entity_type in cls._smol_types:
 
             #  Small-molecule labels are disabled for now: the name
             #  sources are unavailable (RaMP API down, HMDB behind
             #  Cloudflare). Use the identifier (e.g. PubChem CID) as the
             #  label. TODO: restore preferred names once the RaMP/HMDB
             #  downloads are fixed/migrated.
-            self.label = self.identifier
+            return identifier
 
-            return
-
-        self.label = mapping.label(
-            name = self.identifier,
-            id_type = self.id_type,
-            ncbi_tax_id = self.taxon,
-            entity_type = self.entity_type,
-        ) or self.identifier
+        return cls._intern(
+            mapping.label(
+                name = identifier,
+                id_type = id_type,
+                ncbi_tax_id = taxon,
+                entity_type = entity_type,
+            ) or identifier
+        )
 
 
     def __repr__(self):
@@ -29,7 +29,7 @@ from __future__ import annotations
 
 from future.utils import iteritems
 
-from typing import Literal
+from typing import Callable, Literal
 
 import importlib as imp
 import collections
@@ -42,6 +42,7 @@ import pypath.core.evidence as pypath_evidence
 import pypath.internals.resource as pypath_resource
 import pypath.share.session as session_mod
 import pypath.share.common as common
+import pypath_common._constants as _const
 import pypath.utils.mapping as mapping
 import pypath.core.entity as entity
 import pypath.core.attrs as attrs_mod
@@ -973,6 +974,41 @@ class Interaction(attrs_mod.AttributeHandler):
         )
 
 
+    def remove_evidences(
+            self,
+            resource = None,
+            interaction_type = None,
+            via = False,
+        ):
+        """
+        Removes the evidences of a resource from all directions and
+        effects. If no evidence remains, the interaction is empty.
+
+        :arg str,set,NetworkResource resource:
+            Name(s) of the resource(s) or a resource object.
+        :arg str interaction_type:
+            Remove only the evidences of this interaction type.
+        :arg bool,str via:
+            ``False`` for only primary resources, ``None`` for both
+            primary and secondary resources, or the name of a primary
+            resource of the secondary resources.
+        """
+
+        for evs in itertools.chain(
+            (self.evidences,),
+            self.direction.values(),
+            self.positive.values(),
+            self.negative.values(),
+            self.unknown_effect.values(),
+        ):
+
+            evs.remove(
+                resource = resource,
+                interaction_type = interaction_type,
+                via = via,
+            )
+
+
     def unset_interaction_type(self, interaction_type):
         """
         Removes all evidences with a certain ``interaction_type``.
@@ -2057,6 +2093,47 @@ class Interaction(attrs_mod.AttributeHandler):
         return new
 
 
+    def translate_entities(self, new_a, new_b):
+        """
+        Creates a copy of this interaction between two other entities,
+        with all evidences by direction and sign. Like ``translate``, but
+        for ready ``Entity`` objects.
+
+        :arg Entity new_a:
+            The entity replacing the endpoint ``a``.
+        :arg Entity new_b:
+            The entity replacing the endpoint ``b``.
+        """
+
+        new = Interaction(a = new_a, b = new_b, attrs = self.attrs)
+
+        new.evidences += self.evidences
+
+        # the old directions corresponding to the new ones;
+        # loop edges are handled as in `translate`
+        old_a_b, old_b_a = (
+            (self.a_b, self.b_a)
+                if new.a == new.b or new.a is new_a else
+            (self.b_a, self.a_b)
+        )
+
+        for (old_dir, new_dir), attr in itertools.product(
+            zip(
+                (old_a_b, old_b_a, 'undirected'),
+                (new.a_b, new.b_a, 'undirected'),
+            ),
+            ('direction', 'positive', 'negative'),
+        ):
+
+            if old_dir == 'undirected' and attr != 'direction':
+
+                continue
+
+            getattr(new, attr)[new_dir] += getattr(self, attr)[old_dir]
+
+        return new
+
+
     def orthology_translate_one(self, id_a, id_b, taxon):
 
         return self.translate(
@@ -2085,8 +2162,7 @@ class Interaction(attrs_mod.AttributeHandler):
 
     def orthology_translate(self, taxon, exclude = None):
 
-        exclude = exclude or set()
-        exclude.add(0)
+        exclude = set(exclude or ()) | {0, _const.NOT_ORGANISM_SPECIFIC}
 
         for new_a, new_b in itertools.product(
             (self.a.identifier,)
@@ -3090,6 +3166,7 @@ class Interaction(attrs_mod.AttributeHandler):
             self,
             by_source: bool = False,
             with_references: bool = False,
+            record: Callable = InteractionDataFrameRecord,
         ):
         """
         Yields interaction records. It is a generator because one edge can
@@ -3108,6 +3185,12 @@ class Interaction(attrs_mod.AttributeHandler):
                 Include the literature references. By default is ``False``
                 because you rarely need these and they increase the data size
                 significantly.
+            record:
+                Called with the fields of each record as keyword arguments,
+                the generator yields its return values. By default creates
+                ``InteractionDataFrameRecord`` tuples; the ``append`` method
+                of ``InteractionDataFrameBuilder`` collects the fields into
+                column buffers instead.
         """
 
         def source_add_via(source, via):
@@ -3208,7 +3291,7 @@ class Interaction(attrs_mod.AttributeHandler):
 
                         for sources, refs in iter_sources(evs_sign):
 
-                            yield InteractionDataFrameRecord(
+                            yield record(
                                 id_a = _dir[0].identifier,
                                 id_b = _dir[1].identifier,
                                 type_a = _dir[0].entity_type,
@@ -3227,7 +3310,7 @@ class Interaction(attrs_mod.AttributeHandler):
 
                         for sources, refs in iter_sources(evs_without_sign):
 
-                            yield InteractionDataFrameRecord(
+                            yield record(
                                 id_a = _dir[0].identifier,
                                 id_b = _dir[1].identifier,
                                 type_a = _dir[0].entity_type,
@@ -3244,7 +3327,7 @@ class Interaction(attrs_mod.AttributeHandler):
 
                     for sources, refs in iter_sources(evs_undirected):
 
-                        yield InteractionDataFrameRecord(
+                        yield record(
                             id_a = self.a.identifier,
                             id_b = self.b.identifier,
                             type_a = self.a.entity_type,
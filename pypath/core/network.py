@@ -32,6 +32,9 @@ import itertools
 import functools
 import copy as copy_mod
 import pickle
+import io
+import multiprocessing
+import concurrent.futures
 import random
 import traceback
 from typing_extensions import Literal
@@ -44,12 +47,17 @@ import pypath.share.progress as progress
 import pypath.core.interaction as interaction_mod
 import pypath.core.evidence as evidence
 import pypath.core.entity as entity_mod
+import pypath.core.network_index as network_index
+import pypath.core.network_columnar as network_columnar
+import pypath.core.network_df as network_df
+import pypath.core.paths as paths_mod
 import pypath.core.common as core_common
 import pypath.share.common as common
 import pypath_common._constants as _const
 import pypath.share.settings as settings
 import pypath.share.cache as cache_mod
 import pypath.utils.mapping as mapping
+import pypath.utils.orthology as orthology
 import pypath.inputs.pubmed as pubmed_input
 import pypath.share.curl as curl
 import pypath.internals.refs as refs_mod
@@ -85,6 +93,10 @@ NetworkEntityCollection = collections.namedtuple(
 )
 NetworkEntityCollection.__new__.__defaults__ = (None,) * 8
 
+# the network and the resources loaded in parallel, inherited by the
+# forked worker processes
+_parallel_load = None
+
 
 class NetworkEntityCollection(object):
 
@@ -230,7 +242,7 @@ class NetworkEntityCollection(object):
 
             shared_unique = (
                 self._add_total(
-                    common.shared_unique_foreach(collection, op = method),
+                    self._shared_unique_foreach(collection, op = method),
                     key = (
                         'all'
                             if level == 'interaction_type' else
@@ -296,7 +308,7 @@ class NetworkEntityCollection(object):
             (
                 key,
                 cls._add_total(
-                    common.shared_unique_foreach(val, op = method),
+                    cls._shared_unique_foreach(val, op = method),
                     key = total_key
                 )
             )
@@ -304,6 +316,23 @@ class NetworkEntityCollection(object):
         )
 
 
+    @staticmethod
+    def _shared_unique_foreach(dct, op = 'shared'):
+        """
+        For each set in a dict, the elements shared with any other set or
+        unique to this set. Counts the occurrences of the elements once,
+        instead of creating the union of the other sets for each set.
+        """
+
+        counts = collections.Counter(itertools.chain(*dct.values()))
+        shared = op == 'shared'
+
+        return {
+            key: {e for e in val if (counts[e] > 1) == shared}
+            for key, val in iteritems(dct)
+        }
+
+
     @staticmethod
     def _add_total(dct, key = None):
 
@@ -441,6 +470,7 @@ class Network(session_mod.Logger):
             df_columns = None,
             df_dtype = None,
             pickle_file = None,
+            arrow_dir = None,
             ncbi_tax_id = 9606,
             allow_loops = None,
             **kwargs
@@ -467,6 +497,11 @@ class Network(session_mod.Logger):
             self.load_from_pickle(pickle_file = pickle_file)
             return
 
+        if arrow_dir and os.path.isdir(arrow_dir):
+
+            self.load_from_arrow(path = arrow_dir)
+            return
+
         self.load(resources = resources, make_df = make_df, **kwargs)
 
 
@@ -530,6 +565,11 @@ class Network(session_mod.Logger):
         self.nodes = {}
         self.nodes_by_label = {}
         self.interactions_by_nodes = collections.defaultdict(set)
+        self._index = None
+        self._ref_index = None
+        self._by_resource = None
+        self._summaries_cache = None
+        self._summaries_dirty = set()
 
 
     def load(
@@ -544,8 +584,10 @@ class Network(session_mod.Logger):
             cache_files = None,
             only_directions = False,
             pickle_file = None,
+            arrow_dir = None,
             allow_loops = None,
             first_n = None,
+            workers = None,
         ):
         """
         Loads data from a network resource or a collection of resources.
@@ -565,6 +607,16 @@ class Network(session_mod.Logger):
         :arg NoneType,set exclude:
             A *set* of resource names to be ignored. It is useful if you want
             to load a collection with the exception of a few resources.
+        :arg int workers:
+            Number of processes to read the resources in parallel. The
+            download, processing and ID translation of the resources run in
+            the worker processes, while the interactions are added to the
+            network in this process, in the same order as in sequential
+            loading, hence the result is the same. By default the
+            ``network_load_workers`` setting; if it is not set or less than
+            2, the resources are loaded one by one. Requires the ``fork``
+            start method of ``multiprocessing``, i.e. it is not available
+            on Windows.
         """
 
         if pickle_file:
@@ -572,16 +624,62 @@ class Network(session_mod.Logger):
             self.load_from_pickle(pickle_file = pickle_file)
             return
 
+        if arrow_dir:
+
+            self.load_from_arrow(path = arrow_dir)
+            return
+
         kwargs = {
             'reread': reread,
             'redownload': redownload,
             'keep_raw': keep_raw,
-            'top_call': False,
             'only_directions': only_directions,
             'allow_loops': allow_loops,
             'first_n': first_n,
         }
 
+        resources = list(self._iter_resources(resources, exclude = exclude))
+        workers = int(workers or settings.get('network_load_workers') or 0)
+
+        if (
+            workers > 1 and
+            len(resources) > 1 and
+            'fork' not in multiprocessing.get_all_start_methods()
+        ):
+
+            self._log(
+                'Parallel loading requires the `fork` start method, '
+                'not available on this platform. Loading the resources '
+                'one by one.'
+            )
+            workers = 0
+
+        if workers > 1 and len(resources) > 1:
+
+            self._load_parallel(resources, workers = workers, **kwargs)
+
+        else:
+
+            for resource in resources:
+
+                self.load_resource(resource, **kwargs)
+
+        if make_df and top_call:
+
+            self.make_df()
+
+
+    def _iter_resources(self, resources, exclude = None):
+        """
+        Network resource definitions from collections of resources, in the
+        order they are loaded.
+
+        :arg str,dict,list,resource.NetworkResource resources:
+            Resource definitions as accepted by ``load``.
+        :arg NoneType,set exclude:
+            Names of the resources to skip.
+        """
+
         exclude = common.to_set(exclude)
 
         resources = (
@@ -599,29 +697,26 @@ class Network(session_mod.Logger):
                 hasattr(network_resources, resource)
             ):
 
-                self.load(
-                    resources = getattr(network_resources, resource),
-                    **kwargs
+                yield from self._iter_resources(
+                    getattr(network_resources, resource),
+                    exclude = exclude,
                 )
 
             elif isinstance(resource, (list, dict, tuple, set)):
 
-                self.load(
-                    resources = resource,
-                    **kwargs
-                )
+                yield from self._iter_resources(resource, exclude = exclude)
 
-            elif (
-                isinstance(
-                    resource,
-                    (
-                        input_formats.NetworkInput,
-                        resource_formats.NetworkResource,
-                    )
-                ) and resource.name not in exclude
+            elif isinstance(
+                resource,
+                (
+                    input_formats.NetworkInput,
+                    resource_formats.NetworkResource,
+                )
             ):
 
-                self.load_resource(resource, **kwargs)
+                if resource.name not in exclude:
+
+                    yield resource
 
             elif resource is not None:
 
@@ -630,9 +725,77 @@ class Network(session_mod.Logger):
                     'definition: `%s`.' % str(resource)
                 )
 
-        if make_df and top_call:
 
-            self.make_df()
+    def _load_parallel(
+            self,
+            resources,
+            workers,
+            only_directions = False,
+            allow_loops = None,
+            **kwargs
+        ):
+        """
+        Reads the resources in worker processes and adds their interactions
+        to the network in the order of ``resources``.
+
+        The workers are forked from this process, hence they inherit the
+        resource definitions (which might contain lambdas), the mapping
+        tables and all other state. The edge lists are sent back by
+        ``pickle``, with the resource definitions replaced by references
+        to the objects in this process, hence the evidences of the
+        interactions refer to the same resource objects as in sequential
+        loading.
+        """
+
+        global _parallel_load
+
+        self._log(
+            'Loading %u resources in %u worker processes.' % (
+                len(resources),
+                workers,
+            )
+        )
+
+        _parallel_load = (self, resources, kwargs)
+        context = multiprocessing.get_context('fork')
+
+        try:
+
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers = min(workers, len(resources)),
+                mp_context = context,
+            ) as executor:
+
+                # results are yielded in the order of the resources,
+                # while the workers keep reading the next ones
+                for resource, data in zip(
+                    resources,
+                    executor.map(_read_resource_worker, range(len(resources))),
+                ):
+
+                    if data is None:
+
+                        continue
+
+                    edge_list = _EdgeListUnpickler(
+                        io.BytesIO(data),
+                        resource,
+                    ).load()
+
+                    if kwargs.get('keep_raw'):
+
+                        self._keep_raw(resource.networkinput, edge_list)
+
+                    self.edge_list_mapped = edge_list
+                    self._add_resource(
+                        resource,
+                        only_directions = only_directions,
+                        allow_loops = allow_loops,
+                    )
+
+        finally:
+
+            _parallel_load = None
 
 
     # synonyms (old method names of PyPath)
@@ -686,6 +849,37 @@ class Network(session_mod.Logger):
             Load only the first n interactions.
         """
 
+        if self._read_resource_attempts(
+            resource,
+            reread = reread,
+            redownload = redownload,
+            keep_raw = keep_raw,
+            first_n = first_n,
+        ):
+
+            self._add_resource(
+                resource,
+                only_directions = only_directions,
+                allow_loops = allow_loops,
+            )
+
+
+    def _read_resource_attempts(
+            self,
+            resource,
+            reread = None,
+            redownload = None,
+            keep_raw = False,
+            first_n = None,
+        ):
+        """
+        Reads a resource by ``_read_resource``, retrying as many times as
+        the ``network_load_resource_attempts`` setting allows.
+
+        :return:
+            ``True`` if the resource has been read successfully.
+        """
+
         total_attempts = settings.get('network_load_resource_attempts')
 
         for attempt in range(total_attempts):
@@ -727,7 +921,21 @@ class Network(session_mod.Logger):
                         f'Not loading `{resource.name}`: giving up after '
                         f'{total_attempts} attempts.'
                     )
-                    return
+                    return False
+
+        return True
+
+
+    def _add_resource(
+            self,
+            resource,
+            only_directions = False,
+            allow_loops = None,
+        ):
+        """
+        Adds the interactions read from a resource by ``_read_resource``
+        to the network.
+        """
 
         allow_loops = self._allow_loops(
             allow_loops = allow_loops,
@@ -1431,11 +1639,25 @@ class Network(session_mod.Logger):
 
         if keep_raw:
 
-            self.raw_data[networkinput.name] = edge_list_mapped
+            self._keep_raw(networkinput, edge_list_mapped)
 
         self.edge_list_mapped = edge_list_mapped
 
 
+    def _keep_raw(self, networkinput, edge_list):
+        """
+        Keeps the edge list of a resource in ``raw_data``, under the name of
+        its input. ``raw_data`` is emptied after adding each resource to the
+        network, hence it's created again if necessary.
+        """
+
+        if self.raw_data is None:
+
+            self.raw_data = {}
+
+        self.raw_data[networkinput.name] = edge_list
+
+
     def _lookup_cache(self, name, cache_files, int_cache, edges_cache):
         """
         Checks up the cache folder for the files of a given resource.
@@ -2042,6 +2264,24 @@ class Network(session_mod.Logger):
 
         self._filtered_loops = 0
 
+        if not isinstance(edge_list, list):
+
+            edge_list = list(edge_list)
+
+        # one lookup for each distinct node of the resource
+        self._entity_cache = entity_mod.Entity.resolve_many(
+            (
+                (
+                    e['default_name_%s' % side],
+                    e['default_name_type_%s' % side],
+                    e['entity_type_%s' % side],
+                    e['taxon_%s' % side],
+                )
+                for e in edge_list
+                for side in ('a', 'b')
+            )
+        )
+
         prg = progress.Progress(
             iterable = edge_list,
             name = 'Processing interactions',
@@ -2068,6 +2308,7 @@ class Network(session_mod.Logger):
             self._log('Loop edges discarded: %u' % self._filtered_loops)
 
         delattr(self, '_filtered_loops')
+        delattr(self, '_entity_cache')
 
         self.raw_data = None
 
@@ -2164,19 +2405,13 @@ class Network(session_mod.Logger):
 
         refs = {refs_mod.Reference(pmid) for pmid in refs}
 
-        entity_a = entity_mod.Entity(
-            identifier = id_a,
-            id_type = id_type_a,
-            entity_type = entity_type_a,
-            taxon = taxon_a,
-            attrs = extra_attrs_a,
-        )
-        entity_b = entity_mod.Entity(
-            identifier = id_b,
-            id_type = id_type_b,
-            entity_type = entity_type_b,
-            taxon = taxon_b,
-            attrs = extra_attrs_b,
+        entity_a, entity_b = entity_mod.Entity.from_many(
+            identifiers = (id_a, id_b),
+            id_type = (id_type_a, id_type_b),
+            entity_type = (entity_type_a, entity_type_b),
+            taxon = (taxon_a, taxon_b),
+            attrs = (extra_attrs_a, extra_attrs_b),
+            cache = getattr(self, '_entity_cache', None),
         )
 
         interaction = interaction_mod.Interaction(
@@ -2338,6 +2573,35 @@ class Network(session_mod.Logger):
         return len(self.interactions)
 
 
+    @property
+    def records(self) -> list | None:
+        """
+        The records of the interactions data frame. If the data frame has
+        been built column wise (``make_df`` without ``records``), the
+        records are generated at the first access. If the interactions
+        changed after ``make_df`` and before the first access, the records
+        are not available (``None``), as they would not match ``df``.
+        """
+
+        if (
+            getattr(self, '_records', None) is None and
+            getattr(self, '_records_args', None) is not None
+        ):
+
+            self._records = list(
+                self.generate_df_records(**self._records_args)
+            )
+
+        return getattr(self, '_records', None)
+
+
+    @records.setter
+    def records(self, records):
+
+        self._records = records
+        self._records_args = None
+
+
     def make_df(
             self,
             records = None,
@@ -2360,6 +2624,8 @@ class Network(session_mod.Logger):
         )
         columns = columns or self.df_columns
         dtype = dtype or self.df_dtype
+        # the builder creates the columns with the default types
+        custom_dtype = bool(dtype)
 
         if not dtype:
 
@@ -2377,11 +2643,29 @@ class Network(session_mod.Logger):
 
         if not records:
 
-            records = self.generate_df_records(
+            # the records are generated only if accessed, see ``records``
+            self._records = None
+            self._records_args = {
+                'by_source': by_source,
+                'with_references': with_references,
+            }
+            self.dtype = dtype
+            self.df = self.df_builder(
                 by_source = by_source,
                 with_references = with_references,
+            ).to_pandas(columns = columns)
+
+            if custom_dtype:
+
+                self.df = self.df.astype(dtype)
+
+            self._log(
+                'Interaction data frame ready. '
+                'Memory usage: %s ' % common.df_memory_usage(self.df)
             )
 
+            return
+
         if not isinstance(records, (list, tuple, np.ndarray)):
 
             records = list(records)
@@ -2409,6 +2693,46 @@ class Network(session_mod.Logger):
         )
 
 
+    def df_builder(
+            self,
+            by_source = False,
+            with_references = False,
+        ) -> network_df.InteractionDataFrameBuilder:
+        """
+        Collects the records of all interactions into column buffers.
+        The data frame or Arrow table can be created by the ``to_pandas``
+        or ``to_arrow`` methods of the returned object.
+        """
+
+        builder = network_df.InteractionDataFrameBuilder(
+            by_source = by_source,
+            with_references = with_references,
+        )
+        builder.add_interactions(self.interactions.values())
+
+        return builder
+
+
+    def make_arrow_table(self, by_source = None, with_references = None):
+        """
+        Creates a ``pyarrow.Table`` from the interactions, with the same
+        columns as the data frame created by ``make_df``. The categorical
+        columns are dictionary encoded, the set valued columns (sources,
+        data models and references) are list columns.
+        """
+
+        return self.df_builder(
+            by_source = (
+                by_source if by_source is not None else self.df_by_source
+            ),
+            with_references = (
+                with_references
+                    if with_references is not None else
+                self.df_with_references
+            ),
+        ).to_arrow(columns = self.df_columns)
+
+
     def get_df(self):
 
         if not hasattr(self, 'df'):
@@ -2562,6 +2886,15 @@ class Network(session_mod.Logger):
         self.interactions_by_nodes[interaction.a].add(key)
         self.interactions_by_nodes[interaction.b].add(key)
 
+        if getattr(self, '_by_resource', None) is not None:
+
+            for res_key in interaction.evidences.evidences:
+
+                self._by_resource[res_key.name].add(key)
+
+        self._touch_summaries(interaction)
+        self._touch_index(key)
+
 
     def add_node(self, entity, attrs = None, add = True):
         """
@@ -2637,13 +2970,17 @@ class Network(session_mod.Logger):
         key_ab = (entity_a, entity_b)
         key_ba = (entity_b, entity_a)
 
-        _ = self.interactions.pop(key_ab, None)
-        _ = self.interactions.pop(key_ba, None)
+        self._touch_summaries(self.interactions.pop(key_ab, None))
+        self._touch_summaries(self.interactions.pop(key_ba, None))
 
         keys = {key_ab, key_ba}
         self.interactions_by_nodes[entity_a] -= keys
         self.interactions_by_nodes[entity_b] -= keys
 
+        for key in keys:
+
+            self._touch_index(key)
+
         if (
             entity_a in self.interactions_by_nodes and
             not self.interactions_by_nodes[entity_a]
@@ -2716,6 +3053,117 @@ class Network(session_mod.Logger):
         )
 
 
+    def _interaction_keys_by_resource(self) -> dict[str, set]:
+        """
+        Keys of the interactions by the names of the resources of their
+        evidences. Created at the first access and updated when
+        interactions are added. It might contain keys of interactions
+        removed since, or not supported by the resource anymore.
+        """
+
+        if getattr(self, '_by_resource', None) is None:
+
+            self._by_resource = collections.defaultdict(set)
+
+            for key, ia in iteritems(self.interactions):
+
+                for res_key in ia.evidences.evidences:
+
+                    self._by_resource[res_key.name].add(key)
+
+        return self._by_resource
+
+
+    def remove_resource(self, resource, interaction_type = None, via = None):
+        """
+        Removes the evidences of a resource. The interactions left without
+        evidences are removed, and so are the nodes left without
+        interactions. Only the interactions of the resource are visited.
+
+        :arg str,NetworkResource resource:
+            Name of the resource or a resource object. For an object, only
+            the evidences with its exact key (name, interaction type, data
+            model and primary resource) are removed.
+        :arg str interaction_type:
+            Remove only the evidences of this interaction type.
+        :arg bool,str via:
+            By default both the primary and secondary evidences of the
+            resource are removed; ``False`` for only primary ones, or the
+            name of a primary resource to remove only the evidences from
+            the resource via that primary resource.
+        """
+
+        name = getattr(resource, 'name', resource)
+        keys = self._interaction_keys_by_resource().pop(name, set())
+        n_removed = 0
+
+        if getattr(self, '_summaries_cache', None) is not None:
+
+            self._summaries_dirty.add(name)
+
+        self._log(
+            'Removing the evidences of resource `%s` from '
+            'up to %u interactions.' % (name, len(keys))
+        )
+
+        for key in keys:
+
+            ia = self.interactions.get(key, None)
+
+            if ia is None:
+
+                continue
+
+            ia.remove_evidences(
+                resource = resource,
+                interaction_type = interaction_type,
+                via = via,
+            )
+            self._touch_index(key)
+
+            if not ia.evidences:
+
+                self.remove_interaction(*key)
+                n_removed += 1
+
+            elif any(
+                res_key.name == name
+                for res_key in ia.evidences.evidences
+            ):
+
+                # other evidences of the resource remained
+                self._by_resource[name].add(key)
+
+        self._log(
+            'Removed the evidences of resource `%s`, %u interactions '
+            'have been removed, %u nodes and %u interactions '
+            'remained.' % (name, n_removed, self.vcount, self.ecount)
+        )
+
+
+    def refresh_resource(self, resource, **kwargs):
+        """
+        Replaces the data of a resource by loading it again: removes its
+        evidences and loads the resource.
+
+        :arg str,list,NetworkResource resource:
+            One or more resource definitions, as accepted by ``load``.
+        :arg kwargs:
+            Passed to ``load``, e.g. ``redownload = True`` to download a
+            new release of the resource.
+        """
+
+        for res in self._iter_resources(resource):
+
+            self.remove_resource(
+                res
+                    if isinstance(res, resource_formats.NetworkResource) else
+                res.name
+            )
+
+        self.load(resources = resource, **kwargs)
+
+
     @property
     def resources(self):
         """
@@ -2956,6 +3404,92 @@ class Network(session_mod.Logger):
             self.interactions_by_nodes[ia.a].add(key)
             self.interactions_by_nodes[ia.b].add(key)
 
+        self._index = None
+        self._ref_index = None
+        self._by_resource = None
+        self._summaries_cache = None
+
+
+    @property
+    def index(self) -> network_index.NetworkIndex:
+        """
+        Array based index of the network graph: integer ids of the
+        entities, arrays of the interaction attributes and the adjacency
+        in CSR format. Created at the first access, and updated on access
+        after interactions have been added or removed. If you modify the
+        ``Interaction`` objects directly, call ``reindex``.
+        """
+
+        if getattr(self, '_index', None) is None:
+
+            self._index = network_index.NetworkIndex(self)
+
+        self._index.update()
+
+        return self._index
+
+
+    def reindex(self):
+        """
+        Discards the graph index, it will be rebuilt at the next access.
+        Also discards the reference and resource indexes and the
+        collections kept for the summaries.
+        """
+
+        self._index = None
+        self._ref_index = None
+        self._by_resource = None
+        self._summaries_cache = None
+
+
+    def _touch_summaries(self, interaction):
+        """
+        Marks the resources of an interaction as changed since the last
+        update of the summaries.
+        """
+
+        if (
+            interaction is not None and
+            getattr(self, '_summaries_cache', None) is not None
+        ):
+
+            self._summaries_dirty.update(
+                res_key.name
+                for res_key in interaction.evidences.evidences
+            )
+
+
+    @property
+    def reference_index(self) -> network_index.ReferenceIndex:
+        """
+        Interactions by literature references. Created at the first access,
+        and updated on access after interactions have been added, removed
+        or lost evidences. If you modify the ``Interaction`` objects
+        directly, call ``reindex``.
+        """
+
+        if getattr(self, '_ref_index', None) is None:
+
+            self._ref_index = network_index.ReferenceIndex(self)
+
+        self._ref_index.update()
+
+        return self._ref_index
+
+
+    def _touch_index(self, key):
+
+        # the records not generated yet would not match ``df`` any more
+        self._records_args = None
+
+        if getattr(self, '_index', None) is not None:
+
+            self._index.touch(key)
+
+        if getattr(self, '_ref_index', None) is not None:
+
+            self._ref_index.touch(key)
+
 
     def load_from_pickle(self, pickle_file):
         """
@@ -2980,6 +3514,54 @@ class Network(session_mod.Logger):
         self._log('Loaded from pickle `%s`.' % pickle_file)
 
 
+    def save_to_arrow(self, path: str):
+        """
+        Saves the network into a directory of Arrow IPC files: nodes,
+        interactions, evidences and resources tables. Unlike pickles, this
+        format does not depend on the version of the classes, and can be
+        loaded much faster. See :py:mod:`pypath.core.network_columnar`.
+
+        :arg str path:
+            Path to the directory.
+        """
+
+        self._log('Saving to Arrow files in `%s`.' % path)
+
+        network_columnar.save(self, path)
+
+
+    def load_from_arrow(self, path: str, references: bool = True):
+        """
+        Loads the network from a directory of Arrow IPC files created by
+        ``save_to_arrow``.
+
+        :arg str path:
+            Path to the directory.
+        :arg bool references:
+            Load the literature references of the evidences.
+        """
+
+        self._log('Loading from Arrow files in `%s`.' % path)
+
+        network_columnar.load(self, path, references = references)
+
+
+    @classmethod
+    def from_arrow(cls, path: str, **kwargs):
+        """
+        Initializes a new ``Network`` object by loading it from a directory
+        of Arrow IPC files. Returns a ``Network`` object.
+
+        Args
+            path:
+                Path to a directory created by ``save_to_arrow``.
+            kwargs:
+                Passed to ``Network.__init__``.
+        """
+
+        return cls(arrow_dir = path, **kwargs)
+
+
     @classmethod
     def from_pickle(cls, pickle_file: str, **kwargs):
         """
@@ -3237,13 +3819,7 @@ class Network(session_mod.Logger):
         higher number of interactions than ``threshold``.
         """
 
-        interactions_per_reference = self.numof_interactions_per_reference()
-
-        htp_refs = {
-            ref
-            for ref, cnt in iteritems(interactions_per_reference)
-            if cnt > threshold
-        }
+        htp_refs = set(self.reference_index.above(threshold))
 
         self._log('High-throughput references collected: %u' % len(htp_refs))
 
@@ -3259,20 +3835,15 @@ class Network(session_mod.Logger):
         """
 
         htp_refs = self.htp_references(threshold = threshold)
+        htp_int = self.reference_index.only_cited_by(htp_refs)
 
-        htp_int = set()
-
-        for key, ia in iteritems(self.interactions):
-
-            if (
-                (
-                    not ignore_directed or
-                    not ia.is_directed()
-                ) and
-                not ia.get_references() - htp_refs
-            ):
+        if ignore_directed:
 
-                htp_int.add(key)
+            htp_int = {
+                key
+                for key in htp_int
+                if not self.interactions[key].is_directed()
+            }
 
         self._log('High-throughput interactions collected: %u' % len(htp_int))
 
@@ -3342,14 +3913,7 @@ class Network(session_mod.Logger):
         Returns a ``collections.Counter`` object (similar to ``dict``).
         """
 
-        return collections.Counter(
-            itertools.chain(
-                *(
-                    ia.get_references()
-                    for ia in self
-                )
-            )
-        )
+        return collections.Counter(self.reference_index.counts())
 
 
     def interactions_by_reference(self):
@@ -3358,15 +3922,11 @@ class Network(session_mod.Logger):
         described by each reference as values.
         """
 
-        interactions_by_reference = collections.defaultdict(set)
-
-        for i_key, ia in iteritems(self.interactions):
-
-            for ref in ia.get_references():
-
-                interactions_by_reference[ref].add(i_key)
-
-        return dict(interactions_by_reference)
+        return {
+            ref: keys.copy()
+            for ref, keys in
+            self.reference_index.by_reference.items()
+        }
 
     #
     # Methods for loading specific datasets or initializing the object
@@ -3827,6 +4387,7 @@ class Network(session_mod.Logger):
             via: bool | str | set[str] | None = None,
             references: bool | str | set[str] | None = None,
             silent: bool = False,
+            max_paths: int | None = None,
         ):
         """
         Find paths or motifs in a network.
@@ -3835,6 +4396,12 @@ class Network(session_mod.Logger):
         In addition is able to search for motifs or select the nodes of a
         subnetwork around certain nodes.
 
+        The search runs on the arrays of ``Network.index`` by the
+        ``pypath.core.paths`` module: the interaction filters are
+        evaluated once for each step, not at each node visited. The
+        paths are returned in the order of their length, each path
+        only once, and the entities not in the network are ignored.
+
         Args
             start:
                 Starting node(s) of the paths.
@@ -3854,7 +4421,9 @@ class Network(session_mod.Logger):
             minlen:
                 Minimum length of the path.
             silent:
-                Indicate progress by showing a progress bar.
+                Legacy parameter, has no effect at the moment.
+            max_paths:
+                Stop after this many paths have been found.
 
         Details
             The arguments: ``direction``, ``effect``, ``resources``,
@@ -3895,7 +4464,7 @@ class Network(session_mod.Logger):
             )
         """
 
-        def list_of_entities(entities):
+        def entity_ids(entities):
 
             entities = (
                 (entities,)
@@ -3906,9 +4475,14 @@ class Network(session_mod.Logger):
                 entities
             )
 
-            entities = [self.entity(en) for en in entities]
-
-            return entities
+            return [
+                i
+                for i in (
+                    index.entity_id(self.entity(en), add = False)
+                    for en in entities
+                )
+                if i is not None
+            ]
 
 
         def interaction_arg(value):
@@ -3925,57 +4499,7 @@ class Network(session_mod.Logger):
             return value
 
 
-        def find_all_paths_aux(start, end, path, maxlen = None):
-
-            path = path + [start]
-
-            if (
-                len(path) >= minlen + 1 and
-                (
-                    start == end or
-                    (
-                        end is None and
-                        not loops and
-                        len(path) == maxlen + 1
-                    ) or
-                    (
-                        loops and
-                        path[0] == path[-1]
-                    )
-                )
-            ):
-
-                return [path]
-
-            paths = []
-
-            if len(path) <= maxlen:
-
-                next_steps = set(
-                    self.partners(
-                        entity = start,
-                        **interaction_args[len(path) - 1]
-                    )
-                )
-
-                next_steps = next_steps if loops else next_steps - set(path)
-
-                for node in next_steps:
-
-                    paths.extend(
-                        find_all_paths_aux(
-                            node,
-                            end,
-                            path, maxlen
-                        )
-                    )
-
-            return paths
-
-
-        minlen = max(1, minlen)
-        start = list_of_entities(start)
-        end = list_of_entities(end) if end else (None,)
+        index = self.index
 
         interaction_args = {
             'mode': interaction_arg(mode),
@@ -3995,24 +4519,36 @@ class Network(session_mod.Logger):
             for i in range(maxlen)
         )
 
-        all_paths = []
-
-        if not silent:
-            prg = progress.Progress(
-                len(start) * len(end),
-                'Looking up all paths up to length %u' % maxlen, 1)
-
-        for s in start:
+        masks = []
 
-            for e in end:
+        for args in interaction_args:
 
-                if not silent:
-                    prg.step()
+            # the same criteria in more steps are evaluated only once
+            same = [
+                mask
+                for _args, mask in zip(interaction_args, masks)
+                if _args == args
+            ]
+            masks.append(
+                same[0] if same else paths_mod.arc_mask(index, **args)
+            )
 
-                all_paths.extend(find_all_paths_aux(s, e, [], maxlen))
+        all_paths = paths_mod.find_paths(
+            index,
+            start = entity_ids(start),
+            end = entity_ids(end) if end else None,
+            masks = masks,
+            loops = loops,
+            maxlen = maxlen,
+            minlen = minlen,
+            max_paths = max_paths,
+        )
 
-        if not silent:
-            prg.terminate()
+        all_paths = [
+            [index.entities[i] for i in path]
+            for paths in all_paths
+            for path in paths
+        ]
 
         return all_paths
 
@@ -4068,6 +4604,114 @@ class Network(session_mod.Logger):
         return dict(result) if by else result
 
 
+    def _collect_by_resource(self, whats, interactions = None, **kwargs):
+        """
+        Collects the values of several attributes by interaction type, data
+        model and resource, in one pass over the interactions.
+
+        Args
+            whats:
+                Names of the attributes, e.g. ``entities``.
+            interactions:
+                Visit only these interactions, by default all interactions
+                in the network.
+            kwargs:
+                Passed to methods of
+                :py:class:`pypath.interaction.Interaction`.
+        """
+
+        result = {what: collections.defaultdict(set) for what in whats}
+        methods = [
+            (
+                result[what],
+                getattr(
+                    interaction_mod.Interaction,
+                    self._get_by_method_name(
+                        what,
+                        'interaction_type_and_data_model_and_resource',
+                    ),
+                ),
+            )
+            for what in whats
+        ]
+
+        for ia in (self if interactions is None else interactions):
+
+            for collection, method in methods:
+
+                for grp, val in iteritems(method(ia, **kwargs)):
+
+                    collection[grp].update(val)
+
+        return result
+
+
+    def _summary_collections(self, whats, collect_args):
+        """
+        Collections for the summaries. The collections are kept: at the
+        next update only the resources changed since then are collected
+        again, visiting only their interactions.
+        """
+
+        cache_key = (tuple(whats), repr(sorted(collect_args.items())))
+        cache = getattr(self, '_summaries_cache', None)
+
+        if cache is None or cache[0] != cache_key:
+
+            collected = self._collect_by_resource(whats, **collect_args)
+
+        else:
+
+            collected = cache[1]
+            dirty = self._summaries_dirty
+
+            if dirty:
+
+                self._log(
+                    'Updating the collections of %u resources.' % len(dirty)
+                )
+
+                by_resource = self._interaction_keys_by_resource()
+                keys = set.union(
+                    set(),
+                    *(by_resource.get(name, ()) for name in dirty)
+                )
+                new = self._collect_by_resource(
+                    whats,
+                    interactions = (
+                        self.interactions[key]
+                        for key in keys
+                        if key in self.interactions
+                    ),
+                    **collect_args
+                )
+
+                for what in whats:
+
+                    collection = collected[what]
+
+                    for grp in [g for g in collection if g[-1] in dirty]:
+
+                        del collection[grp]
+
+                    collection.update(
+                        (grp, val)
+                        for grp, val in iteritems(new[what])
+                        if grp[-1] in dirty
+                    )
+
+        self._summaries_cache = (cache_key, collected)
+        self._summaries_dirty = set()
+
+        return {
+            what: NetworkEntityCollection(
+                collection = dict(collected[what]),
+                label = what,
+            )
+            for what in whats
+        }
+
+
     @classmethod
     def _generate_collect_methods(cls):
 
@@ -4247,15 +4891,12 @@ class Network(session_mod.Logger):
 
         self.summaries = []
 
-        coll = {}
-
         self._log('Updating summaries.')
 
-        for method in required.keys():
-
-            coll[method] = getattr(self, 'collect_%s' % method)(
-                **collect_args
-            )
+        coll = self._summary_collections(
+            whats = list(required.keys()),
+            collect_args = collect_args,
+        )
 
         for itype in self.get_interaction_types():
 
@@ -4354,6 +4995,24 @@ class Network(session_mod.Logger):
 
 
     def homology_translate(self, taxon, exclude = None):
+        """
+        Translates the network to another organism by orthologous genes.
+        Creates a new ``Network`` object.
+
+        The orthologs of each node are looked up only once, and the new
+        entities are created once for each ortholog. The interactions are
+        expanded to all combinations of the orthologs of their endpoints
+        by array operations on the node ids.
+
+        :arg int taxon:
+            NCBI Taxonomy ID of the target organism.
+        :arg set exclude:
+            NCBI Taxonomy IDs of organisms whose entities should not be
+            translated but kept as they are. Non organism specific
+            entities (e.g. small molecules, their taxon is
+            ``NOT_ORGANISM_SPECIFIC``, -1) are never translated, neither
+            the ones with taxon ``0``.
+        """
 
         self._log(
             'Translating network by homology from organism `%u` to `%u`.' % (
@@ -4362,25 +5021,86 @@ class Network(session_mod.Logger):
             )
         )
 
+        exclude = set(exclude or ()) | {0, _const.NOT_ORGANISM_SPECIFIC}
         new = Network(ncbi_tax_id = taxon)
+        interactions = list(self.interactions.values())
 
-        n_ia_translated = 0
-        entities_translated = set()
+        # integer ids for the nodes
+        nodes = {}
 
-        for ia in self:
+        for ia in interactions:
 
-            ia_translated = False
+            nodes.setdefault(ia.a, len(nodes))
+            nodes.setdefault(ia.b, len(nodes))
 
-            for new_ia in ia.orthology_translate(
-                taxon = taxon,
-                exclude = exclude,
-            ):
+        # orthologs of each node: new entities in one flat list,
+        # with the offsets for each node
+        entity_cache = {}
+        inputs = []
+        offsets = np.zeros(len(nodes) + 1, dtype = np.int64)
+
+        for e, i in iteritems(nodes):
+
+            if e.taxon in exclude:
+
+                new_ids, new_taxon = (e.identifier,), e.taxon
+
+            else:
+
+                new_ids = orthology.translate(
+                    identifiers = e.identifier,
+                    target = taxon,
+                    source = e.taxon,
+                )
+                new_taxon = taxon
+
+            inputs.extend(
+                (new_id, e.id_type, e.entity_type, new_taxon)
+                for new_id in sorted(new_ids)
+            )
+            offsets[i + 1] = len(inputs)
 
-                new.add_interaction(new_ia)
-                ia_translated = True
-                entities_translated.update(ia.get_entities())
+        entity_mod.Entity.resolve_many(inputs, cache = entity_cache)
+        new_entities = [
+            entity_mod.Entity.from_key(*entity_cache[inp])
+            for inp in inputs
+        ]
+
+        # expanding the interactions to the pairs of orthologs
+        ia_a = np.array(
+            [nodes[ia.a] for ia in interactions],
+            dtype = np.int64,
+        )
+        ia_b = np.array(
+            [nodes[ia.b] for ia in interactions],
+            dtype = np.int64,
+        )
+        n_orthologs = np.diff(offsets)
+        n_a = n_orthologs[ia_a]
+        n_b = n_orthologs[ia_b]
+        n_pairs = n_a * n_b
+        i_ia = np.repeat(np.arange(len(interactions)), n_pairs)
+        i_pair = (
+            np.arange(n_pairs.sum()) -
+            np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+        )
+        new_a = offsets[ia_a[i_ia]] + i_pair // n_b[i_ia]
+        new_b = offsets[ia_b[i_ia]] + i_pair % n_b[i_ia]
+
+        for i, a, b in zip(i_ia.tolist(), new_a.tolist(), new_b.tolist()):
+
+            new.add_interaction(
+                interactions[i].translate_entities(
+                    new_entities[a],
+                    new_entities[b],
+                )
+            )
 
-            n_ia_translated += ia_translated
+        n_ia_translated = len(np.unique(i_ia))
+        n_entities_translated = len(np.unique(np.concatenate((
+            ia_a[i_ia],
+            ia_b[i_ia],
+        ))))
 
         self._log(
             'Orthology translation ready. '
@@ -4390,9 +5110,9 @@ class Network(session_mod.Logger):
                 n_ia_translated,
                 len(self),
                 n_ia_translated / len(self) * 100,
-                len(entities_translated),
+                n_entities_translated,
                 len(self.nodes),
-                len(entities_translated) / len(self.nodes) * 100,
+                n_entities_translated / len(self.nodes) * 100,
             )
         )
 
@@ -4878,3 +5598,71 @@ def get_db(**kwargs):
         init_db(**kwargs)
 
     return globals()['db']
+
+
+class _EdgeListPickler(pickle.Pickler):
+    """
+    Pickles the edge list of a resource, replacing the resource definition
+    by a reference.
+    """
+
+    def __init__(self, file, resource):
+
+        pickle.Pickler.__init__(self, file, protocol = pickle.HIGHEST_PROTOCOL)
+        self._resource = resource
+        self._networkinput = getattr(resource, 'networkinput', None)
+
+
+    def persistent_id(self, obj):
+
+        return (
+            'resource'
+                if obj is self._resource else
+            'networkinput'
+                if obj is self._networkinput and obj is not None else
+            None
+        )
+
+
+class _EdgeListUnpickler(pickle.Unpickler):
+    """
+    Loads an edge list pickled by ``_EdgeListPickler``, restoring the
+    references to the resource definition.
+    """
+
+    def __init__(self, file, resource):
+
+        pickle.Unpickler.__init__(self, file)
+        self._resource = resource
+
+
+    def persistent_load(self, pid):
+
+        return (
+            self._resource
+                if pid == 'resource' else
+            self._resource.networkinput
+        )
+
+
+def _read_resource_worker(i):
+    """
+    Reads one resource in a worker process of ``Network._load_parallel``.
+
+    :return:
+        The pickled edge list, or ``None`` if the resource could not be
+        read.
+    """
+
+    network, resources, kwargs = _parallel_load
+    resource = resources[i]
+    kwargs = dict(kwargs, keep_raw = False)
+
+    if not network._read_resource_attempts(resource, **kwargs):
+
+        return None
+
+    buf = io.BytesIO()
+    _EdgeListPickler(buf, resource).dump(network.edge_list_mapped)
+
+    return buf.getvalue()
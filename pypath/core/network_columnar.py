@@ -0,0 +1,467 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Columnar (Arrow IPC) storage of :py:class:`pypath.core.network.Network`.
+
+A network is saved into a directory of four uncompressed Arrow IPC files:
+
+    * ``resources.arrow``: one row for each distinct resource
+    * ``nodes.arrow``: one row for each entity
+    * ``interactions.arrow``: the endpoints of the interactions, as row
+      numbers of the nodes table
+    * ``evidences.arrow``: one row for each evidence, with the interaction,
+      the evidence collection (slot) within the interaction, the resource,
+      and the references as a list column
+
+Free form attributes (``attrs``) of the objects, the resource attributes
+and the complexes are stored as pickled builtin objects in binary columns;
+the rest is plain data, hence the files do not depend on the classes of
+the current code. The files are memory mapped, the columns are read only
+when accessed, and the loader creates the objects in bulk, without any ID
+translation.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+
+import pyarrow as pa
+
+import pypath.share.session as session_mod
+import pypath.core.entity as entity_mod
+import pypath.core.evidence as evidence_mod
+import pypath.core.interaction as interaction_mod
+import pypath.internals.refs as refs_mod
+import pypath.internals.resource as resource_formats
+
+_logger = session_mod.Logger(name = 'network_columnar')
+_log = _logger._log
+
+__all__ = [
+    'FORMAT_VERSION',
+    'TABLES',
+    'SLOTS',
+    'save',
+    'read_tables',
+    'load',
+]
+
+#: Version of the format, stored in the metadata of each table.
+FORMAT_VERSION = '1'
+
+TABLES = ('resources', 'nodes', 'interactions', 'evidences')
+
+#: Evidence collections of an interaction: attribute name and direction,
+#: ``0`` for ``a -> b``, ``1`` for ``b -> a``.
+SLOTS = (
+    ('evidences', None),
+    ('direction', 0),
+    ('direction', 1),
+    ('direction', 'undirected'),
+    ('positive', 0),
+    ('positive', 1),
+    ('negative', 0),
+    ('negative', 1),
+    ('unknown_effect', 0),
+    ('unknown_effect', 1),
+)
+
+_RESOURCE_FIELDS = ('name', 'interaction_type', 'data_model', 'via', 'dataset')
+_METADATA_KEY = b'pypath_network_format'
+
+
+def _path(path: str, table: str) -> str:
+
+    return os.path.join(path, '%s.arrow' % table)
+
+
+def _pickled(obj) -> bytes | None:
+
+    return pickle.dumps(obj, protocol = pickle.HIGHEST_PROTOCOL) if obj else None
+
+
+def _unpickled(value: bytes | None):
+
+    return pickle.loads(value) if value else None
+
+
+def _strings(values: list) -> pa.DictionaryArray:
+
+    return pa.array(values, type = pa.string()).dictionary_encode()
+
+
+def _write(path: str, table: str, columns: dict):
+
+    tbl = pa.table(columns).replace_schema_metadata(
+        {_METADATA_KEY: FORMAT_VERSION.encode()}
+    )
+
+    with pa.OSFile(_path(path, table), 'wb') as fp:
+
+        with pa.ipc.new_file(fp, tbl.schema) as writer:
+
+            writer.write_table(tbl)
+
+
+def _slot_collection(ia, slot: tuple):
+
+    attr, direction = slot
+    collection = getattr(ia, attr)
+
+    if direction is None:
+
+        return collection
+
+    key = (
+        direction
+            if direction == 'undirected' else
+        ia.b_a
+            if direction else
+        ia.a_b
+    )
+
+    return collection[key]
+
+
+def save(network, path: str):
+    """
+    Saves a network into a directory of Arrow IPC files.
+
+    :arg network:
+        A :py:class:`pypath.core.network.Network` object.
+    :arg path:
+        Path to a directory, it will be created if does not exist; the
+        files in it will be overwritten.
+    """
+
+    os.makedirs(path, exist_ok = True)
+
+    # nodes
+    node_ids = {}
+    nodes = []
+    in_network = []
+
+    def add_node(e, is_node):
+
+        if e.key not in node_ids:
+
+            node_ids[e.key] = len(nodes)
+            nodes.append(e)
+            in_network.append(is_node)
+
+    for e in network.nodes.values():
+
+        add_node(e, True)
+
+    for ia in network.interactions.values():
+
+        add_node(ia.a, False)
+        add_node(ia.b, False)
+
+    is_complex = [e.entity_type == 'complex' for e in nodes]
+
+    _write(
+        path,
+        'nodes',
+        {
+            'identifier': _strings([str(e.identifier) for e in nodes]),
+            'id_type': _strings([e.id_type for e in nodes]),
+            'entity_type': _strings([e.entity_type for e in nodes]),
+            'taxon': pa.array([e.taxon for e in nodes], type = pa.int32()),
+            'label': pa.array(
+                [
+                    None if e.label is None else str(e.label)
+                    for e in nodes
+                ],
+                type = pa.string(),
+            ),
+            'in_network': pa.array(in_network, type = pa.bool_()),
+            'complex': pa.array(
+                [
+                    _pickled(e.identifier) if cplex else None
+                    for e, cplex in zip(nodes, is_complex)
+                ],
+                type = pa.binary(),
+            ),
+            'attrs': pa.array(
+                [_pickled(e.attrs) for e in nodes],
+                type = pa.binary(),
+            ),
+        },
+    )
+
+    # interactions and evidences
+    resource_ids = {}
+    resources = []
+    ia_a = []
+    ia_b = []
+    ia_attrs = []
+    ev_cols = {
+        'interaction': [],
+        'slot': [],
+        'resource': [],
+        'dataset': [],
+        'references': [],
+        'attrs': [],
+    }
+
+    for i, ia in enumerate(network.interactions.values()):
+
+        ia_a.append(node_ids[ia.a.key])
+        ia_b.append(node_ids[ia.b.key])
+        ia_attrs.append(_pickled(ia.attrs))
+
+        for slot_id, slot in enumerate(SLOTS):
+
+            for ev in _slot_collection(ia, slot):
+
+                if ev.resource.key not in resource_ids:
+
+                    resource_ids[ev.resource.key] = len(resources)
+                    resources.append(ev.resource)
+
+                ev_cols['interaction'].append(i)
+                ev_cols['slot'].append(slot_id)
+                ev_cols['resource'].append(resource_ids[ev.resource.key])
+                ev_cols['dataset'].append(ev.dataset)
+                ev_cols['references'].append(
+                    sorted(ref.pmid for ref in ev.references)
+                )
+                ev_cols['attrs'].append(_pickled(ev.attrs))
+
+    _write(
+        path,
+        'interactions',
+        {
+            'a': pa.array(ia_a, type = pa.int32()),
+            'b': pa.array(ia_b, type = pa.int32()),
+            'attrs': pa.array(ia_attrs, type = pa.binary()),
+        },
+    )
+
+    _write(
+        path,
+        'evidences',
+        {
+            'interaction': pa.array(ev_cols['interaction'], type = pa.int32()),
+            'slot': pa.array(ev_cols['slot'], type = pa.int8()),
+            'resource': pa.array(ev_cols['resource'], type = pa.int32()),
+            'dataset': _strings(ev_cols['dataset']),
+            'references': pa.array(
+                ev_cols['references'],
+                type = pa.list_(pa.string()),
+            ),
+            'attrs': pa.array(ev_cols['attrs'], type = pa.binary()),
+        },
+    )
+
+    _write(
+        path,
+        'resources',
+        dict(
+            [
+                (
+                    field,
+                    pa.array(
+                        [getattr(res, field) for res in resources],
+                        type = pa.string(),
+                    ),
+                )
+                for field in _RESOURCE_FIELDS
+            ] +
+            [
+                (
+                    'resource_attrs',
+                    pa.array(
+                        [_pickled(res.resource_attrs) for res in resources],
+                        type = pa.binary(),
+                    ),
+                ),
+            ]
+        ),
+    )
+
+    _log(
+        'Network with %u nodes and %u interactions saved to `%s`.' % (
+            len(network.nodes),
+            len(network.interactions),
+            path,
+        )
+    )
+
+
+def read_tables(path: str) -> dict[str, pa.Table]:
+    """
+    Opens the tables of a network saved by :py:func:`save`, memory mapped.
+
+    Nothing is read into memory until the columns are accessed, hence the
+    tables can be used for bulk queries without creating the objects.
+
+    :return:
+        A dict with the table names as keys and ``pyarrow.Table`` objects
+        as values.
+
+    :raises ValueError:
+        If the tables have been written by a different version of the
+        format.
+    """
+
+    tables = {}
+
+    for table in TABLES:
+
+        source = pa.memory_map(_path(path, table), 'r')
+        tbl = pa.ipc.open_file(source).read_all()
+        version = (tbl.schema.metadata or {}).get(_METADATA_KEY, b'').decode()
+
+        if version != FORMAT_VERSION:
+
+            raise ValueError(
+                'The table `%s` in `%s` has format version `%s`, '
+                'this version of pypath reads version `%s`.' % (
+                    table,
+                    path,
+                    version,
+                    FORMAT_VERSION,
+                )
+            )
+
+        tables[table] = tbl
+
+    return tables
+
+
+def load(network, path: str, references: bool = True):
+    """
+    Loads a network saved by :py:func:`save` into a ``Network`` object.
+    The current contents of the network will be replaced.
+
+    :arg network:
+        A :py:class:`pypath.core.network.Network` object.
+    :arg path:
+        Path to the directory of the Arrow files.
+    :arg references:
+        Load the references of the evidences. The references are the
+        largest part of the data: if they are not needed, omitting them
+        saves time and memory, the column is not even read from the disk.
+    """
+
+    tables = read_tables(path)
+
+    # resources
+    res_tbl = tables['resources'].to_pydict()
+    resources = [
+        resource_formats.NetworkResource(
+            **{field: res_tbl[field][i] for field in _RESOURCE_FIELDS},
+            resource_attrs = _unpickled(res_tbl['resource_attrs'][i]) or {},
+        )
+        for i in range(tables['resources'].num_rows)
+    ]
+
+    # nodes
+    nodes_tbl = tables['nodes'].to_pydict()
+    entities = []
+
+    for identifier, id_type, entity_type, taxon, label, cplex, attrs in zip(
+        nodes_tbl['identifier'],
+        nodes_tbl['id_type'],
+        nodes_tbl['entity_type'],
+        nodes_tbl['taxon'],
+        nodes_tbl['label'],
+        nodes_tbl['complex'],
+        nodes_tbl['attrs'],
+    ):
+
+        key = entity_mod.EntityKey(
+            identifier = (
+                _unpickled(cplex)
+                    if cplex else
+                entity_mod.Entity._intern(identifier)
+            ),
+            id_type = id_type,
+            entity_type = entity_type,
+            taxon = taxon,
+        )
+        e = entity_mod.Entity.from_key(key, label, attrs = _unpickled(attrs))
+        # restoring also a label of `None`
+        e.label = entity_mod.Entity._intern(label)
+        entities.append(e)
+
+    # interactions
+    ia_tbl = tables['interactions'].to_pydict()
+    interactions = [
+        interaction_mod.Interaction(
+            a = entities[a],
+            b = entities[b],
+            attrs = _unpickled(attrs),
+        )
+        for a, b, attrs in zip(ia_tbl['a'], ia_tbl['b'], ia_tbl['attrs'])
+    ]
+
+    # evidences
+    ev_tbl = tables['evidences']
+    refs_col = (
+        ev_tbl['references'].to_pylist()
+            if references else
+        ((),) * ev_tbl.num_rows
+    )
+    ev_tbl = ev_tbl.drop_columns(['references']).to_pydict()
+    Evidence = evidence_mod.Evidence
+    Reference = refs_mod.Reference
+
+    for i_ia, slot_id, i_res, dataset, refs, attrs in zip(
+        ev_tbl['interaction'],
+        ev_tbl['slot'],
+        ev_tbl['resource'],
+        ev_tbl['dataset'],
+        refs_col,
+        ev_tbl['attrs'],
+    ):
+
+        resource = resources[i_res]
+        ev = Evidence.__new__(Evidence)
+        ev.resource = resource
+        ev.dataset = dataset
+        ev.references = {Reference(pmid) for pmid in refs}
+        ev.attrs = _unpickled(attrs) or {}
+
+        evs = _slot_collection(interactions[i_ia], SLOTS[slot_id])
+        evs.evidences[resource.key] = ev
+
+    network.reset()
+
+    for e, in_network in zip(entities, nodes_tbl['in_network']):
+
+        if in_network:
+
+            network.nodes[e.identifier] = e
+            network.nodes_by_label[e.label or e.identifier] = e
+
+    network.interactions = {(ia.a, ia.b): ia for ia in interactions}
+    network._update_interactions_by_nodes()
+
+    _log(
+        'Network with %u nodes and %u interactions loaded from `%s`.' % (
+            len(network.nodes),
+            len(network.interactions),
+            path,
+        )
+    )
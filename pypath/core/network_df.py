@@ -0,0 +1,372 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Columnwise construction of the interactions data frame of a
+:py:class:`pypath.core.network.Network`.
+
+The records of the interactions are appended directly into typed buffers:
+integer codes for the categorical columns and offsets with codes for the
+set valued columns (sources, data models and references, depending on the
+parameters). No record objects or Python lists of records are created, and
+the data frame or Arrow table is assembled from the buffers at the end.
+"""
+
+from __future__ import annotations
+
+import array
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    'InteractionDataFrameBuilder',
+]
+
+COLUMNS = (
+    'id_a',
+    'id_b',
+    'type_a',
+    'type_b',
+    'directed',
+    'effect',
+    'type',
+    'dmodel',
+    'sources',
+    'references',
+)
+
+
+def _arrow_strings(values: np.ndarray):
+    """
+    Arrow array of the categories; the complexes are represented by their
+    string representation.
+    """
+
+    import pyarrow as pa
+
+    return pa.array([str(v) for v in values], type = pa.string())
+
+
+class _CategoryBuffer(object):
+    """
+    Integer codes of a categorical column, ``-1`` for missing values.
+    """
+
+    __slots__ = ['codes', 'index']
+
+
+    def __init__(self):
+
+        self.codes = array.array('i')
+        self.index = {}
+
+
+    def code(self, value) -> int:
+
+        return -1 if value is None else self.index.setdefault(
+            value,
+            len(self.index),
+        )
+
+
+    def append(self, value):
+
+        self.codes.append(self.code(value))
+
+
+    def categories(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The categories, sorted if they are comparable, and the codes
+        referring to them.
+        """
+
+        categories = np.empty(len(self.index), dtype = object)
+        categories[:] = list(self.index)
+        codes = np.frombuffer(self.codes, dtype = np.int32)
+
+        try:
+
+            order = np.array(
+                sorted(range(len(categories)), key = categories.__getitem__),
+                dtype = np.int32,
+            )
+
+        except TypeError:
+
+            return categories, codes
+
+        recode = np.empty(len(order) + 1, dtype = np.int32)
+        recode[order] = np.arange(len(order), dtype = np.int32)
+        # the missing values, -1, are indexed to the last element
+        recode[-1] = -1
+
+        return categories[order], recode[codes]
+
+
+    def to_pandas(self) -> pd.Categorical:
+
+        categories, codes = self.categories()
+
+        return pd.Categorical.from_codes(
+            codes,
+            categories = pd.Index(categories, dtype = object),
+        )
+
+
+    def to_arrow(self):
+
+        import pyarrow as pa
+
+        categories, codes = self.categories()
+
+        return pa.DictionaryArray.from_arrays(
+            pa.array(codes, mask = codes == -1, type = pa.int32()),
+            _arrow_strings(categories),
+        )
+
+
+class _SetBuffer(object):
+    """
+    Set valued column: offsets and the codes of the elements.
+    """
+
+    __slots__ = ['offsets', 'values', 'missing']
+
+
+    def __init__(self):
+
+        self.offsets = array.array('q', [0])
+        self.values = _CategoryBuffer()
+        self.missing = array.array('b')
+
+
+    def append(self, values):
+
+        if values is not None:
+
+            self.values.codes.extend(self.values.code(v) for v in values)
+
+        self.offsets.append(len(self.values.codes))
+        self.missing.append(values is None)
+
+
+    def to_pandas(self) -> np.ndarray:
+
+        categories = np.empty(len(self.values.index), dtype = object)
+        categories[:] = list(self.values.index)
+        codes = np.frombuffer(self.values.codes, dtype = np.int32)
+        offsets = np.frombuffer(self.offsets, dtype = np.int64)
+        missing = np.frombuffer(self.missing, dtype = np.int8)
+        result = np.empty(len(missing), dtype = object)
+        result[:] = [
+            None if miss else set(categories[codes[start:end]])
+            for start, end, miss in zip(offsets[:-1], offsets[1:], missing)
+        ]
+
+        return result
+
+
+    def to_arrow(self):
+
+        import pyarrow as pa
+
+        categories, codes = self.values.categories()
+
+        return pa.LargeListArray.from_arrays(
+            pa.array(np.frombuffer(self.offsets, dtype = np.int64)),
+            pa.DictionaryArray.from_arrays(
+                pa.array(codes, type = pa.int32()),
+                _arrow_strings(categories),
+            ),
+            mask = pa.array(
+                np.frombuffer(self.missing, dtype = np.int8).astype(bool)
+            ),
+        )
+
+
+class InteractionDataFrameBuilder(object):
+    """
+    Collects interaction records into column buffers and creates a
+    ``pandas.DataFrame`` or a ``pyarrow.Table`` from them.
+
+    The ``append`` method accepts the same arguments as
+    :py:class:`pypath.core.interaction.InteractionDataFrameRecord`, it can
+    be passed as ``record`` to ``Interaction.generate_df_records``.
+
+    :arg bool by_source:
+        The records are by resources, hence the ``dmodel`` and ``sources``
+        columns are categorical; otherwise these are set valued.
+    :arg bool with_references:
+        The records contain the references as sets; otherwise the
+        references column is empty.
+    """
+
+
+    def __init__(self, by_source = False, with_references = False):
+
+        self.by_source = by_source
+        self.with_references = with_references
+        self.directed = array.array('b')
+        self.effect = array.array('b')
+        self._buffers = {
+            col: (
+                _SetBuffer()
+                    if (
+                        (col in ('dmodel', 'sources') and not by_source) or
+                        (col == 'references' and with_references)
+                    ) else
+                _CategoryBuffer()
+            )
+            for col in COLUMNS
+            if col not in ('directed', 'effect')
+        }
+        self._append = tuple(
+            (i, buf.append)
+            for i, buf in (
+                (i, self._buffers.get(col))
+                for i, col in enumerate(COLUMNS)
+            )
+            if buf is not None
+        )
+
+
+    def __len__(self):
+
+        return len(self.directed)
+
+
+    def append(
+            self,
+            id_a = None,
+            id_b = None,
+            type_a = None,
+            type_b = None,
+            directed = None,
+            effect = None,
+            type = None,
+            dmodel = None,
+            sources = None,
+            references = None,
+        ):
+        """
+        Adds one record.
+        """
+
+        fields = (
+            id_a,
+            id_b,
+            type_a,
+            type_b,
+            directed,
+            effect,
+            type,
+            dmodel,
+            sources,
+            references,
+        )
+
+        for i, append in self._append:
+
+            append(fields[i])
+
+        self.directed.append(bool(directed))
+        self.effect.append(effect or 0)
+
+
+    def add_interactions(self, interactions):
+        """
+        Adds the records of interactions.
+
+        :arg iterable interactions:
+            ``Interaction`` objects.
+        """
+
+        for ia in interactions:
+
+            for _ in ia.generate_df_records(
+                by_source = self.by_source,
+                with_references = self.with_references,
+                record = self.append,
+            ):
+
+                pass
+
+
+    def to_pandas(self, columns = None) -> pd.DataFrame:
+        """
+        Creates a data frame from the buffers.
+
+        :arg list columns:
+            Names of the columns, by default the field names of
+            ``InteractionDataFrameRecord``.
+        """
+
+        data = {}
+
+        for col in COLUMNS:
+
+            if col == 'directed':
+
+                data[col] = np.frombuffer(
+                    self.directed,
+                    dtype = np.int8,
+                ).astype(bool)
+
+            elif col == 'effect':
+
+                data[col] = np.frombuffer(self.effect, dtype = np.int8).copy()
+
+            else:
+
+                data[col] = self._buffers[col].to_pandas()
+
+        df = pd.DataFrame(data, columns = COLUMNS)
+
+        if columns:
+
+            df.columns = columns
+
+        return df
+
+
+    def to_arrow(self, columns = None):
+        """
+        Creates an Arrow table from the buffers. The categorical columns
+        are dictionary encoded, the set valued columns are list columns.
+
+        :arg list columns:
+            Names of the columns, by default the field names of
+            ``InteractionDataFrameRecord``.
+        """
+
+        import pyarrow as pa
+
+        arrays = [
+            pa.array(
+                np.frombuffer(self.directed, dtype = np.int8).astype(bool)
+            )
+                if col == 'directed' else
+            pa.array(np.frombuffer(self.effect, dtype = np.int8))
+                if col == 'effect' else
+            self._buffers[col].to_arrow()
+            for col in COLUMNS
+        ]
+
+        return pa.Table.from_arrays(arrays, names = list(columns or COLUMNS))
@@ -0,0 +1,663 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Array based index of the graph of a :py:class:`pypath.core.network.Network`.
+
+The entities are assigned integer ids, and the interactions are represented
+by arrays of their endpoints and of the presence and the resources of their
+evidences by direction and effect. The adjacency is available in CSR format,
+hence graph algorithms can work on arrays instead of walking the
+``Interaction`` objects.
+
+The literature references are indexed separately: the interactions citing
+each reference, and the number of interactions per reference.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import collections
+
+import numpy as np
+
+__all__ = [
+    'NetworkIndex',
+    'ReferenceIndex',
+    'Adjacency',
+    'SLOTS',
+    'DIRECTED',
+    'DIRECTED_REVERSE',
+    'UNDIRECTED',
+    'POSITIVE',
+    'POSITIVE_REVERSE',
+    'NEGATIVE',
+    'NEGATIVE_REVERSE',
+]
+
+#: Evidence collections of an interaction, by direction and effect. The
+#: slots refer to the direction ``a -> b`` of the interaction, or, for the
+#: arcs, to the direction of the arc.
+SLOTS = (
+    ('direction', 0),
+    ('direction', 1),
+    ('direction', 'undirected'),
+    ('positive', 0),
+    ('positive', 1),
+    ('negative', 0),
+    ('negative', 1),
+)
+
+(
+    DIRECTED,
+    DIRECTED_REVERSE,
+    UNDIRECTED,
+    POSITIVE,
+    POSITIVE_REVERSE,
+    NEGATIVE,
+    NEGATIVE_REVERSE,
+) = range(len(SLOTS))
+
+# the slots of the arc in the opposite direction
+_SWAP = (
+    DIRECTED_REVERSE,
+    DIRECTED,
+    UNDIRECTED,
+    POSITIVE_REVERSE,
+    POSITIVE,
+    NEGATIVE_REVERSE,
+    NEGATIVE,
+)
+
+_FORWARD = (DIRECTED, POSITIVE, NEGATIVE)
+
+
+Adjacency = collections.namedtuple(
+    'Adjacency',
+    [
+        'indptr',
+        'indices',
+        'arcs',
+    ],
+)
+Adjacency.__doc__ = """
+Adjacency in CSR format: the neighbours of entity ``i`` are
+``indices[indptr[i]:indptr[i + 1]]``, and the arcs leading to them are
+``arcs[indptr[i]:indptr[i + 1]]``.
+"""
+
+
+class NetworkIndex(object):
+    """
+    Integer ids of the entities and arrays of the interactions of a network.
+
+    Each interaction has an edge id ``e``, and two arcs: ``2 * e`` from
+    ``a`` to ``b`` and ``2 * e + 1`` from ``b`` to ``a``. The ids of the
+    removed interactions are reused, until then they are marked dead in
+    ``alive``. The ids of the entities do not change as long as the index
+    exists.
+
+    The network notifies the index of the added and removed interactions
+    by ``touch``, and the arrays are updated at the next access.
+
+    :arg pypath.core.network.Network network:
+        The network to index.
+    """
+
+    def __init__(self, network):
+
+        self.network = network
+        self.reset()
+
+
+    def reset(self):
+        """
+        Discards the whole index, it will be rebuilt at the next access.
+        """
+
+        self.entity_ids = {}
+        self.entities = []
+        self.edge_ids = {}
+        self.edge_keys = []
+        self.resource_bits = {}
+        self._free_edges = []
+        self.edge_a = np.zeros(0, dtype = np.int64)
+        self.edge_b = np.zeros(0, dtype = np.int64)
+        self.alive = np.zeros(0, dtype = bool)
+        self.flags = np.zeros((0, len(SLOTS)), dtype = bool)
+        self.resources = np.zeros((0, len(SLOTS), 1), dtype = np.uint64)
+        self._adjacency = {}
+        self._dirty = set(self.network.interactions.keys())
+
+
+    def touch(self, key: tuple):
+        """
+        Marks an interaction as added, changed or removed.
+
+        :arg tuple key:
+            Key of the interaction in ``Network.interactions``.
+        """
+
+        self._dirty.add(key)
+
+
+    def update(self):
+        """
+        Updates the arrays from the interactions changed since the last
+        update.
+        """
+
+        if not self._dirty:
+
+            return
+
+        interactions = self.network.interactions
+
+        for key in self._dirty:
+
+            ia = interactions.get(key, None)
+            eid = self.edge_ids.get(key, None)
+
+            if ia is None:
+
+                if eid is not None:
+
+                    del self.edge_ids[key]
+                    self.edge_keys[eid] = None
+                    self.alive[eid] = False
+                    self.flags[eid] = False
+                    self.resources[eid] = 0
+                    self._free_edges.append(eid)
+
+                continue
+
+            if eid is None:
+
+                eid = self._new_edge(key)
+
+            self.edge_a[eid] = self.entity_id(ia.a)
+            self.edge_b[eid] = self.entity_id(ia.b)
+            self.alive[eid] = True
+            self._set_evidences(eid, ia)
+
+        self._dirty = set()
+        self._adjacency = {}
+
+
+    def entity_id(self, entity, add: bool = True) -> int | None:
+        """
+        Integer id of an entity.
+
+        :arg pypath.core.entity.Entity entity:
+            An entity of the network.
+        :arg bool add:
+            Assign a new id if the entity is not in the index yet, otherwise
+            return ``None``.
+        """
+
+        i = self.entity_ids.get(entity, None)
+
+        if i is None and add:
+
+            i = self.entity_ids[entity] = len(self.entities)
+            self.entities.append(entity)
+
+        return i
+
+
+    def resource_mask(self, resources: str | Iterable[str]) -> np.ndarray:
+        """
+        Bit mask of resources, resources not in the index are ignored.
+        """
+
+        mask = np.zeros(self.resources.shape[2], dtype = np.uint64)
+
+        for name in (
+            (resources,)
+                if isinstance(resources, str) else
+            resources
+        ):
+
+            bit = self.resource_bits.get(name, None)
+
+            if bit is not None:
+
+                mask[bit >> 6] |= np.uint64(1 << (bit & 63))
+
+        return mask
+
+
+    def has_resources(
+            self,
+            resources: str | Iterable[str],
+            slot: int | None = None,
+        ) -> np.ndarray:
+        """
+        Boolean array by edge, whether any of the resources supports the
+        interaction.
+
+        :arg int slot:
+            Consider only one collection of evidences, e.g. ``POSITIVE``;
+            by default any evidence.
+        """
+
+        self.update()
+        mask = self.resource_mask(resources)
+        res = (
+            self.resources[:, slot, :]
+                if slot is not None else
+            np.bitwise_or.reduce(self.resources, axis = 1)
+        )
+
+        return (res & mask).any(axis = 1)
+
+
+    @property
+    def n_entities(self) -> int:
+
+        self.update()
+
+        return len(self.entities)
+
+
+    @property
+    def n_edges(self) -> int:
+        """
+        Number of edge ids, including the dead ones.
+        """
+
+        self.update()
+
+        return len(self.alive)
+
+
+    @property
+    def directed(self) -> np.ndarray:
+        """
+        Boolean array by edge, whether the interaction has any directed
+        evidence.
+        """
+
+        self.update()
+
+        return self.flags[:, [DIRECTED, DIRECTED_REVERSE]].any(axis = 1)
+
+
+    @property
+    def undirected(self) -> np.ndarray:
+
+        self.update()
+
+        return self.flags[:, UNDIRECTED].copy()
+
+
+    @property
+    def positive(self) -> np.ndarray:
+
+        self.update()
+
+        return self.flags[:, [POSITIVE, POSITIVE_REVERSE]].any(axis = 1)
+
+
+    @property
+    def negative(self) -> np.ndarray:
+
+        self.update()
+
+        return self.flags[:, [NEGATIVE, NEGATIVE_REVERSE]].any(axis = 1)
+
+
+    @property
+    def arc_source(self) -> np.ndarray:
+
+        self.update()
+
+        return np.column_stack((self.edge_a, self.edge_b)).ravel()
+
+
+    @property
+    def arc_target(self) -> np.ndarray:
+
+        self.update()
+
+        return np.column_stack((self.edge_b, self.edge_a)).ravel()
+
+
+    def arc_slot(self, slot: int, edge_values: np.ndarray | None = None):
+        """
+        Values of an evidence slot along the arcs.
+
+        :arg int slot:
+            The slot relative to the direction of the arc, e.g.
+            ``POSITIVE`` is the positive effect from the source to the
+            target of each arc.
+        :arg numpy.ndarray edge_values:
+            Array with the slots as its second dimension, by default the
+            presence of evidences (``flags``).
+        """
+
+        self.update()
+        edge_values = self.flags if edge_values is None else edge_values
+
+        return np.stack(
+            (edge_values[:, slot], edge_values[:, _SWAP[slot]]),
+            axis = 1,
+        ).reshape((-1,) + edge_values.shape[2:])
+
+
+    def adjacency(self, mode: str = 'ALL') -> Adjacency:
+        """
+        The adjacency in CSR format.
+
+        :arg str mode:
+            ``'OUT'``: targets of the directed interactions from each
+            entity; ``'IN'``: sources of the directed interactions to each
+            entity; ``'ALL'``: partners in any interaction, directed or not.
+        """
+
+        self.update()
+
+        if mode not in self._adjacency:
+
+            arc_alive = np.repeat(self.alive, 2)
+
+            if mode == 'ALL':
+
+                selected = arc_alive
+
+            else:
+
+                selected = arc_alive & np.logical_or.reduce(
+                    [self.arc_slot(slot) for slot in _FORWARD]
+                )
+
+            self._adjacency[mode] = self._csr(
+                np.flatnonzero(selected),
+                inbound = mode == 'IN',
+            )
+
+        return self._adjacency[mode]
+
+
+    def neighbors(self, entity, mode: str = 'ALL') -> list:
+        """
+        Neighbours of an entity, as ``Entity`` objects.
+        """
+
+        self.update()
+        i = self.entity_id(entity, add = False)
+
+        if i is None:
+
+            return []
+
+        adj = self.adjacency(mode)
+
+        return [
+            self.entities[j]
+            for j in np.unique(adj.indices[adj.indptr[i]:adj.indptr[i + 1]])
+        ]
+
+
+    def _csr(self, arcs: np.ndarray, inbound: bool = False) -> Adjacency:
+
+        source = self.arc_source[arcs]
+        target = self.arc_target[arcs]
+        source, target = (target, source) if inbound else (source, target)
+        order = np.argsort(source, kind = 'stable')
+        counts = np.bincount(source, minlength = len(self.entities))
+
+        return Adjacency(
+            indptr = np.concatenate([[0], np.cumsum(counts)]),
+            indices = target[order],
+            arcs = arcs[order],
+        )
+
+
+    def _new_edge(self, key: tuple) -> int:
+
+        if self._free_edges:
+
+            eid = self._free_edges.pop()
+            self.edge_keys[eid] = key
+
+        else:
+
+            eid = len(self.edge_keys)
+            self.edge_keys.append(key)
+
+            if eid >= len(self.alive):
+
+                self._grow(max(16, 2 * len(self.alive)))
+
+        self.edge_ids[key] = eid
+
+        return eid
+
+
+    def _grow(self, size: int):
+
+        extra = size - len(self.alive)
+
+        self.edge_a = np.concatenate(
+            [self.edge_a, np.zeros(extra, dtype = np.int64)]
+        )
+        self.edge_b = np.concatenate(
+            [self.edge_b, np.zeros(extra, dtype = np.int64)]
+        )
+        self.alive = np.concatenate([self.alive, np.zeros(extra, dtype = bool)])
+        self.flags = np.concatenate(
+            [self.flags, np.zeros((extra, len(SLOTS)), dtype = bool)]
+        )
+        self.resources = np.concatenate([
+            self.resources,
+            np.zeros(
+                (extra, len(SLOTS), self.resources.shape[2]),
+                dtype = np.uint64,
+            ),
+        ])
+
+
+    def _set_evidences(self, eid: int, ia):
+
+        self.flags[eid] = False
+        self.resources[eid] = 0
+        directions = (ia.a_b, ia.b_a)
+
+        for slot, (attr, key) in enumerate(SLOTS):
+
+            evs = getattr(ia, attr)[
+                key if isinstance(key, str) else directions[key]
+            ]
+
+            for ev in evs:
+
+                bit = self._resource_bit(ev.resource.name)
+                self.flags[eid, slot] = True
+                self.resources[eid, slot, bit >> 6] |= np.uint64(
+                    1 << (bit & 63)
+                )
+
+
+    def _resource_bit(self, name: str) -> int:
+
+        bit = self.resource_bits.get(name, None)
+
+        if bit is None:
+
+            bit = self.resource_bits[name] = len(self.resource_bits)
+
+            if bit >> 6 >= self.resources.shape[2]:
+
+                self.resources = np.concatenate(
+                    [
+                        self.resources,
+                        np.zeros(
+                            self.resources.shape[:2] + (1,),
+                            dtype = np.uint64,
+                        ),
+                    ],
+                    axis = 2,
+                )
+
+        return bit
+
+
+class ReferenceIndex(object):
+    """
+    Interactions by literature references of a network.
+
+    Keeps the keys of the interactions citing each reference and the
+    references of each interaction. Like ``NetworkIndex``, the network
+    notifies the index of the changed interactions by ``touch``, and only
+    these are read again at the next ``update``. The references ordered by
+    the number of their interactions are created on demand, hence queries
+    by thresholds are answered by a binary search.
+
+    :arg pypath.core.network.Network network:
+        The network to index.
+    """
+
+    def __init__(self, network):
+
+        self.network = network
+        self.reset()
+
+
+    def reset(self):
+        """
+        Discards the whole index, it will be rebuilt at the next access.
+        """
+
+        self.by_reference = {}
+        self.by_interaction = {}
+        self.unreferenced = set()
+        self._by_count = None
+        self._dirty = set(self.network.interactions.keys())
+
+
+    def touch(self, key: tuple):
+        """
+        Marks an interaction as added, changed or removed.
+
+        :arg tuple key:
+            Key of the interaction in ``Network.interactions``.
+        """
+
+        self._dirty.add(key)
+
+
+    def update(self):
+        """
+        Updates the index from the interactions changed since the last
+        update.
+        """
+
+        if not self._dirty:
+
+            return
+
+        interactions = self.network.interactions
+
+        for key in self._dirty:
+
+            ia = interactions.get(key, None)
+            old = self.by_interaction.pop(key, set())
+            new = set() if ia is None else ia.get_references()
+
+            for ref in old - new:
+
+                keys = self.by_reference[ref]
+                keys.discard(key)
+
+                if not keys:
+
+                    del self.by_reference[ref]
+
+            for ref in new - old:
+
+                self.by_reference.setdefault(ref, set()).add(key)
+
+            self.unreferenced.discard(key)
+
+            if ia is not None:
+
+                self.by_interaction[key] = new
+
+                if not new:
+
+                    self.unreferenced.add(key)
+
+        self._dirty = set()
+        self._by_count = None
+
+
+    def counts(self) -> dict:
+        """
+        Number of interactions by references.
+        """
+
+        self.update()
+
+        return {ref: len(keys) for ref, keys in self.by_reference.items()}
+
+
+    def above(self, threshold: int) -> list:
+        """
+        References cited by more than ``threshold`` interactions.
+        """
+
+        self.update()
+
+        if self._by_count is None:
+
+            refs = list(self.by_reference.keys())
+            counts = np.fromiter(
+                (len(self.by_reference[ref]) for ref in refs),
+                dtype = np.int64,
+                count = len(refs),
+            )
+            order = np.argsort(counts, kind = 'stable')
+            self._by_count = (counts[order], [refs[i] for i in order])
+
+        counts, refs = self._by_count
+
+        return refs[np.searchsorted(counts, threshold, side = 'right'):]
+
+
+    def only_cited_by(self, refs: Iterable) -> set:
+        """
+        Keys of the interactions all references of which are in ``refs``,
+        including the interactions without references.
+        """
+
+        self.update()
+
+        hits = collections.Counter(
+            key
+            for ref in refs
+            for key in self.by_reference.get(ref, ())
+        )
+
+        return {
+            key
+            for key, cnt in hits.items()
+            if cnt == len(self.by_interaction[key])
+        } | self.unreferenced
@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Path search on the array based index of a network.
+
+The interaction filters of each step are evaluated once per query, for all
+interactions, resulting a boolean mask of the arcs. The paths are extended
+in batches, as arrays of entity ids. If the end points are given, the
+nodes which can not reach any of them within the remaining steps are
+pruned by a backward search from the end points.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+import pypath.core.network_index as network_index
+import pypath.core.interaction as interaction_mod
+
+__all__ = ['arc_mask', 'find_paths']
+
+# interaction filters which can be evaluated on the arrays of the index
+_ARRAY_FILTERS = {'mode', 'direction', 'effect', 'resources'}
+
+_BATCH_SIZE = 100000
+
+
+def arc_mask(
+        index: network_index.NetworkIndex,
+        mode: str = 'ALL',
+        direction: bool | tuple | None = None,
+        effect: bool | str | None = None,
+        resources: str | set[str] | None = None,
+        **kwargs
+    ) -> np.ndarray:
+    """
+    Boolean array by arc, whether the target of the arc is a partner of its
+    source according to the criteria, as in ``Network.partners``.
+
+    :arg str mode:
+        ``'OUT'``, ``'IN'`` or ``'ALL'``, as in ``Network.partners``.
+    :arg kwargs:
+        Further criteria for ``Interaction.get_degrees``. If any of these
+        is set, or the direction is a tuple, or the resources are not a
+        name or a set of names, the criteria are evaluated on the
+        ``Interaction`` objects, once for each interaction.
+    """
+
+    effect = interaction_mod.Interaction._effect_synonyms(effect)
+
+    if (
+        any(v is not None for v in kwargs.values()) or
+        not (direction is None or isinstance(direction, bool)) or
+        (effect and effect is not True and effect not in {
+            'positive', 'negative'
+        }) or
+        not (resources is None or isinstance(resources, (str, set))) or
+        mode not in {'OUT', 'IN', 'ALL'}
+    ):
+
+        return _arc_mask_objects(
+            index,
+            mode = mode,
+            direction = direction,
+            effect = effect,
+            resources = resources,
+            **kwargs
+        )
+
+    alive = np.repeat(index.alive, 2)
+    reverse = np.arange(len(alive)) ^ 1
+    rmask = None if resources is None else index.resource_mask(
+        (resources,) if isinstance(resources, str) else resources
+    )
+
+    def match(*slots):
+
+        return np.logical_or.reduce([
+            (
+                index.arc_slot(slot)
+                    if rmask is None else
+                (index.arc_slot(slot, index.resources) & rmask).any(axis = 1)
+            )
+            for slot in slots
+        ]) & alive
+
+
+    if direction is False:
+
+        # only undirected evidences, in any mode
+        return match(network_index.UNDIRECTED)
+
+    if effect:
+
+        forward = match(
+            *(
+                (network_index.POSITIVE, network_index.NEGATIVE)
+                    if effect is True else
+                (
+                    network_index.POSITIVE
+                        if effect == 'positive' else
+                    network_index.NEGATIVE,
+                )
+            )
+        )
+
+    elif direction:
+
+        forward = match(network_index.DIRECTED)
+
+    else:
+
+        # directed evidences, if there is any for the interaction,
+        # otherwise the undirected ones
+        directed = match(network_index.DIRECTED)
+        any_directed = directed | directed[reverse]
+        undirected = match(network_index.UNDIRECTED)
+
+        return (
+            np.where(any_directed, directed, undirected)
+                if mode == 'OUT' else
+            np.where(any_directed, directed[reverse], undirected)
+                if mode == 'IN' else
+            any_directed | undirected
+        )
+
+    return (
+        forward
+            if mode == 'OUT' else
+        forward[reverse]
+            if mode == 'IN' else
+        forward | forward[reverse]
+    )
+
+
+def _arc_mask_objects(index, mode = 'ALL', **kwargs) -> np.ndarray:
+
+    # partners in the `mode` direction are the endpoints of the
+    # interactions in the opposite direction
+    _mode = {'OUT': 'IN', 'IN': 'OUT'}.get(mode, 'ALL')
+    interactions = index.network.interactions
+    mask = np.zeros(2 * len(index.alive), dtype = bool)
+
+    for eid in np.flatnonzero(index.alive):
+
+        ia = interactions[index.edge_keys[eid]]
+        degrees = ia.get_degrees(mode = _mode, **kwargs)
+        mask[2 * eid] = ia.b in degrees
+        mask[2 * eid + 1] = ia.a in degrees
+
+    return mask
+
+
+def _adjacency(index, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Adjacency in CSR format of the arcs selected by a mask, without
+    duplicates.
+    """
+
+    n = index.n_entities
+    arcs = np.flatnonzero(mask)
+    pairs = np.unique(index.arc_source[arcs] * n + index.arc_target[arcs])
+    source = pairs // n
+
+    return (
+        np.concatenate([[0], np.cumsum(np.bincount(source, minlength = n))]),
+        pairs % n,
+    )
+
+
+def _expand(paths: np.ndarray, indptr: np.ndarray, indices: np.ndarray):
+    """
+    Extends each path by each neighbour of its last node.
+    """
+
+    last = paths[:, -1]
+    first = indptr[last]
+    counts = indptr[last + 1] - first
+    total = counts.sum()
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    return np.column_stack((
+        np.repeat(paths, counts, axis = 0),
+        indices[np.repeat(first, counts) + offsets],
+    ))
+
+
+def _reachable(steps, targets: np.ndarray, maxlen: int) -> list:
+    """
+    Backward search from the end points: for each number of steps done,
+    the nodes from which any of the end points can be reached within the
+    remaining steps.
+    """
+
+    reach = [None] * (maxlen + 1)
+    reach[maxlen] = targets
+
+    for k in range(maxlen - 1, -1, -1):
+
+        indptr, indices = steps[k]
+        source = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        reach[k] = targets.copy()
+        reach[k][source[reach[k + 1][indices]]] = True
+
+    return reach
+
+
+def find_paths(
+        index: network_index.NetworkIndex,
+        start: Iterable[int],
+        end: Iterable[int] | None = None,
+        masks: list[np.ndarray] | None = None,
+        loops: bool = False,
+        maxlen: int = 2,
+        minlen: int = 1,
+        max_paths: int | None = None,
+    ) -> list[np.ndarray]:
+    """
+    Finds paths between entities of the network.
+
+    The rules are the same as for ``Network.find_paths``: without
+    ``loops``, the paths do not visit any node twice; if ``end`` is given,
+    the paths are returned when they reach any of the end points, otherwise
+    all paths of length ``maxlen`` are returned; with ``loops``, the paths
+    may visit nodes more than once, and are returned when they get back to
+    their first node, or reach the end point.
+
+    :arg start,end:
+        Integer ids of the entities in the index.
+    :arg masks:
+        Arc masks (see ``arc_mask``), one for each step, or for the first
+        few steps, the last one used for the remaining steps. By default
+        all arcs.
+    :arg max_paths:
+        Stop after this many paths have been found.
+
+    :return:
+        Arrays of entity ids, each row is a path, one array for each
+        number of steps.
+    """
+
+    minlen = max(1, minlen)
+    masks = masks or [np.repeat(index.alive, 2)]
+    masks = [masks[min(k, len(masks) - 1)] for k in range(maxlen)]
+    cache = {}
+    steps = [
+        cache.setdefault(id(mask), _adjacency(index, mask))
+        for mask in masks
+    ]
+    end = None if end is None else np.array(list(end), dtype = np.int64)
+    found = [[] for _ in range(maxlen + 1)]
+    n_found = 0
+
+    if loops and end is not None and len(end) > 1:
+
+        # the paths end at the first node of the path or at the end point,
+        # whichever comes first, so each end point is searched separately
+        for e in end:
+
+            for length, paths in enumerate(
+                find_paths(
+                    index,
+                    start = start,
+                    end = (e,),
+                    masks = masks,
+                    loops = loops,
+                    maxlen = maxlen,
+                    minlen = minlen,
+                    max_paths = (
+                        None if max_paths is None else max_paths - n_found
+                    ),
+                ),
+                start = minlen,
+            ):
+
+                found[length].append(paths)
+                n_found += len(paths)
+
+            if max_paths is not None and n_found >= max_paths:
+
+                break
+
+        return _collect(found, minlen)
+
+    is_end = np.zeros(index.n_entities, dtype = bool)
+
+    if end is not None:
+
+        is_end[end] = True
+
+    for s in start:
+
+        targets = is_end.copy()
+
+        if loops:
+
+            targets[s] = True
+
+        reach = _reachable(steps, targets, maxlen) if end is not None else None
+        stack = [np.array([[s]], dtype = np.int64)]
+
+        while stack and (max_paths is None or n_found < max_paths):
+
+            paths = stack.pop()
+            k = paths.shape[1]
+            paths = _expand(paths, *steps[k - 1])
+            last = paths[:, -1]
+
+            if not loops:
+
+                paths = paths[~(paths[:, :-1] == last[:, None]).any(axis = 1)]
+                last = paths[:, -1]
+
+            if reach is not None:
+
+                paths = paths[reach[k][last]]
+                last = paths[:, -1]
+
+            if k < minlen:
+
+                done = np.zeros(len(paths), dtype = bool)
+
+            elif loops:
+
+                done = (last == s) | is_end[last]
+
+            elif end is None:
+
+                done = np.full(len(paths), k == maxlen)
+
+            else:
+
+                done = is_end[last]
+
+            if done.any():
+
+                found[k].append(paths[done])
+                n_found += done.sum()
+
+            # without loops the paths continue after reaching an end point,
+            # towards the other end points
+            paths = paths if end is not None and not loops else paths[~done]
+
+            if k < maxlen and len(paths):
+
+                stack.extend(
+                    paths[i:i + _BATCH_SIZE]
+                    for i in reversed(range(0, len(paths), _BATCH_SIZE))
+                )
+
+    result = _collect(found, minlen)
+
+    if max_paths is not None:
+
+        result = _truncate(result, max_paths)
+
+    return result
+
+
+def _collect(found: list, minlen: int) -> list[np.ndarray]:
+
+    return [
+        (
+            np.unique(np.concatenate(arrays), axis = 0)
+                if arrays else
+            np.zeros((0, length + 1), dtype = np.int64)
+        )
+        for length, arrays in enumerate(found)
+        if length >= minlen
+    ]
+
+
+def _truncate(result: list[np.ndarray], max_paths: int) -> list[np.ndarray]:
+
+    truncated = []
+
+    for paths in result:
+
+        truncated.append(paths[:max(max_paths, 0)])
+        max_paths -= len(truncated[-1])
+
+    return truncated
@@ -25,7 +25,6 @@ import pypath.share.settings as settings
 import pypath.share.session as session
 import pypath_common._constants as _const
 import pypath.inputs.uniprot_idmapping as uniprot_idmapping
-import pypath.inputs.unichem as unichem_input
 
 _logger = session.Logger(name = 'input_formats')
 
@@ -675,10 +674,9 @@ class UnichemMapping(MappingInput):
         'selleck': 'Selleck',
     }
 
-    _resource_id_types = {
-        id_type: id_type
-        for id_type in unichem_input.unichem_sources().values()
-    }.update(_synonyms)
+    # the UniChem ID types are retrieved by ``pypath.utils.mapping`` at
+    # the first use, not at import
+    _resource_id_types = None
 
     def __init__(
             self,
@@ -36,11 +36,37 @@ import pypath.inputs.pubmed as pubmed
 
 
 class Reference(object):
+    """
+    A literature reference, typically a PubMed ID.
+
+    The instances are shared: creating a reference with the same ID again
+    returns the existing object, hence the many evidences citing the same
+    paper do not carry copies of it.
+    """
 
     __slots__ = ['pmid']
 
-    def __init__(self, pmid):
-        self.pmid = str(pmid).strip()
+    _instances = {}
+
+    def __new__(cls, pmid = None):
+
+        if pmid is None:
+
+            # unpickling objects saved with the default protocol
+            return super().__new__(cls)
+
+        pmid = sys.intern(str(pmid).strip())
+        ref = cls._instances.get(pmid, None)
+
+        if ref is None:
+
+            ref = cls._instances.setdefault(pmid, super().__new__(cls))
+            ref.pmid = pmid
+
+        return ref
+
+    def __reduce__(self):
+        return self.__class__, (self.pmid,)
 
     def __eq__(self, other):
         return self.pmid == other.pmid
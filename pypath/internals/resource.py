@@ -32,6 +32,7 @@ if TYPE_CHECKING:
     import pypath.internals.license as License
 
 import os
+import sys
 import collections
 import copy
 
@@ -195,7 +196,7 @@ class ResourceAttributes(object):
             **kwargs
         ):
 
-        self.name = name
+        self.name = sys.intern(name) if isinstance(name, str) else name
         self.data_type = data_type
         self.evidence_types = evidence_types or set()
         self.resource_attrs = {}
@@ -230,7 +231,9 @@ class ResourceAttributes(object):
     @dataset.setter
     def dataset(self, dataset):
 
-        self._dataset = dataset
+        self._dataset = (
+            sys.intern(dataset) if isinstance(dataset, str) else dataset
+        )
 
         networkinput = getattr(self, 'networkinput', None)
 
@@ -205,12 +205,41 @@ class DatabaseManager(session_mod.Logger):
 
             pickle_fname = pickle_fname % ncbi_tax_id
 
+        if self.is_arrow(dataset):
+
+            pickle_fname = '%s.arrow' % os.path.splitext(pickle_fname)[0]
+
         return os.path.join(
             self.get_param('pickle_dir'),
             pickle_fname,
         )
 
 
+    def is_arrow(self, dataset):
+        """
+        Tells if a dataset is saved into a directory of Arrow files instead
+        of a pickle. This is the case for the network datasets if the
+        ``network_format`` parameter is ``'arrow'``.
+        """
+
+        return (
+            self.get_param('%s_mod' % dataset) == 'network' and
+            self.get_param('network_format') == 'arrow'
+        )
+
+
+    @staticmethod
+    def _remove_dump(path):
+
+        if os.path.isdir(path):
+
+            shutil.rmtree(path)
+
+        else:
+
+            os.remove(path)
+
+
     def pickle_exists(self, dataset, ncbi_tax_id = 9606):
         """
         Tells if a pickle dump of a particular dataset exists.
@@ -266,11 +295,18 @@ class DatabaseManager(session_mod.Logger):
         self._log('Saving dataset `%s` to `%s`.' % (dataset, pickle_path))
 
         try:
-            db.save_to_pickle(pickle_file = pickle_path)
+
+            if self.is_arrow(dataset):
+
+                db.save_to_arrow(path = pickle_path)
+
+            else:
+
+                db.save_to_pickle(pickle_file = pickle_path)
 
             if os.path.exists(old_pickle_path):
 
-                os.remove(old_pickle_path)
+                self._remove_dump(old_pickle_path)
 
             self._log(
                 'Saved dataset `%s` to `%s`.' % (
@@ -283,7 +319,10 @@ class DatabaseManager(session_mod.Logger):
 
             exc = sys.exc_info()
             self._log_traceback()
-            os.remove(pickle_path)
+
+            if os.path.exists(pickle_path):
+
+                self._remove_dump(pickle_path)
 
             self._log(
                 'Failed to save dataset `%s` to `%s`. '
@@ -368,7 +407,17 @@ class DatabaseManager(session_mod.Logger):
 
         _dataset = self._dataset_taxid(dataset, ncbi_tax_id = ncbi_tax_id)
 
-        setattr(self, _dataset, mod.get_db(pickle_file = pickle_path))
+        setattr(
+            self,
+            _dataset,
+            mod.get_db(
+                **{
+                    'arrow_dir'
+                        if self.is_arrow(dataset) else
+                    'pickle_file': pickle_path
+                }
+            ),
+        )
 
         self._log('Loaded dataset `%s` from `%s`.' % (dataset, pickle_path))
 
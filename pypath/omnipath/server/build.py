@@ -35,6 +35,7 @@ import pypath.core.complex as complex
 import pypath.core.annot as annot
 import pypath.core.intercell as intercell
 import pypath.omnipath.export as export
+import pypath.omnipath.server.columnar as columnar
 import pypath.resources.data_formats as data_formats
 import pypath.share.session as session_mod
 import pypath.omnipath as omnipath
@@ -64,12 +65,14 @@ class WebserviceTables(session_mod.Logger):
             outfile_annotations = 'omnipath_webservice_annotations.tsv',
             outfile_intercell = 'omnipath_webservice_intercell.tsv',
             network_datasets = None,
+            arrow = False,
         ):
 
         session_mod.Logger.__init__(self, name = 'websrvtab')
         self._log('WebserviceTables initialized.')
 
         self.only_human = only_human
+        self.arrow = arrow
 
         databases = (
             'interactions',
@@ -124,6 +127,41 @@ class WebserviceTables(session_mod.Logger):
         self.annotations()
         self.intercell()
 
+        if self.arrow:
+
+            self.to_arrow()
+
+
+    def to_arrow(self):
+        """
+        Converts the exported tables to memory mappable Arrow files, as
+        used by ``TableServer`` with ``table_format = 'arrow'``.
+        """
+
+        from pypath.omnipath.server import run
+
+        for db, name in (
+            ('interactions', 'interactions'),
+            ('enz_sub', 'enzsub'),
+            ('complexes', 'complexes'),
+            ('annotations', 'annotations'),
+            ('intercell', 'intercell'),
+        ):
+
+            tsv_path = getattr(self, 'outfile_%s' % db)
+
+            if not os.path.exists(tsv_path):
+
+                continue
+
+            self._log('Converting `%s` to Arrow format.' % tsv_path)
+
+            columnar.tsv_to_arrow(
+                tsv_path,
+                name = name,
+                dtype = run.TableServer.default_dtypes[name],
+            )
+
 
     def interactions(self):
 
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Columnar (Arrow IPC) storage of the web service tables.
+
+The tables are written uncompressed in the Arrow IPC (Feather v2) format,
+hence they can be memory mapped: the server processes read them without
+parsing and the pages are shared between the worker processes by the
+operating system. Columns of repeated values are dictionary encoded,
+the columns with `;` separated lists (``sources``, ``dorothea_level``,
+``components``) are stored as list columns of dictionary encoded strings.
+"""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import pypath.share.session as session_mod
+
+_logger = session_mod.Logger(name = 'server_columnar')
+_log = _logger._log
+
+__all__ = [
+    'LIST_COLUMNS',
+    'arrow_path',
+    'to_arrow',
+    'write_arrow',
+    'tsv_to_arrow',
+    'read_arrow',
+    'to_pandas',
+]
+
+#: List columns of the tables with their separators in the TSV files.
+LIST_COLUMNS = {
+    'interactions': {
+        'sources': ';',
+        'dorothea_level': ';',
+    },
+    'enzsub': {
+        'sources': ';',
+    },
+    'complexes': {
+        'sources': ';',
+        'components': '_',
+    },
+}
+
+_retsv = re.compile(r'\.tsv(?:\.gz)?$')
+
+
+def arrow_path(path: str) -> str:
+    """
+    Path of the Arrow file corresponding to a TSV table.
+    """
+
+    return '%s.arrow' % _retsv.sub('', path)
+
+
+def _list_array(col: pd.Series, sep: str) -> pa.ListArray:
+    """
+    Creates a list array of dictionary encoded strings from a column of
+    separated values.
+
+    The distinct values of the column are split only once, the rows are
+    expanded by array operations.
+    """
+
+    col = col.astype('category')
+    cats = [c.split(sep) for c in col.cat.categories.astype(str)]
+    dictionary = sorted(set(i for c in cats for i in c))
+    item_code = {item: i for i, item in enumerate(dictionary)}
+    cat_items = np.array(
+        [item_code[i] for c in cats for i in c],
+        dtype = np.int32,
+    )
+    # the last element belongs to the missing values (code -1)
+    cat_lens = np.array([len(c) for c in cats] + [0], dtype = np.int64)
+    cat_starts = np.concatenate([[0], np.cumsum(cat_lens[:-1])])
+
+    codes = col.cat.codes.to_numpy()
+    lens = cat_lens[codes]
+    offsets = np.concatenate([[0], np.cumsum(lens)])
+    idx = (
+        np.repeat(cat_starts[codes] - offsets[:-1], lens) +
+        np.arange(offsets[-1])
+    )
+
+    values = pa.DictionaryArray.from_arrays(
+        pa.array(cat_items[idx], type = pa.int32()),
+        pa.array(dictionary, type = pa.string()),
+    )
+
+    return pa.ListArray.from_arrays(
+        pa.array(offsets, type = pa.int32()),
+        values,
+        mask = pa.array(codes == -1),
+    )
+
+
+def to_arrow(df: pd.DataFrame, name: str) -> pa.Table:
+    """
+    Converts a web service data frame to an Arrow table.
+
+    :arg df:
+        A data frame as read from the TSV exports.
+    :arg name:
+        Name of the table, e.g. ``interactions``.
+    """
+
+    list_cols = LIST_COLUMNS.get(name, {})
+    arrays = []
+
+    for colname in df.columns:
+
+        col = df[colname]
+
+        if colname in list_cols:
+
+            arr = _list_array(col, list_cols[colname])
+
+        elif col.dtype == object:
+
+            arr = pa.array(col.astype('category'), from_pandas = True)
+
+        else:
+
+            arr = pa.array(col, from_pandas = True)
+
+        arrays.append(arr)
+
+    return pa.Table.from_arrays(arrays, names = list(df.columns))
+
+
+def write_arrow(df: pd.DataFrame, path: str, name: str):
+    """
+    Writes a web service data frame into an uncompressed Arrow IPC file.
+    """
+
+    table = to_arrow(df, name)
+
+    with pa.OSFile(path, 'wb') as fp:
+
+        with pa.ipc.new_file(fp, table.schema) as writer:
+
+            writer.write_table(table)
+
+    _log('Table `%s` written to `%s`.' % (name, path))
+
+
+def tsv_to_arrow(
+        tsv_path: str,
+        name: str,
+        dtype: dict | None = None,
+        path: str | None = None,
+    ) -> str:
+    """
+    Converts a TSV export of a web service table to Arrow IPC format.
+
+    :arg tsv_path:
+        Path to the TSV file (optionally gzipped).
+    :arg name:
+        Name of the table, e.g. ``interactions``.
+    :arg dtype:
+        Data types for ``pandas.read_csv``.
+    :arg path:
+        Path to the Arrow file. By default the TSV file name with
+        `.arrow` extension.
+
+    :return:
+        The path to the Arrow file.
+    """
+
+    path = path or arrow_path(tsv_path)
+
+    df = pd.read_csv(
+        tsv_path,
+        sep = '\t',
+        index_col = False,
+        dtype = dtype,
+    )
+
+    write_arrow(df, path, name)
+
+    return path
+
+
+def read_arrow(path: str) -> pa.Table:
+    """
+    Opens an Arrow IPC file memory mapped.
+
+    The buffers of the returned table point into the mapped file, nothing
+    is read into memory until it is accessed.
+    """
+
+    source = pa.memory_map(path, 'r')
+
+    return pa.ipc.open_file(source).read_all()
+
+
+def _join_list_column(arr: pa.ChunkedArray, sep: str) -> pd.Series:
+
+    joined = pc.binary_join(arr.cast(pa.list_(pa.string())), sep)
+
+    return joined.dictionary_encode().to_pandas()
+
+
+def to_pandas(table: pa.Table, name: str) -> pd.DataFrame:
+    """
+    Creates a data frame from an Arrow table of the web service.
+
+    Dictionary encoded columns become categoricals, list columns are
+    joined into categoricals of separated values, as in the TSV based
+    tables. Numeric columns without missing values refer to the memory
+    mapped buffers without copying.
+
+    The query handlers filter and print the separated values, hence we
+    keep them as strings; the sets built from them by the server split
+    each distinct value only once.
+    """
+
+    list_cols = LIST_COLUMNS.get(name, {})
+
+    df = table.drop_columns(
+        [c for c in list_cols if c in table.column_names]
+    ).to_pandas(split_blocks = True)
+
+    for i, colname in enumerate(table.column_names):
+
+        if colname in list_cols:
+
+            df.insert(
+                i,
+                colname,
+                _join_list_column(table[colname], list_cols[colname]),
+            )
+
+    return df
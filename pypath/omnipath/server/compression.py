@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Compression of the web service responses.
+
+The encoding is negotiated with the client by the ``Accept-Encoding``
+header. Streamed responses are compressed chunk by chunk, hence the
+server never holds the whole uncompressed response in memory.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+import zlib
+
+import pypath.share.session as session_mod
+
+_logger = session_mod.Logger(name = 'server_compression')
+_log = _logger._log
+
+try:
+
+    import zstandard
+
+except ModuleNotFoundError:
+
+    zstandard = None
+    _log(
+        'Module `zstandard` not available. '
+        'The server will offer only gzip compression.'
+    )
+
+__all__ = [
+    'ENCODINGS',
+    'available',
+    'negotiate',
+    'compress',
+    'compress_chunks',
+]
+
+#: Supported encodings, in the order of preference.
+ENCODINGS = ('zstd', 'gzip')
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def available() -> tuple[str]:
+    """
+    The encodings supported in this environment.
+    """
+
+    return tuple(
+        enc
+        for enc in ENCODINGS
+        if enc != 'zstd' or zstandard is not None
+    )
+
+
+def negotiate(
+        accept_encoding: bytes | str | None,
+        offered: Iterable[str] = ENCODINGS,
+    ) -> str | None:
+    """
+    Selects the encoding of a response.
+
+    :arg accept_encoding:
+        The value of the ``Accept-Encoding`` header of the request.
+    :arg offered:
+        Encodings offered by the server, in the order of preference.
+
+    :return:
+        The name of the encoding, or ``None`` if the response should be
+        sent uncompressed.
+    """
+
+    if not accept_encoding:
+
+        return None
+
+    if isinstance(accept_encoding, bytes):
+
+        accept_encoding = accept_encoding.decode('ascii', 'ignore')
+
+    accepted = {}
+
+    for item in accept_encoding.lower().split(','):
+
+        enc, *params = (part.strip() for part in item.split(';'))
+        q = 1.0
+
+        for param in params:
+
+            if param.startswith('q='):
+
+                try:
+
+                    q = float(param[2:])
+
+                except ValueError:
+
+                    q = 0.0
+
+        accepted[enc] = q
+
+    supported = available()
+
+    for enc in offered:
+
+        if (
+            enc in supported and
+            accepted.get(enc, accepted.get('*', 0.0)) > 0
+        ):
+
+            return enc
+
+
+def _compressor(encoding: str):
+
+    if encoding == 'gzip':
+
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    elif encoding == 'zstd':
+
+        return zstandard.ZstdCompressor(level = ZSTD_LEVEL).compressobj()
+
+    raise ValueError('Unknown encoding: `%s`.' % encoding)
+
+
+def compress(body: bytes | str, encoding: str) -> bytes:
+    """
+    Compresses a response body.
+    """
+
+    if isinstance(body, str):
+
+        body = body.encode('utf-8')
+
+    comp = _compressor(encoding)
+
+    return comp.compress(body) + comp.flush()
+
+
+def compress_chunks(
+        chunks: Iterable[bytes | str],
+        encoding: str,
+    ) -> Iterator[bytes]:
+    """
+    Compresses a streamed response chunk by chunk.
+
+    The compressor keeps its state between the chunks, hence the result is
+    one compressed stream. Chunks which do not yet produce compressed output
+    are not passed on.
+    """
+
+    comp = _compressor(encoding)
+
+    for chunk in chunks:
+
+        if isinstance(chunk, str):
+
+            chunk = chunk.encode('utf-8')
+
+        data = comp.compress(chunk)
+
+        if data:
+
+            yield data
+
+    yield comp.flush()
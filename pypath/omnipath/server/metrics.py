@@ -0,0 +1,429 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Timing and profiling of the web service requests.
+
+Each request carries a ``RequestTimer`` which records the time spent in
+the phases of processing, the number of rows and the size of the
+response. The timers of the finished requests are aggregated in
+``Metrics``, served in the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+import os
+import time
+import random
+import bisect
+import cProfile
+import threading
+import contextlib
+import collections
+
+import pypath.share.session as session_mod
+
+_logger = session_mod.Logger(name = 'server_metrics')
+_log = _logger._log
+
+__all__ = ['PHASES', 'RequestTimer', 'Metrics', 'Profiler']
+
+#: Phases of processing a request, in order.
+PHASES = ('parse', 'queue', 'filter', 'license', 'serialize', 'write')
+
+#: Upper bounds of the latency histogram buckets, in seconds.
+BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5., 10., 30., 60.)
+
+PREFIX = 'pypath_server'
+
+
+class RequestTimer(object):
+    """
+    Records the timings and sizes of one request.
+
+    The ``write`` phase is what remains from the total time after all
+    other phases, i.e. sending the response and the overhead of the
+    server.
+    """
+
+    def __init__(self, query_type: str | None = None):
+
+        self.query_type = query_type
+        self.start = time.perf_counter()
+        self.phases = collections.Counter()
+        self.rows_in = 0
+        self.rows_out = 0
+        self.bytes = 0
+        self.total = None
+        self.profile = None
+
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """
+        Adds the time spent in the context to a phase.
+        """
+
+        t0 = time.perf_counter()
+
+        try:
+
+            yield
+
+        finally:
+
+            self.phases[name] += time.perf_counter() - t0
+
+
+    def since_start(self, name: str):
+        """
+        Adds the time elapsed since the start of the request, less the
+        phases recorded so far, to a phase.
+        """
+
+        self.phases[name] += max(
+            time.perf_counter() - self.start - sum(self.phases.values()),
+            0.,
+        )
+
+
+    def chunks(
+            self,
+            chunks: Iterable,
+            phase: str = 'serialize',
+        ) -> Iterator:
+        """
+        Passes through the chunks of a streamed response, adding the time
+        spent in creating them to a phase and counting their size.
+        """
+
+        chunks = iter(chunks)
+
+        while True:
+
+            with self.phase(phase):
+
+                try:
+
+                    chunk = next(chunks)
+
+                except StopIteration:
+
+                    return
+
+            if isinstance(chunk, str):
+
+                chunk = chunk.encode('utf-8')
+
+            self.bytes += len(chunk)
+
+            yield chunk
+
+
+    def finish(self) -> float:
+        """
+        Records the end of the request.
+
+        :return:
+            The total time in seconds.
+        """
+
+        if self.total is None:
+
+            self.total = time.perf_counter() - self.start
+            self.phases['write'] += max(
+                self.total - sum(self.phases.values()),
+                0.,
+            )
+
+        return self.total
+
+
+    def summary(self) -> str:
+
+        return '; '.join(
+            ['total: %.04fs' % (self.total or 0.)] +
+            [
+                '%s: %.04fs' % (phase, self.phases[phase])
+                for phase in PHASES
+                if phase in self.phases
+            ] +
+            [
+                'rows in: %u' % self.rows_in,
+                'rows out: %u' % self.rows_out,
+                'bytes: %u' % self.bytes,
+            ]
+        )
+
+
+class Metrics(object):
+    """
+    Aggregated timings of the requests by query type.
+    """
+
+
+    def __init__(self, buckets: tuple[float] = BUCKETS):
+
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.requests = collections.Counter()
+        self.duration = collections.Counter()
+        self.histogram = collections.defaultdict(
+            lambda: [0] * (len(self.buckets) + 1)
+        )
+        self.phases = collections.Counter()
+        self.rows_in = collections.Counter()
+        self.rows_out = collections.Counter()
+        self.bytes = collections.Counter()
+
+
+    def observe(self, timer: RequestTimer):
+        """
+        Adds a finished request.
+        """
+
+        query = timer.query_type or ''
+        total = timer.finish()
+
+        with self._lock:
+
+            self.requests[query] += 1
+            self.duration[query] += total
+            self.histogram[query][bisect.bisect_left(self.buckets, total)] += 1
+            self.rows_in[query] += timer.rows_in
+            self.rows_out[query] += timer.rows_out
+            self.bytes[query] += timer.bytes
+
+            for phase, seconds in timer.phases.items():
+
+                self.phases[(query, phase)] += seconds
+
+
+    def render(self, gauges: dict | None = None) -> str:
+        """
+        The metrics in the Prometheus text format.
+
+        :param gauges:
+            Further metrics with their current values: names as keys,
+            values either numbers or dicts of label tuples and numbers.
+        """
+
+        lines = []
+
+        def metric(name, kind, help_, values):
+
+            lines.append('# HELP %s_%s %s' % (PREFIX, name, help_))
+            lines.append('# TYPE %s_%s %s' % (PREFIX, name, kind))
+
+            for labels, value in values:
+
+                lines.append(
+                    '%s_%s%s %s' % (
+                        PREFIX,
+                        name,
+                        _labels(labels),
+                        _number(value),
+                    )
+                )
+
+        with self._lock:
+
+            queries = sorted(self.requests)
+
+            metric(
+                'requests_total',
+                'counter',
+                'Number of requests served.',
+                [((('query', q),), self.requests[q]) for q in queries],
+            )
+
+            lines.append(
+                '# HELP %s_request_duration_seconds Time to serve the '
+                'requests.' % PREFIX
+            )
+            lines.append(
+                '# TYPE %s_request_duration_seconds histogram' % PREFIX
+            )
+
+            for q in queries:
+
+                cumulative = 0
+
+                for le, count in zip(
+                    self.buckets + ('+Inf',),
+                    self.histogram[q],
+                ):
+
+                    cumulative += count
+                    lines.append(
+                        '%s_request_duration_seconds_bucket%s %u' % (
+                            PREFIX,
+                            _labels((('query', q), ('le', le))),
+                            cumulative,
+                        )
+                    )
+
+                lines.append(
+                    '%s_request_duration_seconds_sum%s %s' % (
+                        PREFIX,
+                        _labels((('query', q),)),
+                        _number(self.duration[q]),
+                    )
+                )
+                lines.append(
+                    '%s_request_duration_seconds_count%s %u' % (
+                        PREFIX,
+                        _labels((('query', q),)),
+                        self.requests[q],
+                    )
+                )
+
+            metric(
+                'phase_seconds_total',
+                'counter',
+                'Time spent in the phases of processing the requests.',
+                [
+                    ((('query', q), ('phase', p)), seconds)
+                    for (q, p), seconds in sorted(self.phases.items())
+                ],
+            )
+
+            for name, counter, help_ in (
+                ('rows_in_total', self.rows_in, 'Rows of the tables queried.'),
+                ('rows_out_total', self.rows_out, 'Rows served.'),
+                ('response_bytes_total', self.bytes, 'Bytes served.'),
+            ):
+
+                metric(
+                    name,
+                    'counter',
+                    help_,
+                    [((('query', q),), counter[q]) for q in queries],
+                )
+
+        for name, (help_, values) in sorted((gauges or {}).items()):
+
+            metric(
+                name,
+                'gauge',
+                help_,
+                (
+                    sorted(values.items())
+                        if isinstance(values, dict) else
+                    [((), values)]
+                ),
+            )
+
+        return '%s\n' % '\n'.join(lines)
+
+
+class Profiler(object):
+    """
+    Profiles a sample of the requests and saves the profiles of the slow
+    ones.
+
+    :param threshold:
+        Save the profiles of requests longer than this, in seconds.
+    :param rate:
+        Fraction of the requests to profile.
+    :param path:
+        Directory to save the profiles, in ``pstats`` format.
+    """
+
+
+    def __init__(
+            self,
+            threshold: float,
+            rate: float = .01,
+            path: str | None = None,
+        ):
+
+        self.threshold = threshold
+        self.rate = rate
+        self.path = path or os.path.join(os.getcwd(), 'profiles')
+        # only one thread can be profiled at a time
+        self._lock = threading.Lock()
+
+        os.makedirs(self.path, exist_ok = True)
+
+
+    def call(self, timer: RequestTimer, func, *args, **kwargs):
+        """
+        Calls a function, profiled if the request has been sampled.
+        """
+
+        if random.random() >= self.rate or not self._lock.acquire(False):
+
+            return func(*args, **kwargs)
+
+        try:
+
+            profile = cProfile.Profile()
+            result = profile.runcall(func, *args, **kwargs)
+            timer.profile = profile
+
+        finally:
+
+            self._lock.release()
+
+        return result
+
+
+    def save(self, timer: RequestTimer):
+        """
+        Saves the profile of a request if it took longer than the threshold.
+        """
+
+        if timer.profile is None or timer.finish() < self.threshold:
+
+            return
+
+        path = os.path.join(
+            self.path,
+            '%s-%s-%.03fs.prof' % (
+                timer.query_type,
+                time.strftime('%Y%m%d-%H%M%S'),
+                timer.total,
+            ),
+        )
+        timer.profile.dump_stats(path)
+        timer.profile = None
+        _log('Profile of a slow request saved to `%s`.' % path)
+
+
+def _labels(labels: tuple) -> str:
+
+    return (
+        '{%s}' % ','.join(
+            '%s="%s"' % (
+                key,
+                str(value).replace('\\', '\\\\').replace('"', '\\"'),
+            )
+            for key, value in labels
+        )
+            if labels else
+        ''
+    )
+
+
+def _number(value) -> str:
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
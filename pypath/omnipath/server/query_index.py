@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Inverted indexes for the query filters of the web service.
+
+An index maps values (resource names, identifiers, confidence levels)
+to the row numbers of a table where they occur, hence the filters of the
+web service queries select the matching rows without scanning the whole
+table.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+__all__ = ['InvertedIndex', 'intersect']
+
+
+class InvertedIndex(object):
+    """
+    Maps values to sorted arrays of row numbers.
+
+    The row numbers are stored in one array, ordered by value and row, with
+    the positions of the values in the ``offsets`` array (as in a CSR
+    matrix).
+
+    :arg dict keys:
+        Values mapped to their position in ``offsets``.
+    :arg numpy.ndarray offsets:
+        Start of the row numbers of each value in ``row_ids``, with the
+        total length as the last element.
+    :arg numpy.ndarray row_ids:
+        Row numbers.
+    :arg int n:
+        Number of rows in the table.
+    """
+
+    __slots__ = ['_keys', 'offsets', 'row_ids', 'n']
+
+
+    def __init__(
+            self,
+            keys: dict,
+            offsets: np.ndarray,
+            row_ids: np.ndarray,
+            n: int,
+        ):
+
+        self._keys = keys
+        self.offsets = offsets
+        self.row_ids = row_ids
+        self.n = n
+
+
+    @classmethod
+    def from_columns(
+            cls,
+            *cols: pd.Series,
+            sep: str | None = None,
+        ) -> InvertedIndex:
+        """
+        Builds an index from one or more columns of a data frame.
+
+        Values from all columns are indexed together, e.g. an index built
+        from the ``source`` and ``source_genesymbol`` columns finds the rows
+        both by UniProt IDs and gene symbols. Missing values are not
+        indexed.
+
+        :arg cols:
+            Columns of the same length. Categorical columns are indexed
+            much faster, as each distinct value is processed only once.
+        :arg sep:
+            Separator for columns containing lists of values.
+        """
+
+        n = len(cols[0]) if cols else 0
+        vocabulary = {}
+        key_ids = []
+        row_ids = []
+
+        for col in cols:
+
+            if not isinstance(col.dtype, pd.CategoricalDtype):
+
+                col = col.astype('category')
+
+            cat_keys = [
+                (
+                    str(cat).split(sep)
+                        if sep else
+                    [cat]
+                )
+                for cat in col.cat.categories
+            ]
+            cat_items = np.array(
+                [
+                    vocabulary.setdefault(key, len(vocabulary))
+                    for keys in cat_keys
+                    for key in keys
+                ],
+                dtype = np.int64,
+            )
+            # the last element is for the missing values (code -1)
+            cat_lens = np.array(
+                [len(keys) for keys in cat_keys] + [0],
+                dtype = np.int64,
+            )
+            cat_starts = np.concatenate([[0], np.cumsum(cat_lens[:-1])])
+
+            codes = col.cat.codes.to_numpy()
+            lens = cat_lens[codes]
+            offsets = np.concatenate([[0], np.cumsum(lens)])
+            idx = (
+                np.repeat(cat_starts[codes] - offsets[:-1], lens) +
+                np.arange(offsets[-1])
+            )
+
+            key_ids.append(cat_items[idx])
+            row_ids.append(np.repeat(np.arange(n, dtype = np.int64), lens))
+
+        key_ids = np.concatenate(key_ids) if key_ids else np.array([], int)
+        row_ids = np.concatenate(row_ids) if row_ids else np.array([], int)
+        order = np.lexsort((row_ids, key_ids))
+        key_ids = key_ids[order]
+        row_ids = row_ids[order]
+
+        if len(cols) > 1:
+
+            # the same value in more than one column of the same row
+            unique = np.ones(len(key_ids), dtype = bool)
+            unique[1:] = (
+                (np.diff(key_ids) != 0) |
+                (np.diff(row_ids) != 0)
+            )
+            key_ids = key_ids[unique]
+            row_ids = row_ids[unique]
+
+        offsets = np.concatenate([
+            [0],
+            np.cumsum(np.bincount(key_ids, minlength = len(vocabulary))),
+        ])
+
+        return cls(
+            keys = vocabulary,
+            offsets = offsets,
+            row_ids = row_ids.astype(np.uint32 if n < 2 ** 32 else np.int64),
+            n = n,
+        )
+
+
+    def __contains__(self, key) -> bool:
+
+        return key in self._keys
+
+
+    def __len__(self) -> int:
+
+        return len(self._keys)
+
+
+    def keys(self):
+
+        return self._keys.keys()
+
+
+    def rows(self, keys: Iterable) -> np.ndarray:
+        """
+        Sorted row numbers where any of the values occur.
+        """
+
+        slices = [
+            self.row_ids[self.offsets[i]:self.offsets[i + 1]]
+            for i in (self._keys[k] for k in keys if k in self._keys)
+        ]
+
+        return (
+            np.array([], dtype = np.int64)
+                if not slices else
+            slices[0].astype(np.int64)
+                if len(slices) == 1 else
+            np.unique(np.concatenate(slices)).astype(np.int64)
+        )
+
+
+    def count(self, key) -> int:
+        """
+        Number of rows where the value occurs.
+        """
+
+        i = self._keys.get(key, None)
+
+        return 0 if i is None else int(self.offsets[i + 1] - self.offsets[i])
+
+
+    def isin(self, keys: Iterable, rows: np.ndarray) -> np.ndarray:
+        """
+        Boolean array, for each of ``rows``, whether any of the values occur
+        in that row.
+        """
+
+        return np.isin(rows, self.rows(keys))
+
+
+def intersect(rows: np.ndarray | None, other: np.ndarray) -> np.ndarray:
+    """
+    Intersection of sorted arrays of row numbers, ``None`` standing for
+    all rows.
+    """
+
+    return (
+        other
+            if rows is None else
+        np.intersect1d(rows, other, assume_unique = True)
+    )
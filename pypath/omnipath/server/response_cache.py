@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Cache of the web service responses.
+
+The clients send the same few queries over and over again, hence the
+encoded responses are kept in memory, up to a total size, and the least
+recently used ones are evicted first. Evicted responses optionally are
+written to disk in compressed form.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+import os
+import gzip
+import hashlib
+import threading
+import collections
+
+import pypath.share.session as session_mod
+
+_logger = session_mod.Logger(name = 'response_cache')
+_log = _logger._log
+
+__all__ = ['ResponseCache', 'query_key']
+
+# arguments where the order of the values matters
+ORDERED_ARGS = {b'fields'}
+# arguments with no effect on the response
+IGNORED_ARGS = {b'password'}
+
+
+def query_key(postpath: list[str], args: dict) -> tuple:
+    """
+    Normalized key of a query.
+
+    The arguments are sorted, and so are the comma separated values
+    within the arguments, except the ones where the order matters
+    (``fields``).
+
+    :arg postpath:
+        The path segments of the request.
+    :arg args:
+        The arguments of the request, as processed by ``BaseServer``:
+        with bytes keys and lists of one bytes value.
+    """
+
+    return (
+        tuple(postpath),
+        tuple(
+            (
+                key,
+                tuple(
+                    val
+                        if key in ORDERED_ARGS else
+                    b','.join(sorted(set(val.split(b','))))
+                    for val in values
+                    if isinstance(val, bytes)
+                ),
+            )
+            for key, values in sorted(args.items())
+            if key not in IGNORED_ARGS
+        ),
+    )
+
+
+class ResponseCache(object):
+    """
+    Size bounded LRU cache of responses.
+
+    :arg max_bytes:
+        Total size of the responses kept in memory.
+    :arg max_entry_bytes:
+        Responses larger than this are not cached. By default a quarter
+        of ``max_bytes``.
+    :arg spill_dir:
+        Directory to write the responses evicted from the memory. If
+        ``None``, the evicted responses are discarded.
+    :arg spill_max_bytes:
+        Total size of the compressed responses kept on disk.
+    """
+
+
+    def __init__(
+            self,
+            max_bytes: int,
+            max_entry_bytes: int | None = None,
+            spill_dir: str | None = None,
+            spill_max_bytes: int | None = None,
+        ):
+
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max_bytes // 4
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes or max_bytes * 8
+        self._lock = threading.RLock()
+        self.clear()
+
+        if self.spill_dir:
+
+            os.makedirs(self.spill_dir, exist_ok = True)
+
+
+    def clear(self):
+        """
+        Removes all responses, from the memory and the disk.
+        """
+
+        with self._lock:
+
+            for path, _ in getattr(self, '_disk', {}).values():
+
+                if os.path.exists(path):
+
+                    os.remove(path)
+
+            self._mem = collections.OrderedDict()
+            self._disk = collections.OrderedDict()
+            self.size = 0
+            self.disk_size = 0
+            self.hits = 0
+            self.misses = 0
+
+
+    def __len__(self):
+
+        return len(self._mem) + len(self._disk)
+
+
+    def __contains__(self, key):
+
+        return key in self._mem or key in self._disk
+
+
+    def get(self, key) -> bytes | None:
+        """
+        Looks up a response, returns ``None`` if it is not in the cache.
+        """
+
+        with self._lock:
+
+            if key in self._mem:
+
+                self._mem.move_to_end(key)
+                self.hits += 1
+
+                return self._mem[key]
+
+            if key in self._disk:
+
+                path, size = self._disk.pop(key)
+                self.disk_size -= size
+
+                if os.path.exists(path):
+
+                    with gzip.open(path, 'rb') as fp:
+
+                        body = fp.read()
+
+                    os.remove(path)
+                    self.hits += 1
+                    self.set(key, body)
+
+                    return body
+
+            self.misses += 1
+
+
+    def set(self, key, body: bytes):
+        """
+        Adds a response to the cache, if not larger than ``max_entry_bytes``.
+        """
+
+        if len(body) > self.max_entry_bytes:
+
+            return
+
+        with self._lock:
+
+            if key in self._mem:
+
+                self.size -= len(self._mem.pop(key))
+
+            self._mem[key] = body
+            self.size += len(body)
+
+            while self.size > self.max_bytes:
+
+                old_key, old_body = self._mem.popitem(last = False)
+                self.size -= len(old_body)
+                self._spill(old_key, old_body)
+
+
+    def collect(self, key, chunks: Iterable[bytes | str]) -> Iterator:
+        """
+        Passes through the chunks of a streamed response while saving them.
+
+        The response is added to the cache once all chunks have been
+        consumed, unless it turns out to be too large.
+        """
+
+        collected = []
+        total = 0
+
+        for chunk in chunks:
+
+            if collected is not None:
+
+                data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                total += len(data)
+                collected.append(data)
+
+                if total > self.max_entry_bytes:
+
+                    collected = None
+
+            yield chunk
+
+        if collected is not None:
+
+            self.set(key, b''.join(collected))
+
+
+    def _spill(self, key, body: bytes):
+
+        if not self.spill_dir:
+
+            return
+
+        path = os.path.join(
+            self.spill_dir,
+            '%s.gz' % hashlib.md5(repr(key).encode('utf-8')).hexdigest(),
+        )
+
+        with gzip.open(path, 'wb', compresslevel = 4) as fp:
+
+            fp.write(body)
+
+        size = os.path.getsize(path)
+        self._disk[key] = (path, size)
+        self.disk_size += size
+
+        while self.disk_size > self.spill_max_bytes and self._disk:
+
+            _key, (old_path, old_size) = self._disk.popitem(last = False)
+            self.disk_size -= old_size
+
+            if os.path.exists(old_path):
+
+                os.remove(old_path)
+
+
+    def stats(self) -> dict:
+        """
+        Number of entries, sizes, hits and misses.
+        """
+
+        return {
+            'entries': len(self._mem),
+            'bytes': self.size,
+            'disk_entries': len(self._disk),
+            'disk_bytes': self.disk_size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -26,6 +26,7 @@ import copy
 import collections
 import itertools
 import hashlib
+import time
 import warnings
 import contextlib
 
@@ -38,11 +39,18 @@ try:
     import twisted.web.resource
     import twisted.web.server
     import twisted.internet.reactor
+    import twisted.internet.defer
+    import twisted.internet.threads
+    import twisted.python.threadpool
     TwistedWebResource = twisted.web.resource.Resource
     TwistedWebSite = twisted.web.server.Site
     TWISTED_NOT_DONE_YET = twisted.web.server.NOT_DONE_YET
     twisted_listen_tcp = twisted.internet.reactor.listenTCP
     twisted_run = twisted.internet.reactor.run
+    twisted_reactor = twisted.internet.reactor
+    TwistedThreadPool = twisted.python.threadpool.ThreadPool
+    TwistedDeferredSemaphore = twisted.internet.defer.DeferredSemaphore
+    twisted_defer_to_pool = twisted.internet.threads.deferToThreadPool
 except:
     _log('No module `twisted` available. Necessary to run HTTP server.', -1)
     class TwistedWebResource: pass
@@ -50,6 +58,10 @@ except:
     TWISTED_NOT_DONE_YET = None
     twisted_listen_tcp = lambda: None
     twisted_run = lambda: None
+    twisted_reactor = None
+    TwistedThreadPool = None
+    TwistedDeferredSemaphore = None
+    twisted_defer_to_pool = None
 
 import urllib
 import json
@@ -60,6 +72,11 @@ import numpy as np
 
 import pypath.resources as resources
 from pypath.omnipath.server import generate_about_page
+import pypath.omnipath.server.columnar as columnar
+import pypath.omnipath.server.query_index as query_index
+import pypath.omnipath.server.response_cache as response_cache
+import pypath.omnipath.server.compression as compression_mod
+import pypath.omnipath.server.metrics as metrics_mod
 import pypath.omnipath.server._html as _html
 import pypath.resources.urls as urls
 import pypath.resources as resources_mod
@@ -82,6 +99,125 @@ def stop_server():
     reactor.removeAll()
 
 
+class ResponseProducer(object):
+    """
+    Writes a response from an iterable of chunks.
+
+    Registered as a pull producer on the request: a new chunk is encoded
+    only when the transport has written out the previous one, hence the
+    reactor serves other requests meanwhile and the memory use is limited
+    to a few chunks. Without ``Content-Length`` header Twisted sends the
+    chunks by chunked transfer encoding.
+    """
+
+    def __init__(self, request, chunks, on_finish = None, pool = None):
+
+        self.request = request
+        self.chunks = iter(chunks)
+        self.on_finish = on_finish
+        self.pool = pool
+        self._stopped = False
+        self._waiting = False
+
+
+    def start(self):
+
+        self.request.notifyFinish().addErrback(self._client_gone)
+        self.request.registerProducer(self, False)
+
+
+    def resumeProducing(self):
+
+        if self._stopped or self._waiting:
+
+            return
+
+        if self.pool:
+
+            # encoding the next chunk in a worker thread
+            self._waiting = True
+            d = twisted_defer_to_pool(twisted_reactor, self.pool, self._next)
+            d.addCallback(self._write)
+
+        else:
+
+            self._write(self._next())
+
+
+    def _next(self):
+
+        try:
+
+            return next(self.chunks)
+
+        except StopIteration:
+
+            return None
+
+        except Exception:
+
+            _log(
+                'Error while streaming `%s`:' %
+                self.request.uri.decode('utf-8')
+            )
+            _logger._log_traceback()
+
+            return False
+
+
+    def _write(self, chunk):
+
+        self._waiting = False
+
+        if self._stopped:
+
+            return
+
+        if chunk is None or chunk is False:
+
+            self._finish(failed = chunk is False)
+
+        else:
+
+            self.request.write(
+                chunk.encode('utf-8') if hasattr(chunk, 'encode') else chunk
+            )
+
+
+    def stopProducing(self):
+
+        self._stopped = True
+
+        if hasattr(self.chunks, 'close'):
+
+            self.chunks.close()
+
+
+    def _client_gone(self, failure):
+
+        self.stopProducing()
+
+
+    def _finish(self, failed = False):
+
+        self._stopped = True
+        self.request.unregisterProducer()
+
+        if failed:
+
+            # without the terminating chunk the client knows
+            # that the response is incomplete
+            self.request.loseConnection()
+
+        else:
+
+            self.request.finish()
+
+        if self.on_finish:
+
+            self.on_finish(self.request)
+
+
 @contextlib.contextmanager
 def ignore_pandas_copywarn():
 
@@ -124,6 +260,9 @@ class BaseServer(TwistedWebResource, session_mod.Logger):
         self._set_www_root()
         self._read_license_secret()
         self._res_ctrl = resources_mod.get_controller()
+        self._setup_pool()
+        self._setup_cache()
+        self._setup_metrics()
 
         TwistedWebResource.__init__(self)
         self._log('Twisted resource initialized.')
@@ -132,6 +271,7 @@ class BaseServer(TwistedWebResource, session_mod.Logger):
     def render_GET(self, request):
 
         response = []
+        request.timer = metrics_mod.RequestTimer()
 
         request.postpath = [i.decode('utf-8') for i in request.postpath if i]
 
@@ -148,6 +288,9 @@ class BaseServer(TwistedWebResource, session_mod.Logger):
             request.postpath = ['index.html']
 
         request.postpath[0] = self._query_type(request.postpath[0])
+        request.timer.query_type = self._metrics_query_type(
+            request.postpath[0]
+        )
 
         self._set_headers(request)
 
@@ -178,15 +321,49 @@ class BaseServer(TwistedWebResource, session_mod.Logger):
                     )
                 )
 
-                try:
+                request.timer.since_start('parse')
+                encoding = self._encoding(request)
+                toCall = self._timing_call(toCall)
+                toCall = self._compressing_call(encoding, toCall)
+
+                if self._cached(request.postpath[0]):
+
+                    key = (
+                        response_cache.query_key(
+                            request.postpath,
+                            request.args,
+                        ),
+                        encoding,
+                        getattr(self, '_data_version', None),
+                    )
+
+                    if self._not_modified(request, key):
+
+                        return TWISTED_NOT_DONE_YET
 
-                    response = toCall(request)
                     response = (
-                        response.encode('utf-8')
-                        if hasattr(response, 'encode') else
-                        response
+                        self._cache.get(key)
+                            if self._cache is not None else
+                        None
                     )
-                    response = [response]
+
+                    if response is not None:
+
+                        self._write_response(request, [response])
+
+                        return TWISTED_NOT_DONE_YET
+
+                    toCall = self._caching_call(key, toCall)
+
+                if self._in_pool(request.postpath[0]):
+
+                    self._render_in_pool(request.postpath[0], toCall, request)
+
+                    return TWISTED_NOT_DONE_YET
+
+                try:
+
+                    response = self._handler_response(toCall(request))
 
                 except:
 
@@ -195,7 +372,9 @@ class BaseServer(TwistedWebResource, session_mod.Logger):
                         request.uri.decode('utf-8')
                     )
                     self._log_traceback()
-                    raise
+                    self._write_error(request)
+
+                    return TWISTED_NOT_DONE_YET
 
         else:
 
@@ -209,8 +388,56 @@ class BaseServer(TwistedWebResource, session_mod.Logger):
 
                 response = self._add_html_header(local_path, response)
 
+        self._write_response(request, response)
+
+        return TWISTED_NOT_DONE_YET
+
+
+    @staticmethod
+    def _handler_response(response):
+
+        return (
+            response
+                if (
+                    BaseServer._is_stream(response) or
+                    isinstance(response, list)
+                ) else
+            [
+                response.encode('utf-8')
+                    if hasattr(response, 'encode') else
+                response
+            ]
+        )
+
+
+    def _write_response(self, request, response):
+        """
+        Writes the response and finishes the request.
+
+        :param request:
+            A Twisted request object.
+        :param response:
+            Either a list with the response body as its single element,
+            or an iterable of chunks to be streamed, or an empty list if
+            nothing has been found.
+        """
+
+        timer = self._timer(request)
+
+        if self._is_stream(response):
+
+            ResponseProducer(
+                request,
+                timer.chunks(response),
+                on_finish = self._log_finished,
+                pool = getattr(self, '_pool', None),
+            ).start()
+
+            return
+
         if not response:
 
+            request.responseHeaders.removeHeader('Content-Encoding')
             response = [
                 (
                     "Not found: %s%s" % (
@@ -230,16 +457,478 @@ class BaseServer(TwistedWebResource, session_mod.Logger):
                 ).encode('utf-8')
             ]
 
+        timer.bytes = len(response[0])
         request.setHeader('Content-Length',  str(len(response[0])))
         request.write(response[0])
+        request.finish()
+        self._log_finished(request)
+
+
+    def _write_error(self, request):
+        """
+        Responds with the internal server error page. The page is never
+        compressed, hence the ``Content-Encoding`` header is removed.
+        """
+
+        request.setResponseCode(500)
+        request.responseHeaders.removeHeader('Content-Encoding')
+        self._write_response(request, [_html.http_500().encode('utf-8')])
+
+
+    def _setup_pool(self):
+        """
+        Creates the thread pool for the query handlers.
+
+        The handlers of the queries in ``threaded_queries`` run in a pool
+        of ``workers`` threads, so the reactor keeps accepting and serving
+        other requests meanwhile. The number of queries of the same type
+        processed at once is limited by ``concurrency``, the rest wait in
+        a queue.
+        """
+
+        self._pool = None
+        self._semaphores = {}
+
+        workers = getattr(self, 'workers', 0)
+
+        if not workers or TwistedThreadPool is None:
+
+            return
+
+        self._log('Starting a pool of %u worker threads.' % workers)
+
+        self._pool = TwistedThreadPool(
+            minthreads = 1,
+            maxthreads = workers,
+            name = 'pypath-server',
+        )
+        twisted_reactor.callWhenRunning(self._pool.start)
+        twisted_reactor.addSystemEventTrigger(
+            'during',
+            'shutdown',
+            self._pool.stop,
+        )
+
+
+    def _in_pool(self, query_type):
+
+        return (
+            getattr(self, '_pool', None) is not None and
+            query_type in getattr(self, 'threaded_queries', ())
+        )
+
+
+    def _semaphore(self, query_type):
+
+        if query_type not in self._semaphores:
+
+            concurrency = getattr(self, 'concurrency', None)
+            limit = (
+                concurrency.get(query_type, None)
+                    if isinstance(concurrency, dict) else
+                concurrency
+            )
+            self._semaphores[query_type] = TwistedDeferredSemaphore(
+                limit or self.workers
+            )
+
+        return self._semaphores[query_type]
+
+
+    def _render_in_pool(self, query_type, to_call, request):
+
+        gone = []
+        request.notifyFinish().addErrback(lambda _: gone.append(True))
+
+        def run():
+
+            if gone:
+
+                # the client disconnected while waiting in the queue
+                return
+
+            self._timer(request).since_start('queue')
+
+            return twisted_defer_to_pool(
+                twisted_reactor,
+                self._pool,
+                lambda: self._handler_response(to_call(request)),
+            )
+
+
+        def write(response):
+
+            if not gone:
+
+                self._write_response(request, response)
+
+
+        def failed(failure):
+
+            self._log(
+                'Error while rendering `%s`:' % request.uri.decode('utf-8')
+            )
+            self._log(failure.getTraceback())
+
+            if not gone:
+
+                self._write_error(request)
+
+
+        d = self._semaphore(query_type).run(run)
+        d.addCallback(write)
+        d.addErrback(failed)
+
+
+    def _queue_status(self):
+        """
+        Number of running and waiting queries by query type.
+
+        :return:
+            Dict of query types with tuples of two integers: the number of
+            queries being processed and waiting in the queue.
+        """
+
+        return {
+            query_type: (sem.limit - sem.tokens, len(sem.waiting))
+            for query_type, sem in iteritems(getattr(self, '_semaphores', {}))
+        }
+
+
+    def status(self, req):
+
+        result = {
+            query_type: {'running': running, 'queued': queued}
+            for query_type, (running, queued) in iteritems(self._queue_status())
+        }
+
+        if b'format' in req.args and req.args[b'format'][0] == b'json':
+
+            return json.dumps(result)
+
+        else:
+
+            return 'query\trunning\tqueued\n%s' % '\n'.join(
+                '%s\t%u\t%u' % (k, v['running'], v['queued'])
+                for k, v in sorted(iteritems(result))
+            )
+
+
+    @staticmethod
+    def _is_stream(response):
+
+        return (
+            response is not None and
+            not isinstance(response, (str, bytes, list))
+        )
+
+
+    def _log_finished(self, request):
+
+        timer = self._timer(request)
+        timer.finish()
+
+        if timer.query_type:
+
+            self._metrics.observe(timer)
+
+            if self._profiler:
+
+                self._profiler.save(timer)
 
         self._log(
-            'Finished serving request: `%s`.' % request.uri.decode('utf-8')
+            'Finished serving request: `%s`; %s.' % (
+                request.uri.decode('utf-8'),
+                timer.summary(),
+            )
         )
 
-        request.finish()
 
-        return TWISTED_NOT_DONE_YET
+    def _metrics_query_type(self, query_type):
+        """
+        The query type label of a request in the metrics. Anything else
+        than the known query types is labelled ``other``, so clients can
+        not create arbitrary number of metrics by requesting random paths.
+        """
+
+        known = (
+            set(getattr(self, 'query_types', ())) |
+            set(getattr(self, 'threaded_queries', ())) |
+            set(getattr(self, 'data', {}).keys())
+        )
+
+        return query_type if query_type in known else 'other'
+
+
+    def _setup_metrics(self):
+        """
+        Creates the aggregated metrics of the requests, and the profiler
+        if ``profile_threshold`` is set.
+        """
+
+        self._metrics = metrics_mod.Metrics()
+        threshold = getattr(self, 'profile_threshold', None)
+
+        self._profiler = (
+            metrics_mod.Profiler(
+                threshold = threshold,
+                rate = getattr(self, 'profile_rate', None) or .01,
+                path = getattr(self, 'profile_dir', None),
+            )
+                if threshold is not None else
+            None
+        )
+
+
+    @staticmethod
+    def _timer(request):
+
+        if not hasattr(request, 'timer'):
+
+            request.timer = metrics_mod.RequestTimer()
+
+        return request.timer
+
+
+    def _timing_call(self, to_call):
+        """
+        Wraps a query handler to record the time it spends with filtering
+        the data, i.e. besides the license filter and the serialization
+        which are recorded within the handlers. Profiles the handler if the
+        request is sampled by the profiler.
+        """
+
+        def call(request):
+
+            timer = self._timer(request)
+            tbl = getattr(self, 'data', {}).get(timer.query_type, None)
+            timer.rows_in = 0 if tbl is None else len(tbl)
+            other = timer.phases['license'] + timer.phases['serialize']
+            t0 = time.perf_counter()
+
+            response = (
+                self._profiler.call(timer, to_call, request)
+                    if self._profiler else
+                to_call(request)
+            )
+
+            other = (
+                timer.phases['license'] + timer.phases['serialize'] - other
+            )
+            timer.phases['filter'] += max(
+                time.perf_counter() - t0 - other,
+                0.,
+            )
+
+            return response
+
+        return call
+
+
+    def metrics(self, req):
+        """
+        Timings of the requests, the query queues and the response cache,
+        in the Prometheus text format.
+        """
+
+        queue_status = self._queue_status()
+        gauges = {
+            'queries_running': (
+                'Queries being processed.',
+                {
+                    (('query', q),): running
+                    for q, (running, _) in iteritems(queue_status)
+                },
+            ),
+            'queries_queued': (
+                'Queries waiting in the queue.',
+                {
+                    (('query', q),): queued
+                    for q, (_, queued) in iteritems(queue_status)
+                },
+            ),
+        }
+
+        if getattr(self, '_cache', None) is not None:
+
+            for key, value in iteritems(self._cache.stats()):
+
+                gauges['cache_%s' % key] = (
+                    'Response cache: %s.' % key.replace('_', ' '),
+                    value,
+                )
+
+        return self._metrics.render(gauges)
+
+
+    def _setup_cache(self):
+        """
+        Creates the cache of the responses.
+
+        The responses to the queries in ``cached_queries`` are kept in an
+        LRU cache of ``cache_size`` bytes, and the ones evicted from the
+        memory are written to ``cache_dir``, if it is set. If the size is
+        zero, nothing is cached, but the ``ETag`` headers are still sent,
+        so the clients are able to revalidate their own copies.
+        """
+
+        cache_size = getattr(self, 'cache_size', 0)
+
+        self._cache = (
+            response_cache.ResponseCache(
+                max_bytes = cache_size,
+                spill_dir = getattr(self, 'cache_dir', None),
+            )
+                if cache_size else
+            None
+        )
+
+        if self._cache is not None:
+
+            self._log(
+                'Caching responses up to %u MB.' % (cache_size // 1024 ** 2)
+            )
+
+
+    def _cached(self, query_type):
+
+        return query_type in getattr(self, 'cached_queries', ())
+
+
+    def _etag(self, key):
+        """
+        The ``ETag`` of a response: depends only on the normalized query
+        and the version of the data served.
+        """
+
+        return '"%s"' % hashlib.md5(
+            repr((key, getattr(self, '_data_version', None))).encode('utf-8')
+        ).hexdigest()
+
+
+    def _not_modified(self, request, key):
+        """
+        Sets the ``ETag`` header, and if the client already has this
+        version of the response (``If-None-Match``), answers with 304.
+
+        :return:
+            ``True`` if the request has been finished.
+        """
+
+        etag = self._etag(key)
+        request.setHeader('ETag', etag)
+        if_none_match = request.getHeader('If-None-Match')
+
+        if if_none_match and (
+            etag in {
+                tag.strip().replace('W/', '', 1)
+                for tag in if_none_match.split(',')
+            } or
+            if_none_match.strip() == '*'
+        ):
+
+            request.setResponseCode(304)
+            request.finish()
+            self._log_finished(request)
+
+            return True
+
+        return False
+
+
+    def _caching_call(self, key, to_call):
+        """
+        Wraps a query handler so its response is added to the cache.
+        """
+
+        if self._cache is None:
+
+            return to_call
+
+        def call(request):
+
+            response = self._handler_response(to_call(request))
+
+            if self._is_stream(response):
+
+                response = self._cache.collect(key, response)
+
+            elif response and response[0]:
+
+                self._cache.set(key, response[0])
+
+            return response
+
+        return call
+
+
+    def _encoding(self, request):
+        """
+        Negotiates the compression of the response by the
+        ``Accept-Encoding`` header, and sets the ``Content-Encoding`` and
+        ``Vary`` headers accordingly.
+
+        :return:
+            The name of the encoding, or ``None`` if the response should be
+            sent uncompressed.
+        """
+
+        offered = getattr(self, 'compression', None)
+
+        if not offered:
+
+            return None
+
+        request.setHeader('Vary', 'Accept-Encoding')
+        encoding = compression_mod.negotiate(
+            request.getHeader('Accept-Encoding'),
+            offered,
+        )
+
+        if encoding:
+
+            request.setHeader('Content-Encoding', encoding)
+
+        return encoding
+
+
+    def _compressing_call(self, encoding, to_call):
+        """
+        Wraps a query handler so its response is compressed. Streamed
+        responses are compressed chunk by chunk.
+        """
+
+        if not encoding:
+
+            return to_call
+
+        def call(request):
+
+            response = self._handler_response(to_call(request))
+
+            if self._is_stream(response):
+
+                response = compression_mod.compress_chunks(response, encoding)
+
+            elif response and isinstance(response[0], (bytes, str)):
+
+                with self._timer(request).phase('serialize'):
+
+                    response = [
+                        compression_mod.compress(response[0], encoding)
+                    ]
+
+            return response
+
+        return call
+
+
+    def _clear_cache(self):
+
+        if getattr(self, '_cache', None) is not None:
+
+            self._log('Clearing the response cache.')
+            self._cache.clear()
 
 
     def render_POST(self, request):
@@ -629,6 +1318,36 @@ class TableServer(BaseServer):
         'enzsub',
         'complexes',
     }
+    # attributes created by `_load_tables`, replaced together at reload
+    _table_attrs = (
+        'data',
+        '_arrow_tables',
+        '_indexes',
+        '_license_filters',
+        '_license_filter_groups',
+        '_resources_dict',
+        '_data_version',
+    )
+    # queries processed in the worker threads, if those are enabled
+    threaded_queries = data_query_types | {
+        'annotations_summary',
+        'intercell_summary',
+    }
+    # columns with the resources, whether each row has only one resource,
+    # and columns with values prefixed by resource names
+    license_columns = {
+        'interactions': ('sources', False, 'references'),
+        'enzsub': ('sources', False, 'references'),
+        'complexes': ('sources', False, 'identifiers'),
+        'annotations': ('source', True, None),
+        'intercell': ('database', True, None),
+    }
+    cached_queries = threaded_queries | {
+        'queries',
+        'databases',
+        'datasets',
+        'resources',
+    }
     list_fields = {
         'sources',
         'references',
@@ -1192,6 +1911,30 @@ class TableServer(BaseServer):
         }
     )
 
+    # inverted indexes built at loading the tables: index names with
+    # the indexed columns and the separator of values within a field
+    index_columns = {
+        'interactions': {
+            'resources': (('sources',), ';'),
+            'dorothea_levels': (('dorothea_level',), ';'),
+            'sources': (('source', 'source_genesymbol'), None),
+            'targets': (('target', 'target_genesymbol'), None),
+        },
+        'enzsub': {
+            'resources': (('sources',), ';'),
+            'enzymes': (('enzyme', 'enzyme_genesymbol'), None),
+            'substrates': (('substrate', 'substrate_genesymbol'), None),
+        },
+        'complexes': {
+            'resources': (('sources',), ';'),
+            'proteins': (('components',), '_'),
+        },
+        'annotations': {
+            'resources': (('source',), None),
+            'proteins': (('uniprot', 'genesymbol'), None),
+        },
+    }
+
     # the annotation attributes served for the cytoscape app
     cytoscape_attributes = {
         ('Zhong2015', 'type'),
@@ -1274,12 +2017,71 @@ class TableServer(BaseServer):
             input_files = None,
             only_tables = None,
             exclude_tables = None,
+            table_format = None,
+            streaming = None,
+            stream_batch_size = None,
+            workers = None,
+            concurrency = None,
+            cache_size = None,
+            cache_dir = None,
+            compression = None,
+            profile_threshold = None,
+            profile_rate = None,
+            profile_dir = None,
         ):
         """
         Server based on ``pandas`` data frames.
 
         :param dict input_files:
             Paths to tables exported by the ``pypath.websrvtab`` module.
+        :param str table_format:
+            Either ``tsv`` or ``arrow``. In the latter case the tables are
+            read from memory mapped Arrow IPC files next to the TSV files
+            (see ``pypath.omnipath.server.columnar``), which start up much
+            faster and their pages are shared by the server processes.
+            By default the ``server_table_format`` setting is used, if not
+            set, ``tsv``.
+        :param bool streaming:
+            Serve large tables in chunks, encoded batch by batch. By
+            default the ``server_streaming`` setting, if not set ``True``.
+        :param int stream_batch_size:
+            Number of rows encoded in one chunk. Tables not longer than
+            this are served in one piece. By default the
+            ``server_stream_batch_size`` setting, if not set 20,000.
+        :param int workers:
+            Number of threads processing the data queries. If zero, the
+            queries are processed in the thread of the reactor, one at a
+            time. By default the ``server_workers`` setting, if not set 0.
+        :param int,dict concurrency:
+            Maximum number of queries of the same type processed at once,
+            either one number for all query types or a dict with query
+            types as keys. By default the ``server_concurrency`` setting,
+            if not set, the number of workers.
+        :param int cache_size:
+            Size of the response cache in bytes, zero disables the cache.
+            By default the ``server_cache_size`` setting, if not set 256 MB.
+        :param str cache_dir:
+            Directory for the responses evicted from the memory cache, in
+            compressed form. By default the ``server_cache_dir`` setting,
+            if not set, the evicted responses are discarded.
+        :param list compression:
+            Encodings offered to the clients, in the order of preference,
+            ``False`` or an empty list disables compression. By default the
+            ``server_compression`` setting, if not set, ``zstd`` and
+            ``gzip``. The ``zstd`` encoding requires the ``zstandard``
+            module.
+        :param float profile_threshold:
+            Save the profiles of the requests which took longer than this,
+            in seconds. Timings of the requests are logged and served at
+            the ``metrics`` endpoint in any case. By default the
+            ``server_profile_threshold`` setting, if not set, no profiling.
+        :param float profile_rate:
+            Fraction of the requests to profile. By default the
+            ``server_profile_rate`` setting, if not set, 1%.
+        :param str profile_dir:
+            Directory to save the profiles in. By default the
+            ``server_profile_dir`` setting, if not set, ``profiles`` in the
+            current directory.
         """
 
         session_mod.Logger.__init__(self, name = 'server')
@@ -1288,7 +2090,53 @@ class TableServer(BaseServer):
 
         self.input_files = copy.deepcopy(self.default_input_files)
         self.input_files.update(input_files or {})
-        self.data = {}
+        self.table_format = (
+            table_format or
+            settings.get('server_table_format') or
+            'tsv'
+        )
+        self.streaming = common.first_value(
+            streaming,
+            settings.get('server_streaming'),
+            True,
+        )
+        self.stream_batch_size = int(
+            stream_batch_size or
+            settings.get('server_stream_batch_size') or
+            20000
+        )
+        self.workers = int(
+            common.first_value(workers, settings.get('server_workers'), 0)
+        )
+        self.concurrency = (
+            concurrency or
+            settings.get('server_concurrency') or
+            None
+        )
+        self.cache_size = int(
+            common.first_value(
+                cache_size,
+                settings.get('server_cache_size'),
+                256 * 1024 ** 2,
+            )
+        )
+        self.cache_dir = cache_dir or settings.get('server_cache_dir')
+        compression = common.first_value(
+            compression,
+            settings.get('server_compression'),
+            compression_mod.ENCODINGS,
+        )
+        self.compression = common.to_list(compression) if compression else []
+        self.profile_threshold = common.first_value(
+            profile_threshold,
+            settings.get('server_profile_threshold'),
+        )
+        self.profile_rate = (
+            profile_rate or
+            settings.get('server_profile_rate') or
+            .01
+        )
+        self.profile_dir = profile_dir or settings.get('server_profile_dir')
 
         self.to_load = (
             self.data_query_types - common.to_set(exclude_tables)
@@ -1298,6 +2146,17 @@ class TableServer(BaseServer):
 
         self._log('Datasets to load: %s.' % (', '.join(sorted(self.to_load))))
 
+        self._load_tables()
+
+        BaseServer.__init__(self)
+        self._log('TableServer startup ready.')
+
+
+    def _load_tables(self):
+
+        self.data = {}
+        self._arrow_tables = {}
+
         self._read_tables()
 
         self._preprocess_interactions()
@@ -1305,10 +2164,57 @@ class TableServer(BaseServer):
         self._preprocess_annotations()
         self._preprocess_complexes()
         self._preprocess_intercell()
+        self._build_indexes()
+        self._build_license_filters()
         self._update_resources()
+        self._set_data_version()
 
-        BaseServer.__init__(self)
-        self._log('TableServer startup ready.')
+
+    def _reload_tables(self):
+        """
+        Reads the tables again from the input files, e.g. after a new
+        export, and empties the response cache. If the files have changed,
+        the ``ETag`` of all responses changes too, hence the clients
+        download them again. The new tables are built in a copy of the
+        server, meanwhile the queries are served from the current ones;
+        then the tables, indexes and the data version are replaced at once.
+        """
+
+        self._log('Reloading data tables.')
+        new = copy.copy(self)
+        new._load_tables()
+        self.__dict__.update({
+            attr: getattr(new, attr)
+            for attr in self._table_attrs
+        })
+        self._clear_cache()
+        self._log('Data tables reloaded.')
+
+
+    def _set_data_version(self):
+        """
+        Identifies the version of the data from the paths, sizes and
+        modification times of the input files.
+        """
+
+        files = []
+
+        for name, fname in sorted(iteritems(self.input_files)):
+
+            if name not in self.data:
+
+                continue
+
+            for path in (fname, f'{fname}.gz', columnar.arrow_path(fname)):
+
+                if os.path.exists(path):
+
+                    stat = os.stat(path)
+                    files.append((path, stat.st_size, stat.st_mtime_ns))
+
+        self._data_version = hashlib.md5(
+            repr((__version__, files)).encode('utf-8')
+        ).hexdigest()
 
 
     def _read_tables(self):
@@ -1321,30 +2227,65 @@ class TableServer(BaseServer):
 
                 continue
 
-            fname_gz = f'{fname}.gz'
-            fname = fname_gz if os.path.exists(fname_gz) else fname
+            if self.table_format == 'arrow':
 
-            self._log('Loading dataset `%s` from file `%s`.' % (name, fname))
+                self._read_table_arrow(name, fname)
 
-            if not os.path.exists(fname):
+            else:
 
-                self._log(
-                    'Missing table: `%s`.' % fname
-                )
-                continue
+                self._read_table_tsv(name, fname)
+
+
+    def _read_table_tsv(self, name, fname):
+
+        fname_gz = f'{fname}.gz'
+        fname = fname_gz if os.path.exists(fname_gz) else fname
 
-            dtype = self.default_dtypes[name]
+        self._log('Loading dataset `%s` from file `%s`.' % (name, fname))
 
-            self.data[name] = pd.read_csv(
-                fname,
-                sep = '\t',
-                index_col = False,
-                dtype = dtype,
+        if not os.path.exists(fname):
+
+            self._log(
+                'Missing table: `%s`.' % fname
             )
+            return
+
+        dtype = self.default_dtypes[name]
+
+        self.data[name] = pd.read_csv(
+            fname,
+            sep = '\t',
+            index_col = False,
+            dtype = dtype,
+        )
+
+        self._log(
+            'Table `%s` loaded from file `%s`.' % (name, fname)
+        )
+
+
+    def _read_table_arrow(self, name, fname):
+
+        fname = columnar.arrow_path(fname)
+
+        self._log(
+            'Loading dataset `%s` from Arrow file `%s`.' % (name, fname)
+        )
+
+        if not os.path.exists(fname):
 
             self._log(
-                'Table `%s` loaded from file `%s`.' % (name, fname)
+                'Missing table: `%s`.' % fname
             )
+            return
+
+        # we keep a reference to the table so the memory map stays open
+        self._arrow_tables[name] = columnar.read_arrow(fname)
+        self.data[name] = columnar.to_pandas(self._arrow_tables[name], name)
+
+        self._log(
+            'Table `%s` loaded from Arrow file `%s`.' % (name, fname)
+        )
 
 
     def _network(self, req):
@@ -1368,17 +2309,8 @@ class TableServer(BaseServer):
 
         self._log('Preprocessing interactions.')
         tbl = self.data['interactions']
-        tbl['set_sources'] = pd.Series(
-            [set(s.split(';')) for s in tbl.sources]
-        )
-        tbl['set_dorothea_level'] = pd.Series(
-            [
-                set(s.split(';'))
-                if not pd.isnull(s) else
-                set([])
-                for s in tbl.dorothea_level
-            ]
-        )
+        tbl['set_sources'] = self._set_column(tbl.sources)
+        tbl['set_dorothea_level'] = self._set_column(tbl.dorothea_level)
 
 
     def _preprocess_enzsub(self):
@@ -1389,9 +2321,7 @@ class TableServer(BaseServer):
 
         self._log('Preprocessing enzyme-substrate relationships.')
         tbl = self.data['enzsub']
-        tbl['set_sources'] = pd.Series(
-            [set(s.split(';')) for s in tbl.sources]
-        )
+        tbl['set_sources'] = self._set_column(tbl.sources)
 
 
     def _preprocess_complexes(self):
@@ -1403,16 +2333,45 @@ class TableServer(BaseServer):
         self._log('Preprocessing complexes.')
         tbl = self.data['complexes']
 
-        tbl = tbl[~tbl.components.isna()]
+        # the inverted indexes refer to row numbers, hence we need
+        # a range index here
+        tbl = tbl[~tbl.components.isna()].reset_index(drop = True)
 
         with ignore_pandas_copywarn():
 
-            tbl['set_sources'] = [set(s.split(';')) for s in tbl.sources]
-            tbl['set_proteins'] = [set(c.split('_')) for c in tbl.components]
+            tbl['set_sources'] = self._set_column(tbl.sources)
+            tbl['set_proteins'] = self._set_column(tbl.components, sep = '_')
 
         self.data['complexes'] = tbl
 
 
+    @staticmethod
+    def _set_column(col, sep = ';'):
+        """
+        Splits a column of separated values into a column of sets.
+
+        For categorical columns each category is split only once and the
+        rows with the same value share the same set object, hence these sets
+        must never be modified in place. Missing values become empty sets.
+        """
+
+        if not isinstance(col.dtype, pd.CategoricalDtype):
+
+            col = col.astype('category')
+
+        categories = col.cat.categories.astype(str)
+        # the last element is for the missing values (code -1)
+        sets = np.empty(len(categories) + 1, dtype = object)
+
+        for i, cat in enumerate(categories):
+
+            sets[i] = set(cat.split(sep))
+
+        sets[-1] = set()
+
+        return pd.Series(sets[col.cat.codes.to_numpy()], index = col.index)
+
+
     def _preprocess_annotations_old(self):
 
         if 'annotations' not in self.data:
@@ -1512,6 +2471,40 @@ class TableServer(BaseServer):
         ).drop_duplicates()
 
 
+    def _build_indexes(self):
+
+        self._indexes = {}
+
+        for name, indexes in iteritems(self.index_columns):
+
+            if name not in self.data:
+
+                continue
+
+            self._log('Building inverted indexes for `%s`.' % name)
+
+            tbl = self.data[name]
+            self._indexes[name] = {
+                index_name: query_index.InvertedIndex.from_columns(
+                    *(tbl[col] for col in cols),
+                    sep = sep,
+                )
+                for index_name, (cols, sep) in iteritems(indexes)
+            }
+
+
+    def _index_rows(self, name, index_name, keys, rows = None):
+        """
+        Row numbers of a table matching any of the values in an index,
+        intersected with ``rows`` if provided.
+        """
+
+        return query_index.intersect(
+            rows,
+            self._indexes[name][index_name].rows(keys),
+        )
+
+
     def _update_resources(self):
 
         self._log('Updating resource information.')
@@ -1542,11 +2535,19 @@ class TableServer(BaseServer):
                     break
 
             # collecting all resource names
-            values = sorted(set(
-                itertools.chain(*(
-                    val.split(';') for val in getattr(tbl, colname)
-                ))
-            ))
+            values = sorted(
+                self._indexes[query_type]['resources'].keys()
+                    if (
+                        query_type in self._indexes and
+                        colname in ('sources', 'source')
+                    ) else
+                set(
+                    itertools.chain(*(
+                        val.split(';')
+                        for val in getattr(tbl, colname).unique()
+                    ))
+                )
+            )
 
             for db in values:
 
@@ -1573,23 +2574,19 @@ class TableServer(BaseServer):
 
                     if query_type == 'interactions':
 
-                        datasets = set()
-
-                        for dataset in self.datasets_:
-
-                            if dataset not in tbl.columns:
-
-                                continue
-
-                            for in_dataset, resources in zip(
-                                getattr(tbl, dataset),
-                                tbl.set_sources,
-                            ):
-
-                                if in_dataset and db in resources:
-
-                                    datasets.add(dataset)
-                                    break
+                        db_rows = self._index_rows(
+                            query_type,
+                            'resources',
+                            {db},
+                        )
+                        datasets = {
+                            dataset
+                            for dataset in self.datasets_
+                            if (
+                                dataset in tbl.columns and
+                                tbl[dataset].to_numpy()[db_rows].any()
+                            )
+                        }
 
                         self._resources_dict[db]['queries'][query_type] = {
                             'datasets': sorted(datasets),
@@ -1933,11 +2930,8 @@ class TableServer(BaseServer):
 
         # starting from the entire dataset
         tbl = self.data['interactions']
-
-        # filter by type
-        if args['types']:
-
-            tbl = tbl.loc[tbl.type.isin(args['types'])]
+        # row numbers selected by the indexed filters
+        rows = None
 
         # if partners provided those will overwrite
         # sources and targets
@@ -1949,26 +2943,38 @@ class TableServer(BaseServer):
         # and gene symbols
         if args['sources'] and args['targets'] and source_target == 'OR':
 
-            tbl = tbl.loc[
-                tbl.target.isin(args['targets']) |
-                tbl.target_genesymbol.isin(args['targets']) |
-                tbl.source.isin(args['sources']) |
-                tbl.source_genesymbol.isin(args['sources'])
-            ]
+            rows = np.union1d(
+                self._index_rows('interactions', 'sources', args['sources']),
+                self._index_rows('interactions', 'targets', args['targets']),
+            )
 
         else:
 
             if args['sources']:
-                tbl = tbl.loc[
-                    tbl.source.isin(args['sources']) |
-                    tbl.source_genesymbol.isin(args['sources'])
-                ]
+                rows = self._index_rows(
+                    'interactions', 'sources', args['sources'], rows,
+                )
 
             if args['targets']:
-                tbl = tbl.loc[
-                    tbl.target.isin(args['targets']) |
-                    tbl.target_genesymbol.isin(args['targets'])
-                ]
+                rows = self._index_rows(
+                    'interactions', 'targets', args['targets'], rows,
+                )
+
+        # filter by databases
+        if args['resources']:
+
+            rows = self._index_rows(
+                'interactions', 'resources', args['resources'], rows,
+            )
+
+        if rows is not None:
+
+            tbl = tbl.iloc[rows]
+
+        # filter by type
+        if args['types']:
+
+            tbl = tbl.loc[tbl.type.isin(args['types'])]
 
         # filter by datasets
         if args['datasets']:
@@ -1995,20 +3001,10 @@ class TableServer(BaseServer):
 
             tbl = tbl.loc[
                 self._dorothea_dataset_filter(tbl, args) |
-                [
-                    bool(levels & args['dorothea_levels'])
-                    for levels in tbl.set_dorothea_level
-                ]
-            ]
-
-        # filter by databases
-        if args['resources']:
-
-            tbl = tbl.loc[
-                [
-                    bool(sources & args['resources'])
-                    for sources in tbl.set_sources
-                ]
+                self._indexes['interactions']['dorothea_levels'].isin(
+                    args['dorothea_levels'],
+                    tbl.index.to_numpy(),
+                )
             ]
 
          # filtering for entity types
@@ -2117,7 +3113,9 @@ class TableServer(BaseServer):
 
         license = self._get_license(req)
 
-        tbl = self._filter_by_license_interactions(tbl, license)
+        with self._timer(req).phase('license'):
+
+            tbl = self._filter_by_license(tbl, license, 'interactions')
 
         tbl = tbl.loc[:,hdr]
 
@@ -2233,10 +3231,8 @@ class TableServer(BaseServer):
 
         # starting from the entire dataset
         tbl = self.data['enzsub']
-
-        # filter by type
-        if args['types']:
-            tbl = tbl.loc[tbl.modification.isin(args['types'])]
+        # row numbers selected by the indexed filters
+        rows = None
 
         # if partners provided those will overwrite
         # enzymes and substrates
@@ -2252,39 +3248,40 @@ class TableServer(BaseServer):
             enzyme_substrate == 'OR'
         ):
 
-            tbl = tbl.loc[
-                tbl.substrate.isin(args['substrates']) |
-                tbl.substrate_genesymbol.isin(args['substrates']) |
-                tbl.enzyme.isin(args['enzymes']) |
-                tbl.enzyme_genesymbol.isin(args['enzymes'])
-            ]
+            rows = np.union1d(
+                self._index_rows('enzsub', 'enzymes', args['enzymes']),
+                self._index_rows('enzsub', 'substrates', args['substrates']),
+            )
 
         else:
 
             if args['enzymes']:
-                tbl = tbl.loc[
-                    tbl.enzyme.isin(args['enzymes']) |
-                    tbl.enzyme_genesymbol.isin(args['enzymes'])
-                ]
+                rows = self._index_rows(
+                    'enzsub', 'enzymes', args['enzymes'], rows,
+                )
 
             if args['substrates']:
-                tbl = tbl.loc[
-                    tbl.substrate.isin(args['substrates']) |
-                    tbl.substrate_genesymbol.isin(args['substrates'])
-                ]
-
-        # filter by organism
-        tbl = tbl.loc[tbl.ncbi_tax_id.isin(args['organisms'])]
+                rows = self._index_rows(
+                    'enzsub', 'substrates', args['substrates'], rows,
+                )
 
         # filter by databases
         if args['resources']:
 
-            tbl = tbl.loc[
-                [
-                    bool(args['resources'] & sources)
-                    for sources in tbl.set_sources
-                ]
-            ]
+            rows = self._index_rows(
+                'enzsub', 'resources', args['resources'], rows,
+            )
+
+        if rows is not None:
+
+            tbl = tbl.iloc[rows]
+
+        # filter by type
+        if args['types']:
+            tbl = tbl.loc[tbl.modification.isin(args['types'])]
+
+        # filter by organism
+        tbl = tbl.loc[tbl.ncbi_tax_id.isin(args['organisms'])]
 
         if req.args[b'fields']:
 
@@ -2310,7 +3307,9 @@ class TableServer(BaseServer):
 
         license = self._get_license(req)
 
-        tbl = self._filter_by_license_interactions(tbl, license)
+        with self._timer(req).phase('license'):
+
+            tbl = self._filter_by_license(tbl, license, 'enzsub')
 
         tbl = tbl.loc[:,hdr]
 
@@ -2361,15 +3360,23 @@ class TableServer(BaseServer):
 
         # starting from the entire dataset
         tbl = self.data['annotations']
+        # row numbers selected by the indexed filters
+        rows = None
 
         hdr = tbl.columns
 
-        # filtering for resources
-        if b'resources' in req.args:
+        # filtering for resources and proteins
+        for arg in ('resources', 'proteins'):
 
-            resources = self._args_set(req, 'resources')
+            if arg.encode('ascii') in req.args:
 
-            tbl = tbl.loc[tbl.source.isin(resources)]
+                rows = self._index_rows(
+                    'annotations', arg, self._args_set(req, arg), rows,
+                )
+
+        if rows is not None:
+
+            tbl = tbl.iloc[rows]
 
         # filtering for entity types
         if b'entity_types' in req.args:
@@ -2378,16 +3385,6 @@ class TableServer(BaseServer):
 
             tbl = tbl.loc[tbl.entity_type.isin(entity_types)]
 
-        # filtering for proteins
-        if b'proteins' in req.args:
-
-            proteins = self._args_set(req, 'proteins')
-
-            tbl = tbl.loc[
-                tbl.uniprot.isin(proteins) |
-                tbl.genesymbol.isin(proteins)
-            ]
-
         # provide genesymbols: yes or no
         if (
             b'genesymbols' in req.args and
@@ -2400,7 +3397,9 @@ class TableServer(BaseServer):
 
         license = self._get_license(req)
 
-        tbl = self._filter_by_license_annotations(tbl, license)
+        with self._timer(req).phase('license'):
+
+            tbl = self._filter_by_license(tbl, license, 'annotations')
 
         tbl = tbl.loc[:,hdr]
 
@@ -2592,7 +3591,9 @@ class TableServer(BaseServer):
 
         license = self._get_license(req)
 
-        tbl = self._filter_by_license_intercell(tbl, license)
+        with self._timer(req).phase('license'):
+
+            tbl = self._filter_by_license(tbl, license, 'intercell')
 
         tbl = tbl.loc[:,hdr]
 
@@ -2664,33 +3665,27 @@ class TableServer(BaseServer):
         hdr.remove('set_sources')
         hdr.remove('set_proteins')
 
-        # filtering for resources
-        if b'resources' in req.args:
+        # row numbers selected by the indexed filters
+        rows = None
 
-            resources = self._args_set(req, 'resources')
+        # filtering for resources and proteins
+        for arg in ('resources', 'proteins'):
 
-            tbl = tbl.loc[
-                [
-                    bool(sources & resources)
-                    for sources in tbl.set_sources
-                ]
-            ]
+            if arg.encode('ascii') in req.args:
 
-        # filtering for proteins
-        if b'proteins' in req.args:
+                rows = self._index_rows(
+                    'complexes', arg, self._args_set(req, arg), rows,
+                )
 
-            proteins = self._args_set(req, 'proteins')
+        if rows is not None:
 
-            tbl = tbl.loc[
-                [
-                    bool(this_proteins & proteins)
-                    for this_proteins in tbl.set_proteins
-                ]
-            ]
+            tbl = tbl.iloc[rows]
 
         license = self._get_license(req)
 
-        tbl = self._filter_by_license_complexes(tbl, license)
+        with self._timer(req).phase('license'):
+
+            tbl = self._filter_by_license(tbl, license, 'complexes')
 
         tbl = tbl.loc[:,hdr]
 
@@ -2737,152 +3732,235 @@ class TableServer(BaseServer):
         return req.args[b'license'][0].decode('utf-8')
 
 
-    @classmethod
-    def _filter_by_license_complexes(cls, tbl, license):
-
-        return cls._filter_by_license(
-            tbl = tbl,
-            license = license,
-            res_col = 'sources',
-            simple = False,
-            prefix_col = 'identifiers',
-        )
+    def _filter_by_license(self, tbl, license, name):
+        """
+        Removes the records not allowed by the license.
+
+        The filters are precomputed for each license level, see
+        ``_build_license_filters``, here we only select the allowed rows and
+        replace the resource (and reference) columns by their trimmed
+        versions.
+
+        :param pandas.DataFrame tbl:
+            The table, or a subset of its rows, with the original index.
+        :param str license:
+            The license level.
+        :param str name:
+            Name of the table.
+        """
 
+        if license == LICENSE_IGNORE or tbl.shape[0] == 0:
 
-    @classmethod
-    def _filter_by_license_interactions(cls, tbl, license):
-
-        return cls._filter_by_license(
-            tbl = tbl,
-            license = license,
-            res_col = 'sources',
-            simple = False,
-            prefix_col = 'references',
-        )
+            return tbl
 
+        mask, columns = self._license_filter(name, license)
+        rows = tbl.index.to_numpy()
+        keep = mask[rows]
+        tbl = tbl.loc[keep]
 
-    @classmethod
-    def _filter_by_license_annotations(cls, tbl, license):
+        if columns:
 
-        return cls._filter_by_license(
-            tbl = tbl,
-            license = license,
-            res_col = 'source',
-            simple = True,
-        )
+            rows = rows[keep]
+            # the columns are replaced in a shallow copy, not to modify
+            # the tables shared by all requests and worker threads
+            tbl = tbl.copy(deep = False)
 
+            with ignore_pandas_copywarn():
 
-    @classmethod
-    def _filter_by_license_intercell(cls, tbl, license):
+                for col, values in iteritems(columns):
 
-        return cls._filter_by_license(
-            tbl = tbl,
-            license = license,
-            res_col = 'database',
-            simple = True,
-        )
+                    tbl[col] = values[rows]
 
+        return tbl
 
-    @staticmethod
-    def _filter_by_license(
-            tbl,
-            license,
-            res_col,
-            simple = False,
-            prefix_col = None,
-        ):
 
-        def filter_resources(res):
+    def _build_license_filters(self):
+        """
+        Precomputes the license filters for all tables and license levels.
+
+        For each license level we create a boolean mask of the rows where at
+        least one resource is enabled by the license; for the tables with
+        multiple resources in each row also the resource column and the
+        column with resource prefixed values (e.g. references) trimmed to
+        the enabled resources. License levels enabling the same resources
+        share their filters.
+        """
 
-            res = {
-                r for r in res
-                if res_ctrl.license(r).enables(license)
-            }
+        self._license_filters = {}
+        self._license_filter_groups = {}
 
-            composite = [
-                r for r in res
-                if res_ctrl.license(r).name == 'Composite'
-            ]
+        levels = set.union(set(), *(
+            ref['license']
+            for ref in self.args_reference.values()
+            if isinstance(ref.get('license', None), set)
+        ))
+        levels.discard(LICENSE_IGNORE)
 
-            if composite:
+        for name in self.license_columns:
 
-                composite_to_remove = {
-                    comp_res
-                    for comp_res in composite
-                    if not res_ctrl.secondary_resources(comp_res, True) & res
-                }
+            if name not in self.data:
 
-                res = res - composite_to_remove
+                continue
 
-            return res
+            self._log('Building license filters for `%s`.' % name)
 
+            for license in sorted(levels):
 
-        if license == LICENSE_IGNORE or tbl.shape[0] == 0:
+                self._license_filter(name, license)
 
-            return tbl
 
-        res_ctrl = resources_mod.get_controller()
+    def _license_filter(self, name, license):
+        """
+        The license filter of a table: a boolean mask of the allowed rows
+        and a dict of trimmed columns. Created if not yet available.
+        """
 
-        _res_col = getattr(tbl, res_col)
+        filters = self._license_filters.setdefault(name, {})
 
-        if simple:
+        if license not in filters:
 
-            bool_idx = [
-                res_ctrl.license(res).enables(license)
-                for res in _res_col
-            ]
+            res_col, simple, prefix_col = self.license_columns[name]
+            tbl = self.data[name]
+            res_ctrl = resources_mod.get_controller()
+            col = tbl[res_col]
 
-        else:
+            if not isinstance(col.dtype, pd.CategoricalDtype):
 
-            _set_res_col = tbl.set_sources
+                col = col.astype('category')
 
-            _res_to_keep = [
-                filter_resources(ress)
-                for ress in _set_res_col
-            ]
+            categories = col.cat.categories.astype(str)
+            resources = (
+                set(categories)
+                    if simple else
+                set(r for cat in categories for r in cat.split(';'))
+            )
+            enabled = frozenset(
+                res
+                for res in resources
+                if res_ctrl.license(res).enables(license)
+            )
+            group = (name, enabled)
 
-            with ignore_pandas_copywarn():
+            if group not in self._license_filter_groups:
 
-                tbl[res_col] = [
-                    ';'.join(sorted(ress))
-                    for ress in _res_to_keep
-                ]
+                self._license_filter_groups[group] = (
+                    self._make_license_filter(
+                        tbl,
+                        col,
+                        enabled,
+                        simple = simple,
+                        prefix_col = prefix_col,
+                    )
+                )
 
-            if prefix_col:
+            filters[license] = self._license_filter_groups[group]
 
-                _prefix_col = getattr(tbl, prefix_col)
+        return filters[license]
 
-                _new_prefix_col = [
 
-                    ';'.join(sorted(
-                        pref_res
-                        for pref_res in pref_ress.split(';')
-                        if (
-                            pref_res.split(':', maxsplit = 1)[0] in
-                            _res_to_keep[i]
-                        )
-                    ))
+    @staticmethod
+    def _make_license_filter(tbl, col, enabled, simple, prefix_col = None):
+        """
+        Creates the license filter of a table for a set of enabled resources.
 
-                        if isinstance(pref_ress, str) else
+        All values are processed once for each category of the resource
+        column, the rows are selected by the category codes.
+        """
 
-                    pref_ress
+        res_ctrl = resources_mod.get_controller()
+        categories = col.cat.categories.astype(str)
+        codes = col.cat.codes.to_numpy()
 
-                    for i, pref_ress in enumerate(_prefix_col)
-                ]
+        if simple:
 
-                with ignore_pandas_copywarn():
+            # the last element is for the missing values (code -1)
+            cat_mask = np.array(
+                [cat in enabled for cat in categories] + [False],
+                dtype = bool,
+            )
 
-                    tbl[prefix_col] = _new_prefix_col
+            return cat_mask[codes], {}
 
-            bool_idx = [bool(res) for res in tbl[res_col]]
+        cat_kept = []
 
-        tbl = tbl.loc[bool_idx]
+        for cat in categories:
 
-        return tbl
+            res = set(cat.split(';')) & enabled
+
+            composite_to_remove = {
+                comp_res
+                for comp_res in res
+                if (
+                    res_ctrl.license(comp_res).name == 'Composite' and
+                    not res_ctrl.secondary_resources(comp_res, True) & res
+                )
+            }
 
+            cat_kept.append(res - composite_to_remove)
 
-    @classmethod
-    def _serve_dataframe(cls, tbl, req):
+        cat_kept.append(set())
+        cat_res = [';'.join(sorted(res)) for res in cat_kept]
+        cat_mask = np.array([bool(res) for res in cat_res], dtype = bool)
+        mask = cat_mask[codes]
+
+        res_codes, res_values = pd.factorize(np.array(cat_res, dtype = object))
+        columns = {
+            col.name: pd.Categorical.from_codes(
+                res_codes[codes],
+                categories = res_values,
+            ),
+        }
+
+        if prefix_col:
+
+            prefix = tbl[prefix_col]
+
+            if not isinstance(prefix.dtype, pd.CategoricalDtype):
+
+                prefix = prefix.astype('category')
+
+            prefix_cats = prefix.cat.categories.astype(str)
+            prefix_codes = prefix.cat.codes.to_numpy()
+            n_prefix = len(prefix_cats)
+            rows = np.where(mask & (prefix_codes >= 0))[0]
+            # each distinct pair of resources and prefixed values once
+            pairs, inverse = np.unique(
+                codes[rows].astype(np.int64) * n_prefix + prefix_codes[rows],
+                return_inverse = True,
+            )
+            pair_values = [
+                ';'.join(sorted(
+                    pref_res
+                    for pref_res in prefix_cats[pair % n_prefix].split(';')
+                    if (
+                        pref_res.split(':', maxsplit = 1)[0] in
+                        cat_kept[pair // n_prefix]
+                    )
+                ))
+                for pair in pairs
+            ]
+            pair_codes, prefix_values = pd.factorize(
+                np.array(pair_values, dtype = object)
+            )
+            new_codes = np.full(len(prefix_codes), -1, dtype = np.int64)
+            new_codes[rows] = pair_codes[inverse]
+            columns[prefix_col] = pd.Categorical.from_codes(
+                new_codes,
+                categories = prefix_values,
+            )
+
+        return mask, columns
+
+
+    def _serve_dataframe(self, tbl, req):
+        """
+        Encodes a data frame as TSV or JSON.
+
+        Tables longer than ``stream_batch_size`` are encoded in batches of
+        rows and served by chunked transfer encoding, so the whole response
+        never exists in memory at once. Shorter tables are returned as
+        one string.
+        """
 
         if b'limit' in req.args:
 
@@ -2893,48 +3971,120 @@ class TableServer(BaseServer):
                 limit = int(limit)
                 tbl = tbl.head(limit)
 
-        if b'format' in req.args and req.args[b'format'][0] == b'json':
+        json_format = (
+            b'format' in req.args and
+            req.args[b'format'][0] == b'json'
+        )
+        header = bool(req.args[b'header'])
+
+        self._timer(req).rows_out = len(tbl)
+
+        chunks = self._encode_dataframe(
+            tbl,
+            json_format = json_format,
+            header = header,
+            batch_size = self.stream_batch_size,
+        )
 
-            data_json = tbl.to_json(orient = 'records')
-            # this is necessary because in the data frame we keep lists
-            # as `;` separated strings but in json is nicer to serve
-            # them as lists
-            data_json = json.loads(data_json)
+        if self.streaming and len(tbl) > self.stream_batch_size:
 
-            for i in data_json:
+            # encoded while streaming, timed by the response producer
+            return chunks
 
-                for k, v in iteritems(i):
+        with self._timer(req).phase('serialize'):
 
-                    if k in cls.list_fields:
+            return ''.join(chunks)
 
-                        i[k] = (
-                            [
-                                (
-                                    int(f)
-                                    if (
-                                        k in cls.int_list_fields and
-                                        f.isdigit()
-                                    ) else
-                                    f
-                                )
-                                for f in v.split(';')
-                            ]
-                            if isinstance(v, str) else
-                            []
-                        )
 
-            return json.dumps(data_json)
+    @classmethod
+    def _encode_dataframe(
+            cls,
+            tbl,
+            json_format = False,
+            header = True,
+            batch_size = 20000,
+        ):
+        """
+        Generates the TSV or JSON representation of a data frame in
+        batches of rows.
+        """
+
+        batches = range(0, max(len(tbl), 1), batch_size)
+
+        if json_format:
+
+            yield '['
+
+            for i in batches:
+
+                records = cls._json_records(tbl.iloc[i:i + batch_size])
+
+                if records:
+
+                    yield '%s%s' % (
+                        ', ' if i else '',
+                        json.dumps(records)[1:-1],
+                    )
+
+            yield ']'
 
         else:
 
-            return tbl.to_csv(
-                sep = '\t',
-                index = False,
-                header = bool(req.args[b'header']),
-                chunksize = 2e5,
+            for i in batches:
+
+                yield tbl.iloc[i:i + batch_size].to_csv(
+                    sep = '\t',
+                    index = False,
+                    header = header and not i,
+                )
+
+
+    @classmethod
+    def _json_records(cls, tbl):
+        """
+        Converts a data frame to a list of dicts ready for JSON encoding.
+
+        In the data frame we keep lists as `;` separated strings but in json
+        is nicer to serve them as lists, these are split here.
+        """
+
+        columns = [
+            (
+                cls._split_list_field(tbl[k], k in cls.int_list_fields)
+                    if k in cls.list_fields else
+                tbl[k].astype(object).where(tbl[k].notna(), None).tolist()
+            )
+            for k in tbl.columns
+        ]
+
+        return [dict(zip(tbl.columns, row)) for row in zip(*columns)]
+
+
+    @staticmethod
+    def _split_list_field(col, int_values = False):
+
+        def split(value):
+
+            return (
+                [
+                    int(f) if int_values and f.isdigit() else f
+                    for f in value.split(';')
+                ]
+                    if isinstance(value, str) else
+                []
             )
 
 
+        if isinstance(col.dtype, pd.CategoricalDtype):
+
+            # each distinct value split only once
+            cats = [split(c) for c in col.cat.categories] + [[]]
+
+            return [cats[c] for c in col.cat.codes]
+
+        return [split(v) for v in col]
+
+
     @staticmethod
     def _args_set(req, arg):
 
@@ -2987,3 +4137,12 @@ class Rest(object):
         twisted_listen_tcp(self.port, self.site)
         _log('Server going to listen on port %u from now.' % self.port)
         twisted_run()
+
+    def reload(self):
+        """
+        Reloads the data tables of the server and clears its response
+        cache.
+        """
+
+        _log('Reloading the server data.')
+        self.server._reload_tables()
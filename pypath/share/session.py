@@ -1,7 +1,21 @@
+from __future__ import annotations
+
 import functools as _ft
 
-from pypath_common import Logger
+from pypath_common import Logger as _Logger
 from pypath_common import log as _log, session as _session
 
 session = _ft.partial(_session, 'pypath')
 log = _ft.partial(_log, 'pypath')
+
+
+class Logger(_Logger):
+    """
+    Base class that makes logging available for its descendants. The
+    messages are sent to the logger of the `pypath` session, so the module
+    does not have to be looked up from the call stack, which is slow.
+    """
+
+    def __init__(self, name: str | None = None, module: str = 'pypath'):
+
+        _Logger.__init__(self, name = name, module = module)
@@ -0,0 +1,428 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Memory budgeted cache of the tables loaded on demand.
+
+The ID translation tables (``pypath.utils.mapping``) and the taxonomy
+tables (``pypath.utils.taxonomy``) are loaded at their first use and kept
+in the memory. All of them are registered in one cache, together with
+their approximate size. If the total size exceeds the memory budget, the
+least recently used tables are removed, and loaded again when needed.
+The budget is the ``table_cache_budget`` setting, in megabytes; ``None``
+or 0 means no limit.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Hashable, Iterator
+
+import sys
+import time
+import itertools
+import threading
+import contextlib
+import collections
+import collections.abc
+
+import pypath.share.session as session_mod
+import pypath.share.settings as settings
+
+__all__ = [
+    'CacheNamespace',
+    'TableCache',
+    'get_cache',
+    'sizeof',
+]
+
+DEFAULT_BUDGET = 4096
+_SCALARS = (str, bytes, int, float, bool, type(None))
+
+
+def sizeof(obj: Any, sample: int = 1000) -> int:
+    """
+    Approximate size of an object in bytes, including its contents.
+
+    Objects with an ``nbytes`` attribute report their own size. For
+    mappings and collections, the size of the elements is extrapolated
+    from the first ``sample`` elements, so large tables are measured
+    quickly. Objects shared between elements (e.g. interned strings) are
+    counted multiple times.
+    """
+
+    nbytes = getattr(obj, 'nbytes', None)
+
+    if isinstance(nbytes, int):
+
+        return nbytes
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, _SCALARS):
+
+        return size
+
+    if isinstance(obj, collections.abc.Mapping):
+
+        elements = (
+            sizeof(key, sample) + sizeof(value, sample)
+            for key, value in obj.items()
+        )
+
+    elif isinstance(obj, (set, frozenset, list, tuple)):
+
+        elements = (sizeof(value, sample) for value in obj)
+
+    else:
+
+        return size
+
+    n = len(obj)
+    head = list(itertools.islice(elements, sample))
+
+    return size + (int(sum(head) * n / len(head)) if head else 0)
+
+
+class TableCache(session_mod.Logger):
+    """
+    Cache of tables with a memory budget and least recently used eviction.
+
+    The tables are grouped into namespaces, each user of the cache works
+    with its own namespace (see ``namespace``). The budget is shared by all
+    namespaces.
+
+    Args
+        budget: Memory budget in bytes. If ``None`` or 0, the tables are
+            never removed.
+    """
+
+    def __init__(self, budget: int | None = None):
+
+        session_mod.Logger.__init__(self, name = 'tablecache')
+
+        self.budget = budget
+        self.nbytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = collections.defaultdict(collections.Counter)
+
+
+    def namespace(self, name: str) -> CacheNamespace:
+        """
+        A dict like view of the tables in one namespace.
+        """
+
+        return CacheNamespace(self, name)
+
+
+    def put(self, ns: str, key: Hashable, value: Any):
+        """
+        Adds a table, or replaces the one with the same key, and removes
+        the least recently used tables if the budget is exceeded.
+        """
+
+        size = sizeof(value)
+
+        with self._lock:
+
+            self.remove(ns, key)
+            self._entries[(ns, key)] = (value, size)
+            self.nbytes += size
+            self._evict()
+
+
+    def get(self, ns: str, key: Hashable, default: Any = None) -> Any:
+        """
+        Retrieves a table and marks it as the most recently used one.
+        """
+
+        with self._lock:
+
+            if (ns, key) not in self._entries:
+
+                return default
+
+            self._entries.move_to_end((ns, key))
+
+            return self._entries[(ns, key)][0]
+
+
+    def remove(self, ns: str, key: Hashable) -> bool:
+        """
+        Removes a table, returns ``True`` if it was in the cache.
+        """
+
+        with self._lock:
+
+            entry = self._entries.pop((ns, key), None)
+
+            if entry is not None:
+
+                self.nbytes -= entry[1]
+
+            return entry is not None
+
+
+    def clear(self, ns: str | None = None):
+        """
+        Removes all tables of a namespace, or all tables.
+        """
+
+        with self._lock:
+
+            for _ns, key in list(self._entries.keys()):
+
+                if ns is None or _ns == ns:
+
+                    self.remove(_ns, key)
+
+
+    def keys(self, ns: str) -> list:
+
+        with self._lock:
+
+            return [key for _ns, key in self._entries.keys() if _ns == ns]
+
+
+    def contains(self, ns: str, key: Hashable) -> bool:
+
+        return (ns, key) in self._entries
+
+
+    def _evict(self):
+        """
+        Removes the least recently used tables until the total size fits
+        into the budget. The most recently used table is never removed,
+        even if it's larger than the budget.
+        """
+
+        while (
+            self.budget and
+            self.nbytes > self.budget and
+            len(self._entries) > 1
+        ):
+
+            (ns, key), (_, size) = self._entries.popitem(last = False)
+            self.nbytes -= size
+            self._stats[ns]['evictions'] += 1
+
+            self._log(
+                'Removing table `%s` from namespace `%s` (%.01f MB); '
+                'total size: %.01f MB, budget: %.01f MB.' % (
+                    key,
+                    ns,
+                    size / 1e6,
+                    self.nbytes / 1e6,
+                    self.budget / 1e6,
+                )
+            )
+
+
+    def set_budget(self, budget: int | None):
+        """
+        Changes the budget, and removes tables if it's necessary.
+        """
+
+        with self._lock:
+
+            self.budget = budget
+            self._evict()
+
+
+    def hit(self, ns: str):
+        """
+        Records that a requested table was found in the cache.
+        """
+
+        self._stats[ns]['hits'] += 1
+
+
+    def miss(self, ns: str, load_time: float = 0.):
+        """
+        Records that a requested table had to be loaded.
+
+        Args
+            load_time: Time spent with loading the table, in seconds.
+        """
+
+        self._stats[ns]['misses'] += 1
+        self._stats[ns]['load_time'] += load_time
+
+
+    def stats(self) -> dict[str, dict[str, int | float]]:
+        """
+        Cache statistics by namespace: number of hits, misses, evictions,
+        the time spent with loading the tables, and the number and total
+        size of the tables currently in the cache.
+        """
+
+        with self._lock:
+
+            namespaces = set(self._stats) | {ns for ns, _ in self._entries}
+            result = {
+                ns: {
+                    'hits': self._stats[ns]['hits'],
+                    'misses': self._stats[ns]['misses'],
+                    'evictions': self._stats[ns]['evictions'],
+                    'load_time': float(self._stats[ns]['load_time']),
+                    'tables': 0,
+                    'nbytes': 0,
+                }
+                for ns in namespaces
+            }
+
+            for (ns, _), (_, size) in self._entries.items():
+
+                result[ns]['tables'] += 1
+                result[ns]['nbytes'] += size
+
+            return result
+
+
+    def __len__(self):
+
+        return len(self._entries)
+
+
+    def __repr__(self):
+
+        return '<TableCache: %u tables, %.01f MB, budget: %s>' % (
+            len(self),
+            self.nbytes / 1e6,
+            '%.01f MB' % (self.budget / 1e6) if self.budget else 'unlimited',
+        )
+
+
+class CacheNamespace(collections.abc.MutableMapping):
+    """
+    The tables of one namespace of a ``TableCache``, accessed like a
+    ``dict``. Reading a table marks it as recently used, while membership
+    tests (``key in ns``) leave the order unchanged.
+    """
+
+    def __init__(self, cache: TableCache, name: str):
+
+        self.cache = cache
+        self.name = name
+
+
+    def __getitem__(self, key):
+
+        missing = object()
+        value = self.cache.get(self.name, key, missing)
+
+        if value is missing:
+
+            raise KeyError(key)
+
+        return value
+
+
+    def __setitem__(self, key, value):
+
+        self.cache.put(self.name, key, value)
+
+
+    def __delitem__(self, key):
+
+        if not self.cache.remove(self.name, key):
+
+            raise KeyError(key)
+
+
+    def __contains__(self, key):
+
+        return self.cache.contains(self.name, key)
+
+
+    def __iter__(self) -> Iterator:
+
+        return iter(self.cache.keys(self.name))
+
+
+    def __len__(self):
+
+        return len(self.cache.keys(self.name))
+
+
+    def touch(self, key):
+        """
+        Marks a table as recently used.
+        """
+
+        self.cache.get(self.name, key)
+
+
+    def clear(self):
+
+        self.cache.clear(self.name)
+
+
+    def hit(self):
+
+        self.cache.hit(self.name)
+
+
+    def miss(self, load_time: float = 0.):
+
+        self.cache.miss(self.name, load_time)
+
+
+    @contextlib.contextmanager
+    def loading(self):
+        """
+        Context for loading a table: records a miss and the time spent
+        with loading.
+        """
+
+        t0 = time.time()
+
+        try:
+
+            yield
+
+        finally:
+
+            self.miss(time.time() - t0)
+
+
+    def stats(self) -> dict[str, int | float]:
+
+        return self.cache.stats().get(self.name, {})
+
+
+    def __repr__(self):
+
+        return '<CacheNamespace `%s`: %u tables>' % (self.name, len(self))
+
+
+def get_cache() -> TableCache:
+    """
+    The table cache shared by all modules, created at the first call.
+    The budget is the ``table_cache_budget`` setting, in megabytes.
+    """
+
+    if 'CACHE' not in globals():
+
+        budget = settings.get('table_cache_budget', DEFAULT_BUDGET)
+        globals()['CACHE'] = TableCache(
+            budget = int(budget * 1e6) if budget else None,
+        )
+
+    return globals()['CACHE']
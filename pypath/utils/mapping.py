@@ -29,13 +29,12 @@ from future.utils import iteritems
 from past.builtins import xrange, range
 
 import os
-import sys
 import math
 import re
 import importlib as imp
 import collections
 import functools
-import datetime
+import itertools
 import time
 
 import urllib
@@ -54,31 +53,27 @@ except:
 
 from typing import Iterable, List, Literal, Optional, Set, Union
 
+import numpy as np
 import pandas as pd
-import timeloop
 
 # from pypath:
 import pypath.share.progress as progress
 import pypath.share.common as common
 import pypath_common._constants as _const
 import pypath.share.cache as cache_mod
+import pypath.share.tablecache as tablecache
 import pypath.internals.maps as maps
 import pypath.resources.urls as urls
 import pypath.share.curl as curl
 import pypath.inputs as inputs
 import pypath.inputs.uniprot as uniprot_input
 import pypath.inputs.uniprot_db as uniprot_db
-import pypath.inputs.pro as pro_input
-import pypath.inputs.biomart as biomart_input
-import pypath.inputs.unichem as unichem_input
-import pypath.inputs.ramp as ramp_input
-import pypath.inputs.hmdb as hmdb_input
 import pypath.internals.input_formats as input_formats
 import pypath.utils.reflists as reflists
+import pypath.utils.mapping_store as mapping_store
 import pypath.utils.taxonomy as taxonomy
 import pypath.share.settings as settings
 import pypath.share.session as session_mod
-_logger = session_mod.log()
 
 
 __all__ = ['MapReader', 'MappingTable', 'Mapper']
@@ -86,88 +81,149 @@ __all__ = ['MapReader', 'MappingTable', 'Mapper']
 _logger = session_mod.Logger(name = 'mapping')
 _log = _logger._log
 
-try:
-    UNICHEM_NAME_TYPES = set(unichem_input.unichem_sources().values())
-except Exception as e:
-    exc = sys.exc_info()
-    _log('Failed to retrieve UniChem ID types:')
-    _logger._log_traceback()
-    UNICHEM_NAME_TYPES = ()
-
-try:
-    RAMP_NAME_TYPES = ramp_input.ramp_id_types('compound')
-except Exception as e:
-    exc = sys.exc_info()
-    _log('Failed to retrieve RaMP ID types:')
-    _logger._log_traceback()
-    RAMP_NAME_TYPES = ()
-
 RESOURCES_EXPLICIT = ('uniprot', 'basic', 'mirbase', 'ipi')
 
 SMALLMOLECULE_SERVICES = {'ramp', 'unichem', 'hmdb'}
 
-RESOURCES_IMPLICIT = (
-    (
-        input_formats.AC_MAPPING,
-        'uniprot',
-        input_formats.UniprotListMapping,
-    ),
-    (
-        input_formats.PRO_MAPPING,
-        'pro',
-        input_formats.ProMapping,
-    ),
-    (
-        input_formats.BIOMART_MAPPING,
-        'biomart',
-        input_formats.BiomartMapping,
-    ),
-    (
-        input_formats.ARRAY_MAPPING,
-        'array',
-        input_formats.ArrayMapping,
-    ),
-    (
-        {n: n for n in UNICHEM_NAME_TYPES},
-        'unichem',
-        input_formats.UnichemMapping,
-    ),
-    (
-        dict(
-            **{
-                it: it
-                for it in RAMP_NAME_TYPES
-            },
-            **input_formats.RAMP_MAPPING,
+# intermediate ID types considered for precomposed chain tables
+CHAIN_ID_TYPES = ('uniprot', 'ensp', 'ensg', 'entrez', 'genesymbol')
+
+
+@functools.lru_cache(maxsize = None)
+def _unichem_name_types() -> set[str]:
+    """
+    ID types available in UniChem. Retrieved at the first use.
+    """
+
+    import pypath.inputs.unichem as unichem_input
+
+    try:
+
+        return set(unichem_input.unichem_sources().values())
+
+    except Exception:
+
+        _log('Failed to retrieve UniChem ID types:')
+        _logger._log_traceback()
+
+        return set()
+
+
+@functools.lru_cache(maxsize = None)
+def _ramp_name_types() -> set[str]:
+    """
+    Compound ID types available in RaMP. Retrieved at the first use.
+    """
+
+    import pypath.inputs.ramp as ramp_input
+
+    try:
+
+        return ramp_input.ramp_id_types('compound')
+
+    except Exception:
+
+        _log('Failed to retrieve RaMP ID types:')
+        _logger._log_traceback()
+
+        return set()
+
+
+@functools.lru_cache(maxsize = None)
+def _resources_implicit() -> tuple:
+    """
+    Mapping table definitions where the ID types are given by the
+    resource: ID types, name of the resource, class of the definition.
+    """
+
+    import pypath.inputs.hmdb as hmdb_input
+
+    return (
+        (
+            input_formats.AC_MAPPING,
+            'uniprot',
+            input_formats.UniprotListMapping,
         ),
-        'ramp',
-        input_formats.RampMapping,
-    ),
-    (
-        dict(
-            **{
-                it: it
-                for it in hmdb_input.ID_FIELDS
-            },
-            **input_formats.HMDB_MAPPING,
+        (
+            input_formats.PRO_MAPPING,
+            'pro',
+            input_formats.ProMapping,
         ),
-        'hmdb',
-        input_formats.HmdbMapping,
-    ),
-)
-
-SMALLMOLECULE_ID_TYPES = frozenset(
-    id_type
-    for service_ids, service_id_type, _ in RESOURCES_IMPLICIT
-    if service_id_type in SMALLMOLECULE_SERVICES
-    for id_type in (
         (
-            set(service_ids.keys()) | set(service_ids.values())
+            input_formats.BIOMART_MAPPING,
+            'biomart',
+            input_formats.BiomartMapping,
+        ),
+        (
+            input_formats.ARRAY_MAPPING,
+            'array',
+            input_formats.ArrayMapping,
+        ),
+        (
+            {n: n for n in _unichem_name_types()},
+            'unichem',
+            input_formats.UnichemMapping,
+        ),
+        (
+            dict(
+                **{
+                    it: it
+                    for it in _ramp_name_types()
+                },
+                **input_formats.RAMP_MAPPING,
+            ),
+            'ramp',
+            input_formats.RampMapping,
+        ),
+        (
+            dict(
+                **{
+                    it: it
+                    for it in hmdb_input.ID_FIELDS
+                },
+                **input_formats.HMDB_MAPPING,
+            ),
+            'hmdb',
+            input_formats.HmdbMapping,
+        ),
+    )
+
+
+@functools.lru_cache(maxsize = None)
+def _smallmolecule_id_types() -> frozenset[str]:
+
+    return frozenset(
+        id_type
+        for service_ids, service_id_type, _ in _resources_implicit()
+        if service_id_type in SMALLMOLECULE_SERVICES
+        for id_type in (
+            (
+                set(service_ids.keys()) | set(service_ids.values())
+            )
+                if isinstance(service_ids, dict) else
+            service_ids
         )
-            if isinstance(service_ids, dict) else
-        service_ids
     )
-)
+
+
+# these require downloads, hence created at the first access, not at import
+_LAZY = {
+    'UNICHEM_NAME_TYPES': _unichem_name_types,
+    'RAMP_NAME_TYPES': _ramp_name_types,
+    'RESOURCES_IMPLICIT': _resources_implicit,
+    'SMALLMOLECULE_ID_TYPES': _smallmolecule_id_types,
+}
+
+
+def __getattr__(name: str):
+
+    if name in _LAZY:
+
+        return _LAZY[name]()
+
+    raise AttributeError(
+        'module `%s` has no attribute `%s`' % (__name__, name)
+    )
 
 UNIPROT_ID_TYPES = {
     'uniprot',
@@ -199,8 +255,11 @@ class MapReader(session_mod.Logger):
     Reads ID translation data and creates ``MappingTable`` instances.
     When initializing ID conversion tables for the first time
     data is downloaded from UniProt and read into dictionaries.
-    It takes a couple of seconds. Data is saved to pickle
-    dumps, this way later the tables load much faster.
+    It takes a couple of seconds. Data is saved to cache files, this way
+    later the tables load much faster. By default the cache files are
+    memory mapped Arrow files (see ``pypath.utils.mapping_store``); if the
+    ``mapping_cache_format`` setting is ``pickle``, or the table contains
+    anything else than strings, pickle dumps.
     """
 
     def __init__(
@@ -211,7 +270,7 @@ class MapReader(session_mod.Logger):
             load_a_to_b = True,
             load_b_to_a = False,
             uniprots = None,
-            lifetime = 300,
+            lifetime = None,
             resource_id_types = None,
         ):
         """
@@ -233,9 +292,9 @@ class MapReader(session_mod.Logger):
                 `target_id_type` to `id_type`.
             uniprots (set): UniProt IDs to query in case the source of the
                 mapping table is the UniProt web service.
-            lifetime (int): If this table has not been used for longer than
-                this preiod it is to be removed at next cleanup. Time in
-                seconds. Passed to ``MappingTable``.
+            lifetime: Deprecated, has no effect. The tables are removed
+                from the memory when the memory budget is exceeded, see
+                ``pypath.share.tablecache``.
             resource_id_types: Additional mappings between pypath and resource
                 specific identifier type labels.
         """
@@ -272,7 +331,6 @@ class MapReader(session_mod.Logger):
         self.entity_type = entity_type
         self.source_type = param.type
         self.param = param
-        self.lifetime = lifetime
         self.a_to_b = None
         self.b_to_a = None
         self.uniprots = uniprots
@@ -365,14 +423,13 @@ class MapReader(session_mod.Logger):
         id_type = getattr(self, 'id_type_%s' % args[0])
         target_id_type = getattr(self, 'id_type_%s' % args[1])
 
-        if isinstance(data, dict):
+        if isinstance(data, (dict, mapping_store.MappingStore)):
 
             return MappingTable(
                 data = data,
                 id_type = id_type,
                 target_id_type = target_id_type,
                 ncbi_tax_id = self.ncbi_tax_id,
-                lifetime = self.lifetime,
             )
 
 
@@ -389,7 +446,7 @@ class MapReader(session_mod.Logger):
 
     def write_cache(self):
         """
-        Exports the ID translation data into pickle files.
+        Exports the ID translation data into cache files.
         """
 
         self._write_cache('a', 'b')
@@ -406,12 +463,40 @@ class MapReader(session_mod.Logger):
 
             self._remove_cache_file(*args)
 
-            pickle.dump(data, open(cachefile, 'wb'))
+            if self._arrow_cache(data):
+
+                self._write_arrow_cache(*args)
+
+            else:
+
+                pickle.dump(data, open(cachefile, 'wb'))
+
+
+    @staticmethod
+    def _arrow_cache(data) -> bool:
+
+        return (
+            settings.get('mapping_cache_format', 'arrow') == 'arrow' and
+            mapping_store.storable(data)
+        )
+
+
+    def _write_arrow_cache(self, *args):
+        """
+        Saves the data in a memory mapped Arrow file, and replaces the
+        data in memory by the memory mapped file.
+        """
+
+        cachefile = '%s.arrow' % self._attr('cachefile', *args)
+        mapping_store.write(getattr(self, '%s_to_%s' % args), cachefile)
+        setattr(self, '%s_to_%s' % args, mapping_store.MappingStore(cachefile))
 
 
     def read_cache(self):
         """
-        Reads the ID translation data from a previously saved pickle file.
+        Reads the ID translation data from a previously saved cache file.
+        Pickle dumps from earlier versions are converted to Arrow files,
+        unless the ``mapping_cache_format`` setting is ``pickle``.
         """
 
         self._read_cache('a', 'b')
@@ -423,8 +508,26 @@ class MapReader(session_mod.Logger):
         if self._to_be_loaded(*args):
 
             cachefile = self._attr('cachefile', *args)
+            arrowfile = '%s.arrow' % cachefile
+            store = (
+                mapping_store.read(arrowfile)
+                    if os.path.exists(arrowfile) else
+                None
+            )
 
-            if os.path.exists(cachefile):
+            if store is not None:
+
+                setattr(self, '%s_to_%s' % args, store)
+                self._log(
+                    'Loading `%s` to `%s` mapping table '
+                    'from Arrow file `%s`.' % (
+                        self.param.id_type_a,
+                        self.param.id_type_b,
+                        arrowfile,
+                    )
+                )
+
+            elif os.path.exists(cachefile):
 
                 with open(cachefile, 'rb') as fp:
 
@@ -444,6 +547,15 @@ class MapReader(session_mod.Logger):
                     )
                 )
 
+                if from_cache and self._arrow_cache(from_cache):
+
+                    self._log(
+                        'Converting mapping table cache `%s` '
+                        'to Arrow file.' % cachefile
+                    )
+                    self._write_arrow_cache(*args)
+                    os.remove(cachefile)
+
 
     def _to_be_loaded(self, *args):
 
@@ -535,9 +647,12 @@ class MapReader(session_mod.Logger):
         Checks if a cache file is either not necessary or exists.
         """
 
+        cachefile = self._attr('cachefile', *args)
+
         return (
             not self._attr('load', *args) or
-            os.path.isfile(self._attr('cachefile', *args))
+            os.path.isfile(cachefile) or
+            os.path.isfile('%s.arrow' % cachefile)
         )
 
 
@@ -545,10 +660,12 @@ class MapReader(session_mod.Logger):
 
         cachefile = self._attr('cachefile', *args)
 
-        if os.path.exists(cachefile):
+        for path in (cachefile, '%s.arrow' % cachefile):
 
-            self._log('Removing mapping table cache file `%s`.' % cachefile)
-            os.remove(cachefile)
+            if os.path.exists(path):
+
+                self._log('Removing mapping table cache file `%s`.' % path)
+                os.remove(path)
 
 
     def read_mapping_file(self):
@@ -941,6 +1058,8 @@ class MapReader(session_mod.Logger):
 
     def read_mapping_pro(self):
 
+        import pypath.inputs.pro as pro_input
+
         pro_data = pro_input.pro_mapping(target_id_type = self.param.id_type)
 
         pro_to_other = collections.defaultdict(set)
@@ -970,6 +1089,8 @@ class MapReader(session_mod.Logger):
         Loads a mapping table using BioMart data.
         """
 
+        import pypath.inputs.biomart as biomart_input
+
         ens_organism = taxonomy.ensure_ensembl_name(self.param.ncbi_tax_id)
 
         if not ens_organism:
@@ -1014,6 +1135,8 @@ class MapReader(session_mod.Logger):
         Loads mapping table between microarray probe IDs and genes.
         """
 
+        import pypath.inputs.biomart as biomart_input
+
         probe_mapping = biomart_input.biomart_microarrays(
             organism = self.param.ncbi_tax_id,
             vendor = self.param.array_id,
@@ -1084,7 +1207,7 @@ class MapReader(session_mod.Logger):
 
         else:
 
-            mod = globals()[f'{self.source_type}_input']
+            mod = imp.import_module(f'pypath.inputs.{self.source_type}')
             method = getattr(mod, f'{self.source_type}_mapping')
 
         data = method(
@@ -1171,10 +1294,6 @@ class MappingTable(session_mod.Logger):
     This is the class directly handling ID translation data.
     It does not care about loading it or what kind of IDs these
     only accepts the translation dictionary.
-
-    lifetime : int
-        If this table has not been used for longer than this preiod it is
-        to be removed at next cleanup. Time in seconds.
     """
 
     def __init__(
@@ -1183,7 +1302,7 @@ class MappingTable(session_mod.Logger):
             id_type,
             target_id_type,
             ncbi_tax_id,
-            lifetime = 300,
+            lifetime = None,
         ):
         """
         Wrapper around a dictionary of identifier mapping. The dictionary
@@ -1197,9 +1316,9 @@ class MappingTable(session_mod.Logger):
             id_type (str): The source ID type.
             target_id_type (str): The target ID type.
             ncbi_tax_id (int): NCBI Taxonomy identifier of the organism.
-            lifetime (int): Time in seconds to keep the table loaded in
-                the memory. If not used, the table will be unloaded after
-                this time. Each usage resets the expiry time.
+            lifetime: Deprecated, has no effect. The tables are removed
+                from the memory when the memory budget is exceeded, see
+                ``pypath.share.tablecache``.
         """
 
         session_mod.Logger.__init__(self, name = 'mapping')
@@ -1208,8 +1327,6 @@ class MappingTable(session_mod.Logger):
         self.target_id_type = target_id_type
         self.ncbi_tax_id = ncbi_tax_id
         self.data = data
-        self.lifetime = lifetime
-        self._used()
 
 
     def reload(self):
@@ -1223,19 +1340,11 @@ class MappingTable(session_mod.Logger):
 
     def __getitem__(self, key):
 
-        self._used()
-
-        if key in self.data:
-
-            return self.data[key]
-
-        return set()
+        return self.data.get(key, set())
 
 
     def __contains__(self, key):
 
-        self._used()
-
         return key in self.data
 
 
@@ -1244,14 +1353,13 @@ class MappingTable(session_mod.Logger):
         return len(self.data)
 
 
-    def _used(self):
-
-        self._last_used = time.time()
-
-
-    def _expired(self):
+    @property
+    def nbytes(self):
+        """
+        Approximate size of the table in the memory, in bytes.
+        """
 
-        return time.time() - self._last_used > self.lifetime
+        return tablecache.sizeof(self.data)
 
 
     def get_key(self):
@@ -1302,6 +1410,9 @@ class MappingTable(session_mod.Logger):
         return self.data.values
 
 
+_mapper_ids = itertools.count()
+
+
 class Mapper(session_mod.Logger):
 
     default_name_types = settings.get('default_name_types')
@@ -1328,19 +1439,19 @@ class Mapper(session_mod.Logger):
     def __init__(
             self,
             ncbi_tax_id = None,
-            cleanup_period = 10,
-            lifetime = 300,
+            cleanup_period = None,
+            lifetime = None,
             translate_deleted_uniprot = None,
             keep_invalid_uniprot = None,
             trembl_swissprot_by_genesymbol = None,
         ):
         """
         cleanup_period : int
-            Periodically check and remove unused mapping data.
-            Time in seconds. If `None` tables kept forever.
+            Deprecated, has no effect. The tables are kept in the memory
+            until the memory budget is exceeded, then the least recently
+            used ones are removed (see ``pypath.share.tablecache``).
         lifetime : int
-            If a table has not been used for longer than this preiod it is
-            to be removed at next cleanup.
+            Deprecated, has no effect.
         translate_deleted_uniprot : bool
             Do an extra attempt to translate deleted or obsolete UniProt IDs
             by retrieving their archived datasheet and use the gene symbol
@@ -1357,10 +1468,6 @@ class Mapper(session_mod.Logger):
 
         session_mod.Logger.__init__(self, name = 'mapping')
 
-        cleanup_period = settings.get(
-            'mapper_cleanup_interval',
-            cleanup_period
-        )
         self._translate_deleted_uniprot = settings.get(
             'mapper_translate_deleted_uniprot',
             translate_deleted_uniprot,
@@ -1374,31 +1481,6 @@ class Mapper(session_mod.Logger):
             trembl_swissprot_by_genesymbol,
         )
 
-        self._mapper_cleanup_timeloop = timeloop.Timeloop()
-        self._mapper_cleanup_timeloop.logger.setLevel(9999)
-
-        for job in self._mapper_cleanup_timeloop.jobs:
-
-            if job.is_alive():
-
-                job.stop()
-                job.stopped.set()
-
-        self._mapper_cleanup_timeloop.jobs = []
-
-
-        @self._mapper_cleanup_timeloop.job(
-            interval = datetime.timedelta(
-                seconds = cleanup_period
-            )
-        )
-        def _cleanup():
-
-            self.remove_expired()
-
-
-        self._mapper_cleanup_timeloop.start(block = False)
-
         # regex for matching UniProt AC format
         self.reuniprot = re.compile(r'^(?:%s)$' % uniprot_input.reac.pattern)
         self.remipreac = re.compile(r'^MI\d{7}$')
@@ -1417,7 +1499,11 @@ class Mapper(session_mod.Logger):
         self.ncbi_tax_id = ncbi_tax_id or settings.get('default_organism')
 
         self.unmapped = []
-        self.tables = {}
+        self.tables = tablecache.get_cache().namespace(
+            'mapping-%u' % next(_mapper_ids)
+        )
+        # intermediate ID types of the precomposed tables
+        self.chains = {}
         self.uniprot_mapped = []
         self.trace = []
         self.uniprot_static_names = {
@@ -1485,6 +1571,8 @@ class Mapper(session_mod.Logger):
         """
 
         tbl = None
+        loading = False
+        t0 = time.time()
         ncbi_tax_id = ncbi_tax_id or self.ncbi_tax_id
 
         self._log(
@@ -1498,8 +1586,8 @@ class Mapper(session_mod.Logger):
         )
 
         if (
-            id_type in SMALLMOLECULE_ID_TYPES and
-            target_id_type in SMALLMOLECULE_ID_TYPES
+            id_type in _smallmolecule_id_types() and
+            target_id_type in _smallmolecule_id_types()
         ):
 
             ncbi_tax_id = _const.NOT_ORGANISM_SPECIFIC
@@ -1544,25 +1632,35 @@ class Mapper(session_mod.Logger):
             ncbi_tax_id = _const.NOT_ORGANISM_SPECIFIC,
         )
 
-        if tbl_key in self.tables:
-
-            tbl = self.tables[tbl_key]
+        # the tables might be removed from the cache any time,
+        # hence we look them up only once
+        for key, reverse in (
+            (tbl_key, False),
+            (tbl_key_noorganism, False),
+            (tbl_key_rev, True),
+            (tbl_key_rev_noorganism, True),
+        ):
 
-        elif tbl_key_noorganism in self.tables:
+            tbl = self.create_reverse(key) if reverse else self.tables.get(key)
 
-            tbl = self.tables[tbl_key_noorganism]
+            if tbl is not None:
 
-        elif tbl_key_rev in self.tables:
+                break
 
-            self.create_reverse(tbl_key_rev)
-            tbl = self.tables[tbl_key_rev]
+        if tbl is None and load and self.chains.get(tbl_key):
 
-        elif tbl_key_rev_noorganism in self.tables:
+            # precomposed table removed from the memory
+            loading = True
+            tbl = self.compose_table(
+                id_type = tbl_key.id_type,
+                target_id_type = tbl_key.target_id_type,
+                by_id_type = self.chains[tbl_key],
+                ncbi_tax_id = tbl_key.ncbi_tax_id,
+            )
 
-            self.create_reverse(tbl_key_rev_noorganism)
-            tbl = self.tables[tbl_key_rev_noorganism]
+        elif tbl is None and load:
 
-        elif load:
+            loading = True
 
             self._log(
                 'Requested to load ID translation table from '
@@ -1642,7 +1740,7 @@ class Mapper(session_mod.Logger):
                 symmetric_services = {'biomart', 'ramp', 'unichem', 'hmdb'}
 
                 for (service_ids, service_id_type, input_cls) in (
-                    RESOURCES_IMPLICIT
+                    _resources_implicit()
                 ):
 
                     _possible = (
@@ -1749,7 +1847,6 @@ class Mapper(session_mod.Logger):
                             load_a_to_b = load_a_to_b,
                             load_b_to_a = load_b_to_a,
                             uniprots = None,
-                            lifetime = 300,
                             resource_id_types = service_ids,
                         )
 
@@ -1803,9 +1900,13 @@ class Mapper(session_mod.Logger):
                 f'for organism `{ncbi_tax_id}`.'
             )
 
-        if hasattr(tbl, '_used'):
+        if loading:
+
+            self.tables.miss(time.time() - t0)
+
+        elif load:
 
-            tbl._used()
+            self.tables.hit()
 
         return tbl
 
@@ -1823,14 +1924,13 @@ class Mapper(session_mod.Logger):
             A new `MappingTable` object.
         """
 
-        rev_data = common.swap_dict(mapping_table.data)
+        rev_data = common.swap_dict(mapping_table.data, force_sets = True)
 
         return MappingTable(
             data = rev_data,
             id_type = mapping_table.target_id_type,
             target_id_type = mapping_table.id_type,
             ncbi_tax_id = mapping_table.ncbi_tax_id,
-            lifetime = mapping_table.lifetime,
         )
 
 
@@ -1859,12 +1959,21 @@ class Mapper(session_mod.Logger):
         """
         Creates a mapping table with ``id_type`` and ``target_id_type``
         (i.e. direction of the ID translation) swapped.
+
+        Returns
+            The new table, or ``None`` if no table is loaded with ``key``.
         """
 
-        table = self.tables[key]
-        rev_key = self.reverse_key(key)
+        table = self.tables.get(key)
+
+        if table is None:
+
+            return
+
+        rev_table = self.reverse_mapping(table)
+        self.tables[self.reverse_key(key)] = rev_table
 
-        self.tables[rev_key] = self.reverse_mapping(table)
+        return rev_table
 
 
     def map_name0(
@@ -2401,6 +2510,216 @@ class Mapper(session_mod.Logger):
         ) if names else set()
 
 
+    def map_names_bulk(
+            self,
+            names,
+            id_type: str,
+            target_id_type: str,
+            ncbi_tax_id: int | None = None,
+            strict: bool = False,
+            expand_complexes: bool = True,
+            uniprot_cleanup: bool = True,
+            explode: bool = True,
+        ) -> pd.DataFrame | pd.Series:
+        """
+        Translates a whole column of IDs. Each distinct ID is translated
+        only once. If the translation is a simple lookup in one table, the
+        table is resolved once, and the fallbacks of ``map_name`` (case
+        variants, synonyms, removal of prefixes, etc.) are applied only to
+        the IDs not found in the table. The UniProt cleanup is done once
+        for each distinct UniProt ID in the result. For any other pair of
+        ID types the distinct IDs are translated by ``map_name``.
+
+        Args
+            names (pandas.Series,numpy.ndarray,pyarrow.Array,Iterable):
+                The IDs to be translated.
+            id_type (str): The type of the IDs.
+            target_id_type (str): The ID type to translate to.
+            ncbi_tax_id (int): NCBI Taxonomy ID of the organism.
+            strict (bool): Disable the less strict fallbacks, see at
+                ``map_name``.
+            expand_complexes (bool): Translate complexes to the IDs of
+                their components, see at ``map_name``.
+            uniprot_cleanup (bool): When the `target_id_type` is UniProt
+                ID, call the `uniprot_cleanup` function on the result.
+            explode (bool): Return a data frame with one row for each pair
+                of original and translated IDs; otherwise a series of sets
+                of translated IDs, with one element for each input ID.
+
+        Returns
+            If ``explode`` is True, a data frame with ``source`` and
+            ``target`` columns, its index is the index of the input
+            (or the position of the ID in the input) repeated for each
+            translated ID. The IDs not translated are omitted. Otherwise a
+            series with the same index as the input, with a new set in
+            each row.
+        """
+
+        ncbi_tax_id = ncbi_tax_id or self.ncbi_tax_id
+        names = self._bulk_series(names)
+        codes, uniques = pd.factorize(names)
+        uniques = list(uniques)
+
+        self._log(
+            'Bulk ID translation `%s` -> `%s`, organism: %s: '
+            '%u IDs, %u distinct.' % (
+                id_type,
+                target_id_type,
+                ncbi_tax_id,
+                len(names),
+                len(uniques),
+            )
+        )
+
+        lookup_id_type = self._bulk_lookup_id_type(id_type, target_id_type)
+        map_args = {
+            'id_type': id_type,
+            'target_id_type': target_id_type,
+            'ncbi_tax_id': ncbi_tax_id,
+            'strict': strict,
+            'expand_complexes': expand_complexes,
+        }
+
+        if lookup_id_type:
+
+            tbl = self.which_table(
+                lookup_id_type,
+                target_id_type,
+                ncbi_tax_id = ncbi_tax_id,
+            )
+            data = tbl.data if tbl else {}
+            mapped = [
+                data.get(name, None) if isinstance(name, str) else None
+                for name in uniques
+            ]
+            unresolved = [i for i, m in enumerate(mapped) if not m]
+
+            for i in unresolved:
+
+                mapped[i] = self.map_name(
+                    name = uniques[i],
+                    uniprot_cleanup = False,
+                    **map_args
+                )
+
+            self._log(
+                'Bulk ID translation: %u distinct IDs found in the table, '
+                'fallbacks applied to %u.' % (
+                    len(uniques) - len(unresolved),
+                    len(unresolved),
+                )
+            )
+
+            if uniprot_cleanup and target_id_type == 'uniprot':
+
+                cleaned = {}
+
+                for uniprot in {u for m in mapped for u in m}:
+
+                    cleaned[uniprot] = self.uniprot_cleanup(
+                        uniprots = {uniprot},
+                        ncbi_tax_id = ncbi_tax_id,
+                    )
+
+                mapped = [
+                    set().union(*(cleaned[u] for u in m))
+                    for m in mapped
+                ]
+
+        else:
+
+            mapped = [
+                self.map_name(
+                    name = name,
+                    uniprot_cleanup = uniprot_cleanup,
+                    **map_args
+                )
+                for name in uniques
+            ]
+
+        if not explode:
+
+            # missing values have the code -1, pointing to the last element
+            mapped.append(set())
+
+            # copies, the sets might belong to the mapping tables
+            return pd.Series(
+                [set(mapped[c]) for c in codes],
+                index = names.index,
+                dtype = object,
+            )
+
+        lengths = np.array([len(m) for m in mapped] + [0], dtype = np.int64)
+        targets = np.empty(lengths.sum(), dtype = object)
+        targets[:] = [t for m in mapped for t in m]
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        row_lengths = lengths[codes]
+        rows = np.repeat(np.arange(len(codes)), row_lengths)
+        # position of each target within the targets of its source
+        within = (
+            np.arange(row_lengths.sum()) -
+            np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+        )
+
+        return pd.DataFrame(
+            {
+                'source': names.values[rows],
+                'target': targets[starts[codes[rows]] + within],
+            },
+            index = names.index[rows],
+        )
+
+
+    @staticmethod
+    def _bulk_series(names) -> pd.Series:
+        """
+        Converts a column of IDs to a ``pandas.Series``.
+        """
+
+        if isinstance(names, pd.Series):
+
+            return names
+
+        if hasattr(names, 'to_pandas'):
+
+            # pyarrow.Array or pyarrow.ChunkedArray
+            return names.to_pandas()
+
+        if not isinstance(names, np.ndarray):
+
+            names = list(names)
+
+        return pd.Series(names, dtype = object)
+
+
+    @staticmethod
+    def _bulk_lookup_id_type(id_type, target_id_type) -> str | None:
+        """
+        The source ID type of the table directly looked up by ``map_name``
+        for a pair of ID types; ``None`` if the translation involves more
+        than a lookup in one table followed by the generic fallbacks.
+        """
+
+        if (
+            not isinstance(id_type, str) or
+            id_type == target_id_type or
+            id_type.startswith('refseq') or
+            'ensp' in (id_type, target_id_type) or
+            id_type in input_formats.ARRAY_MAPPING or
+            target_id_type in input_formats.ARRAY_MAPPING or
+            (id_type, target_id_type) == ('pro', 'uniprot')
+        ):
+
+            return None
+
+        # by default the uniprot-genesymbol tables contain only SwissProt
+        if (id_type, target_id_type) == ('uniprot', 'genesymbol'):
+
+            return 'trembl'
+
+        return id_type
+
+
     def chain_map(
             self,
             name,
@@ -2414,6 +2733,12 @@ class Mapper(session_mod.Logger):
         Translate IDs which can not be directly translated in two steps:
         from `id_type` to `via_id_type` and from there to `target_id_type`.
 
+        If a table composed via `by_id_type` is available for `id_type` and
+        `target_id_type` (see ``compose_table``), the ID is looked up in
+        that table, and translated in two steps only if it's not found
+        there. With the ``mapping_precompose_chains`` setting, the table
+        is composed at the first call.
+
         Args
             name (str): The original name to be converted.
             id_type (str): The type of the name.
@@ -2428,6 +2753,37 @@ class Mapper(session_mod.Logger):
         """
 
         ncbi_tax_id = ncbi_tax_id or self.ncbi_tax_id
+        key = self.get_table_key(id_type, target_id_type, ncbi_tax_id)
+
+        # the precomposed tables are built with the default options
+        if not kwargs.get('strict') and kwargs.get('uniprot_cleanup', True):
+
+            if (
+                key not in self.chains and
+                settings.get('mapping_precompose_chains', False)
+            ):
+
+                self.compose_table(
+                    id_type = id_type,
+                    target_id_type = target_id_type,
+                    by_id_type = by_id_type,
+                    ncbi_tax_id = ncbi_tax_id,
+                )
+
+            # the table composed via another intermediate ID type may
+            # give different results
+            if self.chains.get(key) == by_id_type:
+
+                tbl = self.which_table(
+                    id_type,
+                    target_id_type,
+                    ncbi_tax_id = ncbi_tax_id,
+                )
+                mapped_names = tbl[name] if tbl else set()
+
+                if mapped_names:
+
+                    return mapped_names
 
         mapped_names = self.map_names(
             names =
@@ -2447,6 +2803,292 @@ class Mapper(session_mod.Logger):
         return mapped_names
 
 
+    def compose_table(
+            self,
+            id_type: str,
+            target_id_type: str,
+            by_id_type: str | Iterable[str] | None = None,
+            ncbi_tax_id: int | None = None,
+        ) -> MappingTable | None:
+        """
+        Creates a table translating directly from `id_type` to
+        `target_id_type` via an intermediate ID type, so the IDs can be
+        translated in one lookup instead of two steps. All IDs in the
+        `id_type` -> `by_id_type` table are translated in bulk, first to
+        `by_id_type` and then to `target_id_type`, by ``map_names_bulk``.
+        The table is saved in the cache directory, and next time it's
+        loaded from there. It's registered in ``tables`` and in
+        ``chains``, hence ``which_table`` and ``chain_map`` use it, and
+        load it again if it's removed from the memory.
+
+        Args
+            id_type: The source ID type.
+            target_id_type: The target ID type.
+            by_id_type: The intermediate ID type, or a list of candidates.
+                By default the ones in ``CHAIN_ID_TYPES``. From multiple
+                candidates the cheapest path is chosen: a saved composed
+                table is the cheapest, then paths with the tables already
+                loaded, and among these the one with the smaller first
+                table. If a path doesn't result a table, the next one is
+                tried.
+            ncbi_tax_id: NCBI Taxonomy ID of the organism.
+
+        Returns
+            The new ``MappingTable``, or None if none of the paths
+            resulted any ID translation data.
+        """
+
+        ncbi_tax_id = ncbi_tax_id or self.ncbi_tax_id
+        key = self.get_table_key(id_type, target_id_type, ncbi_tax_id)
+        by_id_types = (
+            (by_id_type,)
+                if isinstance(by_id_type, str) else
+            by_id_type or CHAIN_ID_TYPES
+        )
+        by_id_types = [
+            by for by in by_id_types
+            if by not in {id_type, target_id_type}
+        ]
+
+        for by_id_type in sorted(
+            by_id_types,
+            key = lambda by: self._chain_cost(
+                id_type,
+                by,
+                target_id_type,
+                ncbi_tax_id,
+            ),
+        ):
+
+            cachefile = self._chain_cachefile(
+                id_type,
+                by_id_type,
+                target_id_type,
+                ncbi_tax_id,
+            )
+            data = self._read_chain_cache(cachefile)
+
+            if data is None:
+
+                data = self._compose(
+                    id_type,
+                    by_id_type,
+                    target_id_type,
+                    ncbi_tax_id,
+                )
+
+                if data and settings.get('mapping_use_cache'):
+
+                    data = self._write_chain_cache(data, cachefile)
+
+            if data:
+
+                table = MappingTable(
+                    data = data,
+                    id_type = id_type,
+                    target_id_type = target_id_type,
+                    ncbi_tax_id = ncbi_tax_id,
+                )
+                self.tables[key] = table
+                self.chains[key] = by_id_type
+
+                return table
+
+        self._log(
+            'Could not compose ID translation table `%s` -> `%s`, '
+            'organism: %s, intermediate ID types tried: %s.' % (
+                id_type,
+                target_id_type,
+                ncbi_tax_id,
+                ', '.join(by_id_types),
+            )
+        )
+
+        # don't try again at each ``chain_map`` call
+        self.chains[key] = None
+
+
+    def _compose(
+            self,
+            id_type,
+            by_id_type,
+            target_id_type,
+            ncbi_tax_id,
+        ) -> dict[str, set[str]]:
+        """
+        Translates all IDs of the `id_type` -> `by_id_type` table to
+        `target_id_type`, in two steps.
+        """
+
+        self._log(
+            'Composing ID translation table `%s` -> `%s` -> `%s`, '
+            'organism: %s.' % (
+                id_type,
+                by_id_type,
+                target_id_type,
+                ncbi_tax_id,
+            )
+        )
+
+        first = self.which_table(
+            id_type,
+            by_id_type,
+            ncbi_tax_id = ncbi_tax_id,
+        )
+
+        if not first:
+
+            return {}
+
+        step1 = self.map_names_bulk(
+            pd.Series(list(first.keys()), dtype = object),
+            id_type = id_type,
+            target_id_type = by_id_type,
+            ncbi_tax_id = ncbi_tax_id,
+        )
+        step2 = self.map_names_bulk(
+            pd.Series(step1.target.unique(), dtype = object),
+            id_type = by_id_type,
+            target_id_type = target_id_type,
+            ncbi_tax_id = ncbi_tax_id,
+        )
+        composed = step1.merge(
+            step2,
+            left_on = 'target',
+            right_on = 'source',
+            suffixes = ('', '_target'),
+        )
+
+        return composed.groupby('source').target_target.agg(set).to_dict()
+
+
+    def _chain_cost(
+            self,
+            id_type,
+            by_id_type,
+            target_id_type,
+            ncbi_tax_id,
+        ) -> tuple[int, float]:
+        """
+        Cost of composing a table via `by_id_type`: the number of steps
+        which require loading a table and the size of the first table;
+        (-1, 0) if the composed table has been saved.
+        """
+
+        cachefile = self._chain_cachefile(
+            id_type,
+            by_id_type,
+            target_id_type,
+            ncbi_tax_id,
+        )
+
+        if any(
+            os.path.exists(path)
+            for path in (cachefile, '%s.arrow' % cachefile)
+        ):
+
+            return -1, 0
+
+        sizes = [
+            self._loaded_size(*step, ncbi_tax_id)
+            for step in ((id_type, by_id_type), (by_id_type, target_id_type))
+        ]
+
+        return sum(size is None for size in sizes), sizes[0] or math.inf
+
+
+    def _loaded_size(self, id_type, target_id_type, ncbi_tax_id):
+        """
+        Number of IDs in the loaded table between two ID types, in either
+        direction; None if no such table is loaded.
+        """
+
+        for key in (
+            (id_type, target_id_type, ncbi_tax_id),
+            (target_id_type, id_type, ncbi_tax_id),
+            (id_type, target_id_type, _const.NOT_ORGANISM_SPECIFIC),
+            (target_id_type, id_type, _const.NOT_ORGANISM_SPECIFIC),
+        ):
+
+            tbl = self.tables.get(MappingTableKey(*key))
+
+            if tbl is not None:
+
+                return len(tbl)
+
+
+    @staticmethod
+    def _chain_cachefile(
+            id_type,
+            by_id_type,
+            target_id_type,
+            ncbi_tax_id,
+        ) -> str:
+
+        return os.path.join(
+            cache_mod.get_cachedir(),
+            common.md5(
+                json.dumps(
+                    (
+                        id_type,
+                        by_id_type,
+                        target_id_type,
+                        ncbi_tax_id,
+                        'chain',
+                    )
+                )
+            ),
+        )
+
+
+    def _read_chain_cache(self, cachefile):
+
+        if not settings.get('mapping_use_cache'):
+
+            return
+
+        arrowfile = '%s.arrow' % cachefile
+        store = (
+            mapping_store.read(arrowfile)
+                if os.path.exists(arrowfile) else
+            None
+        )
+
+        if store is not None:
+
+            self._log('Loading composed mapping table from `%s`.' % arrowfile)
+
+            return store
+
+        elif os.path.exists(cachefile):
+
+            self._log('Loading composed mapping table from `%s`.' % cachefile)
+
+            with open(cachefile, 'rb') as fp:
+
+                return pickle.load(fp)
+
+
+    def _write_chain_cache(self, data, cachefile):
+        """
+        Saves a composed table, returns the memory mapped table if it's
+        saved in Arrow format, otherwise the original data.
+        """
+
+        if MapReader._arrow_cache(data):
+
+            arrowfile = '%s.arrow' % cachefile
+            mapping_store.write(data, arrowfile)
+
+            return mapping_store.MappingStore(arrowfile)
+
+        with open(cachefile, 'wb') as fp:
+
+            pickle.dump(data, fp)
+
+        return data
+
+
     def _map_refseq(
             self,
             refseq,
@@ -3171,7 +3813,7 @@ class Mapper(session_mod.Logger):
                     )
                 )
 
-        for service_ids, service_id_type, input_cls in RESOURCES_IMPLICIT:
+        for service_ids, service_id_type, input_cls in _resources_implicit():
 
             service_ids = (
                 iteritems(service_ids)
@@ -3236,8 +3878,8 @@ class Mapper(session_mod.Logger):
             ncbi_tax_id = None,
         ):
         """
-        Tells if a mapping table is loaded. If it's loaded, it resets the
-        expiry timer so the table remains loaded.
+        Tells if a mapping table is loaded. If it's loaded, it marks it as
+        recently used, so it's less likely to be removed from the memory.
 
         Returns
             (bool): True if the mapping table is loaded.
@@ -3253,7 +3895,7 @@ class Mapper(session_mod.Logger):
 
         if key in self.tables:
 
-            self.tables[key]._used()
+            self.tables.touch(key)
 
         return key in self.tables
 
@@ -3476,7 +4118,6 @@ class Mapper(session_mod.Logger):
                 id_type = key,
                 target_id_type = id_type_b,
                 ncbi_tax_id = ncbi_tax_id,
-                lifetime = 600,
             )
 
             self.tables[key] = table
@@ -3515,32 +4156,32 @@ class Mapper(session_mod.Logger):
 
     def remove_expired(self):
         """
-        Removes tables last used a longer time ago than their lifetime.
+        Removes the empty tables. Unused tables are not removed after a
+        time any more, but when the memory budget is exceeded, see
+        ``pypath.share.tablecache``.
         """
 
-        to_remove = set()
+        for key in [key for key, table in self.tables.items() if not table]:
 
-        for key, table in iteritems(self.tables):
+            self.remove_key(key)
 
-            if not table or table._expired():
 
-                to_remove.add(key)
+    def cache_stats(self):
+        """
+        Number of lookups that found the table in the memory (hits) or had
+        to load it (misses), time spent with loading tables, number of
+        tables removed to keep the memory budget, number and approximate
+        size of the tables currently loaded.
+        """
 
-        for key in to_remove:
-
-            self.remove_key(key)
+        return self.tables.stats()
 
 
     def __del__(self):
 
-        if hasattr(self._mapper_cleanup_timeloop, 'stop'):
-
-            for job in self._mapper_cleanup_timeloop.jobs:
+        if hasattr(self, 'tables'):
 
-                if job.is_alive():
-
-                    job.stop()
-                    job.stopped.set()
+            self.tables.clear()
 
 
 def init(**kwargs):
@@ -3739,6 +4380,49 @@ def map_names(
     )
 
 
+def map_names_bulk(
+        names,
+        id_type: str,
+        target_id_type: str,
+        ncbi_tax_id: int | None = None,
+        strict: bool = False,
+        expand_complexes: bool = True,
+        uniprot_cleanup: bool = True,
+        explode: bool = True,
+    ) -> pd.DataFrame | pd.Series:
+    """
+    Translates a whole column of IDs at once, see
+    ``Mapper.map_names_bulk``.
+
+    Args
+        names (pandas.Series,numpy.ndarray,pyarrow.Array,Iterable):
+            The IDs to be translated.
+        id_type (str): The type of the IDs.
+        target_id_type (str): The ID type to translate to.
+        ncbi_tax_id (int): NCBI Taxonomy ID of the organism.
+        strict (bool): Disable the less strict fallbacks.
+        expand_complexes (bool): Translate complexes to the IDs of their
+            components.
+        uniprot_cleanup (bool): When the `target_id_type` is UniProt
+            ID, call the `Mapper.uniprot_cleanup` function on the result.
+        explode (bool): Return a data frame of ID pairs; otherwise a
+            series of sets of translated IDs.
+    """
+
+    mapper = get_mapper()
+
+    return mapper.map_names_bulk(
+        names = names,
+        id_type = id_type,
+        target_id_type = target_id_type,
+        ncbi_tax_id = ncbi_tax_id,
+        strict = strict,
+        expand_complexes = expand_complexes,
+        uniprot_cleanup = uniprot_cleanup,
+        explode = explode,
+    )
+
+
 def label(name, id_type = None, entity_type = None, ncbi_tax_id = 9606):
     """
     For any kind of entity, either protein, miRNA or protein complex,
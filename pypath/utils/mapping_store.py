@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright 2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  Authors: see the file `README.rst`
+#  Contact: Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      https://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: https://pypath.omnipathdb.org/
+#
+
+"""
+Compact, memory mapped storage of ID translation tables.
+
+One direction of a mapping table is saved as an uncompressed Arrow IPC
+file with three columns: a 64 bit hash of the source IDs, the source IDs
+and the lists of the target IDs, dictionary encoded. The rows are sorted
+by the hashes. The file is memory mapped, hence opening it takes only a
+few milliseconds, the data is read from the disk only on access, and the
+pages are shared by all processes using the same table. Lookups are binary
+searches in the array of hashes, directly on the buffers of the Arrow
+arrays.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, Mapping
+
+import os
+import hashlib
+import tempfile
+import collections.abc
+
+import numpy as np
+
+import pypath.share.session as session_mod
+
+__all__ = [
+    'MappingStore',
+    'FORMAT_VERSION',
+    'read',
+    'storable',
+    'write',
+]
+
+_logger = session_mod.Logger(name = 'mapping_store')
+_log = _logger._log
+
+FORMAT_VERSION = '1'
+_VERSION_KEY = b'pypath_mapping_format'
+
+
+class _Strings(object):
+    """
+    Read only sequence of the elements of a ``large_string`` Arrow array,
+    as ``bytes``, without creating Python objects for the whole array.
+    """
+
+    __slots__ = ['offsets', 'data']
+
+
+    def __init__(self, array):
+
+        _, offsets, data = array.buffers()
+        self.offsets = _int_view(offsets, 'q', array.offset, len(array) + 1)
+        self.data = memoryview(data) if data is not None else b''
+
+
+    def __len__(self):
+
+        return len(self.offsets) - 1
+
+
+    def __getitem__(self, i):
+
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]])
+
+
+def _int_view(buf, fmt: str, offset: int, length: int) -> memoryview:
+    """
+    Typed view of a buffer, indexing it yields Python ints, which is much
+    faster for single elements than indexing numpy arrays.
+    """
+
+    view = memoryview(buf).cast('B').cast(fmt)
+
+    return view[offset:offset + length]
+
+
+def _hash(key: bytes) -> int:
+
+    return int.from_bytes(
+        hashlib.blake2b(key, digest_size = 8).digest(),
+        'little',
+    )
+
+
+def storable(data: Mapping) -> bool:
+    """
+    Tells if a mapping table can be saved in this format: all the keys and
+    values are strings.
+    """
+
+    return all(
+        isinstance(key, str) and all(isinstance(v, str) for v in values)
+        for key, values in data.items()
+    )
+
+
+def write(data: Mapping, path: str):
+    """
+    Saves one direction of a mapping table. The file is written under a
+    temporary name and then renamed, so other processes never open an
+    incomplete file.
+
+    Args
+        data: The mapping table, keys are the source IDs, values are sets
+            of the target IDs; all must be strings.
+        path: Path to the Arrow file.
+    """
+
+    import pyarrow as pa
+
+    keys = sorted(data.keys(), key = lambda k: (_hash(k.encode()), k))
+    hashes = np.fromiter(
+        (_hash(k.encode()) for k in keys),
+        dtype = np.uint64,
+        count = len(keys),
+    )
+    dictionary = {}
+    offsets = np.zeros(len(keys) + 1, dtype = np.int64)
+    codes = []
+
+    for i, key in enumerate(keys):
+
+        codes.extend(
+            dictionary.setdefault(value, len(dictionary))
+            for value in sorted(data[key])
+        )
+        offsets[i + 1] = len(codes)
+
+    values = pa.LargeListArray.from_arrays(
+        pa.array(offsets),
+        pa.DictionaryArray.from_arrays(
+            pa.array(np.array(codes, dtype = np.int32)),
+            pa.array(list(dictionary), type = pa.large_string()),
+        ),
+    )
+    batch = pa.RecordBatch.from_arrays(
+        [
+            pa.array(hashes, type = pa.uint64()),
+            pa.array(keys, type = pa.large_string()),
+            values,
+        ],
+        names = ['hash', 'key', 'values'],
+    )
+    schema = batch.schema.with_metadata({_VERSION_KEY: FORMAT_VERSION})
+
+    directory, fname = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix = f'{fname}.',
+        suffix = '.tmp',
+        dir = directory,
+    )
+    os.close(fd)
+
+    try:
+
+        # one record batch, so the arrays can be used without copying
+        with pa.OSFile(tmp_path, 'wb') as fp:
+
+            with pa.ipc.new_file(fp, schema) as writer:
+
+                writer.write_batch(batch)
+
+        os.replace(tmp_path, path)
+
+    finally:
+
+        if os.path.exists(tmp_path):
+
+            os.remove(tmp_path)
+
+
+def read(path: str) -> MappingStore | None:
+    """
+    Opens a mapping table saved by ``write``. If the file is corrupt or has
+    another format version, removes it, so the table can be built again.
+
+    Returns
+        A ``MappingStore``, or ``None`` if the file could not be opened.
+    """
+
+    try:
+
+        return MappingStore(path)
+
+    # `pyarrow.ArrowInvalid` is a `ValueError`
+    except ValueError as e:
+
+        _log('Removing invalid mapping table file `%s`: %s' % (path, e))
+        os.remove(path)
+
+
+class MappingStore(collections.abc.Mapping):
+    """
+    Read only, dict like view of a mapping table saved by ``write``.
+
+    Same as the ``dict`` of sets it replaces: ``store[key]`` is a ``set``
+    of target IDs, and raises ``KeyError`` for missing keys.
+
+    Args
+        path: Path to the Arrow file.
+    """
+
+    def __init__(self, path: str):
+
+        import pyarrow as pa
+
+        self.path = path
+        self._source = pa.memory_map(path, 'r')
+        reader = pa.ipc.open_file(self._source)
+        version = (reader.schema.metadata or {}).get(_VERSION_KEY, b'')
+
+        if version.decode() != FORMAT_VERSION:
+
+            raise ValueError(
+                'Mapping table `%s` has format version `%s`, '
+                'expected `%s`.' % (path, version.decode(), FORMAT_VERSION)
+            )
+
+        batch = reader.get_batch(0)
+        values = batch.column(2)
+        self._hashes = batch.column(0).to_numpy()
+        self._keys = _Strings(batch.column(1))
+        self._offsets = _int_view(
+            values.buffers()[1],
+            'q',
+            values.offset,
+            len(values) + 1,
+        )
+        codes = values.values.indices
+        self._codes = _int_view(
+            codes.buffers()[1],
+            'i',
+            codes.offset,
+            len(codes),
+        )
+        self._dictionary = _Strings(values.values.dictionary)
+
+
+    def _index(self, key) -> int | None:
+
+        if not isinstance(key, str):
+
+            return None
+
+        key = key.encode()
+        h = np.uint64(_hash(key))
+        i = int(self._hashes.searchsorted(h))
+
+        # a few different keys might have the same hash
+        while i < len(self._hashes) and self._hashes[i] == h:
+
+            if self._keys[i] == key:
+
+                return i
+
+            i += 1
+
+
+    def __getitem__(self, key) -> set[str]:
+
+        i = self._index(key)
+
+        if i is None:
+
+            raise KeyError(key)
+
+        return self._values(i)
+
+
+    def _values(self, i: int) -> set[str]:
+
+        return {
+            self._dictionary[code].decode()
+            for code in self._codes[self._offsets[i]:self._offsets[i + 1]]
+        }
+
+
+    def __contains__(self, key) -> bool:
+
+        return self._index(key) is not None
+
+
+    def __len__(self) -> int:
+
+        return len(self._keys)
+
+
+    def __iter__(self) -> Iterator[str]:
+
+        return (self._keys[i].decode() for i in range(len(self._keys)))
+
+
+    def items(self):
+
+        return (
+            (self._keys[i].decode(), self._values(i))
+            for i in range(len(self._keys))
+        )
+
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the file; the pages in the memory are shared and can be
+        reclaimed by the OS, still this is the memory used by the table
+        once all of it has been read.
+        """
+
+        return os.path.getsize(self.path)
+
+
+    def __reduce__(self):
+
+        return self.__class__, (self.path,)
+
+
+    def __repr__(self):
+
+        return '<MappingStore `%s` (%u IDs)>' % (self.path, len(self))
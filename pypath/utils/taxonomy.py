@@ -21,16 +21,12 @@ from __future__ import annotations
 
 from future.utils import iteritems
 
-import time
-import datetime
 import itertools
 import collections
 
-import timeloop
-
 import pypath.share.common as common
 import pypath.share.session as session
-import pypath.share.settings as settings
+import pypath.share.tablecache as tablecache
 import pypath_common._constants as _const
 import pypath.inputs.uniprot as uniprot_input
 import pypath.inputs.ensembl as ensembl_input
@@ -39,10 +35,8 @@ import pypath.inputs.mirbase as mirbase_input
 _logger = session.Logger(name = 'taxonomy')
 _log = _logger._log
 
-db = {}
-_cleanup_period = settings.get('mapper_cleanup_interval')
-_lifetime = 300
-_last_used = {}
+# loaded at the first use, removed if the memory budget is exceeded
+db = tablecache.get_cache().namespace('taxonomy')
 NOT_ORGANISM_SPECIFIC = _const.NOT_ORGANISM_SPECIFIC
 failed = collections.defaultdict(set)
 
@@ -80,16 +74,7 @@ taxids = {
     9544: 'rhesus macaque',
 }
 
-taxids2 = dict(
-    (
-        t.taxon_id,
-        t.common_name.lower()
-    )
-    for t in ensembl_input.ensembl_organisms()
-)
-
 taxa = common.swap_dict_simple(taxids)
-taxa2 = common.swap_dict_simple(taxids2)
 
 
 taxa_synonyms = {
@@ -98,7 +83,7 @@ taxa_synonyms = {
 }
 
 
-phosphoelm_taxids = {
+_phosphoelm_taxids = {
     9606: 'Homo sapiens',
     10090: 'Mus musculus',
     9913: 'Bos taurus',
@@ -128,17 +113,6 @@ phosphoelm_taxids = {
 }
 
 
-phosphoelm_taxids.update(
-    [
-        (
-            t.taxon_id,
-            t.scientific_name
-        )
-        for t in ensembl_input.ensembl_organisms()
-    ]
-)
-
-
 dbptm_taxids = {
     9606: 'HUMAN',
     10090: 'MOUSE',
@@ -170,18 +144,87 @@ mirbase_taxids = {
 }
 
 
-ensembl_taxids = dict(
-    (
-        t.taxon_id,
-        t.ensembl_name
-    )
-    for t in ensembl_input.ensembl_organisms()
-)
+def _ensembl_organisms() -> list:
+
+    try:
+
+        return list(ensembl_input.ensembl_organisms())
+
+    except Exception:
+
+        _log('Failed to retrieve the list of Ensembl organisms:')
+        _logger._log_traceback()
+
+        return []
+
+
+def _mirbase_organisms(key: str, value: str) -> dict:
+
+    try:
+
+        return mirbase_input.mirbase_organisms(key, value)
+
+    except Exception:
+
+        _log('Failed to retrieve the list of miRBase organisms:')
+        _logger._log_traceback()
+
+        return {}
+
+
+# these are downloaded at the first access, not at import
+_LAZY = {
+    'taxids2': lambda: {
+        t.taxon_id: t.common_name.lower()
+        for t in _lazy('_ensembl')
+    },
+    'taxa2': lambda: common.swap_dict_simple(_lazy('taxids2')),
+    'phosphoelm_taxids': lambda: {
+        **_phosphoelm_taxids,
+        **{t.taxon_id: t.scientific_name for t in _lazy('_ensembl')},
+    },
+    'ensembl_taxids': lambda: {
+        t.taxon_id: t.ensembl_name
+        for t in _lazy('_ensembl')
+    },
+    'mirbase_to_ncbi_tax_id': lambda: _mirbase_organisms('mirbase', 'ncbi'),
+    'mirbase_to_latin_name': lambda: _mirbase_organisms('mirbase', 'latin'),
+    'ncbi_tax_id_to_mirbase': lambda: _mirbase_organisms('ncbi', 'mirbase'),
+    'latin_name_to_mirbase': lambda: _mirbase_organisms('latin', 'mirbase'),
+    'latin_name_to_ncbi_tax_id': lambda: common.swap_dict_simple(
+        _lazy('phosphoelm_taxids')
+    ),
+    'short_latin_name_to_ncbi_tax_id': lambda: short_latin_names(
+        _lazy('latin_name_to_ncbi_tax_id')
+    ),
+    'ensembl_name_to_ncbi_tax_id': lambda: common.swap_dict_simple(
+        _lazy('ensembl_taxids')
+    ),
+    '_ensembl': _ensembl_organisms,
+}
+
+
+def _lazy(name: str):
+    """
+    Value of a module level variable created at the first access.
+    """
 
-mirbase_to_ncbi_tax_id = mirbase_input.mirbase_organisms('mirbase', 'ncbi')
-mirbase_to_latin_name = mirbase_input.mirbase_organisms('mirbase', 'latin')
-ncbi_tax_id_to_mirbase = mirbase_input.mirbase_organisms('ncbi', 'mirbase')
-latin_name_to_mirbase = mirbase_input.mirbase_organisms('latin', 'mirbase')
+    if name not in globals():
+
+        globals()[name] = _LAZY[name]()
+
+    return globals()[name]
+
+
+def __getattr__(name: str):
+
+    if name in _LAZY:
+
+        return _lazy(name)
+
+    raise AttributeError(
+        'module `%s` has no attribute `%s`' % (__name__, name)
+    )
 
 
 nonstandard_taxids = {
@@ -257,7 +300,7 @@ def ensure_mirbase_name(taxon_id):
 
     return (
         _ensure_name(taxon_id, 'mirbase') or
-        latin_name_to_mirbase.get(taxon_id)
+        _lazy('latin_name_to_mirbase').get(taxon_id)
     )
 
 
@@ -303,6 +346,8 @@ def taxid_from_common_name(taxon_name):
 
         return taxa[taxon_name_l]
 
+    taxa2 = _lazy('taxa2')
+
     if taxon_name_l in taxa2:
 
         return taxa2[taxon_name_l]
@@ -320,6 +365,9 @@ def taxid_from_common_name(taxon_name):
 
 def taxid_from_latin_name(taxon_name):
 
+    latin_name_to_ncbi_tax_id = _lazy('latin_name_to_ncbi_tax_id')
+    short_latin_name_to_ncbi_tax_id = _lazy('short_latin_name_to_ncbi_tax_id')
+
     if taxon_name in latin_name_to_ncbi_tax_id:
 
         return latin_name_to_ncbi_tax_id[taxon_name]
@@ -351,6 +399,8 @@ def taxid_from_nonstandard(taxon_name):
 
 def taxid_from_ensembl_name(taxon_name):
 
+    ensembl_name_to_ncbi_tax_id = _lazy('ensembl_name_to_ncbi_tax_id')
+
     if taxon_name in ensembl_name_to_ncbi_tax_id:
 
         return ensembl_name_to_ncbi_tax_id[taxon_name]
@@ -358,6 +408,8 @@ def taxid_from_ensembl_name(taxon_name):
 
 def taxid_from_mirbase(taxon_name):
 
+    mirbase_to_ncbi_tax_id = _lazy('mirbase_to_ncbi_tax_id')
+
     if taxon_name in mirbase_to_ncbi_tax_id:
 
         return mirbase_to_ncbi_tax_id[taxon_name]
@@ -424,60 +476,30 @@ def uniprot_taxid(uniprot):
 
 
 dbptm_to_ncbi_tax_id = common.swap_dict_simple(dbptm_taxids)
-latin_name_to_ncbi_tax_id = common.swap_dict_simple(phosphoelm_taxids)
-short_latin_name_to_ncbi_tax_id = short_latin_names(latin_name_to_ncbi_tax_id)
-ensembl_name_to_ncbi_tax_id = common.swap_dict_simple(ensembl_taxids)
-
-_cleanup_timeloop = timeloop.Timeloop()
-_cleanup_timeloop.logger.setLevel(9999)
-
-@_cleanup_timeloop.job(
-    interval = datetime.timedelta(
-        seconds = _cleanup_period
-    )
-)
-def _cleanup():
-
-    keys = list(globals()['db'].keys())
-
-    for key in keys:
-
-        if time.time() - globals()['_last_used'][key] > _lifetime:
-
-            _remove(key)
-
-_cleanup_timeloop.start(block = False)
-
 
 def _remove(key):
 
-    if key in globals()['db']:
+    if key in db:
 
         _logger._log(
             'Removing taxonomy data `%s`.' % key
         )
-        del globals()['db'][key]
-
-    if key in globals()['_last_used']:
-
-        del globals()['_last_used'][key]
+        del db[key]
 
 
 def get_db(key):
 
-    if key not in globals()['db']:
-
-        init_db(key)
+    if key not in db:
 
-    if key in globals()['db']:
+        with db.loading():
 
-        globals()['_last_used'][key] = time.time()
-
-        return globals()['db'][key]
+            init_db(key)
 
     else:
 
-        return {}
+        db.hit()
+
+    return db.get(key, {})
 
 
 def init_db(key):
@@ -515,7 +537,7 @@ def init_db(key):
                 )
                 for k, v in itertools.chain(
                     iteritems(taxa),
-                    iteritems(taxa2)
+                    iteritems(_lazy('taxa2'))
                 )
             )
         )
@@ -548,11 +570,11 @@ def init_db(key):
 
     elif _key == 'ensembl':
 
-        this_db = ensembl_name_to_ncbi_tax_id
+        this_db = _lazy('ensembl_name_to_ncbi_tax_id')
 
     elif _key == 'mirbase':
 
-        this_db = mirbase_to_ncbi_tax_id
+        this_db = _lazy('mirbase_to_ncbi_tax_id')
 
     if swap:
 
@@ -565,5 +587,4 @@ def init_db(key):
 
     if this_db:
 
-        globals()['db'][key] = this_db
-        globals()['_last_used'][key] = time.time()
+        db[key] = this_db
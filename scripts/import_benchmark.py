@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright
+#  2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  File author(s): Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      http://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: http://pypath.omnipathdb.org/
+#
+
+"""
+Import time benchmark of the main modules.
+
+Imports each module in a fresh interpreter, a few times, and reports the
+wall time of the import, the slowest modules imported with it (by their
+own import time, from ``python -X importtime``) and the number of network
+connections attempted during the import. Importing pypath should never
+access the network. The results can be saved and compared to a previous
+run, like in ``server_benchmark.py``.
+
+Examples:
+
+    python scripts/import_benchmark.py --output imports.json
+
+    python scripts/import_benchmark.py --baseline imports.json \\
+        --tolerance 0.2 --offline
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+import tabulate
+
+
+MODULES = (
+    'pypath',
+    'pypath.share.curl',
+    'pypath.utils.taxonomy',
+    'pypath.utils.mapping',
+    'pypath.utils.orthology',
+    'pypath.core.entity',
+    'pypath.core.network',
+    'pypath.core.complex',
+    'pypath.core.annot',
+    'pypath.core.intercell',
+    'pypath.core.enz_sub',
+    'pypath.omnipath',
+)
+
+# runs in the child process: counts the network connections by an audit
+# hook, and reports the import time on the last line of stdout
+CHILD_CODE = """
+import sys, time, json, importlib
+connections = []
+
+def hook(event, args):
+
+    if event == 'socket.connect':
+
+        connections.append(str(args[1]))
+
+    elif event == 'socket.getaddrinfo':
+
+        connections.append(str(args[0]))
+
+sys.addaudithook(hook)
+t0 = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - t0
+print(json.dumps({'time': elapsed, 'connections': connections}), flush = True)
+"""
+
+
+class ImportBenchmark(object):
+
+    def __init__(self, modules = MODULES, repeat = 3, top = 5):
+
+        self.modules = modules
+        self.repeat = repeat
+        self.top = top
+
+
+    def main(self):
+
+        self.results = [self.measure(module) for module in self.modules]
+        self.report()
+
+
+    def measure(self, module):
+        """
+        Imports one module ``repeat`` times, each in a new interpreter.
+        """
+
+        print('Importing `%s`.' % module)
+
+        times = []
+        connections = set()
+        slowest = {}
+
+        for _ in range(self.repeat):
+
+            proc = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', CHILD_CODE, module],
+                capture_output = True,
+                text = True,
+                cwd = os.getcwd(),
+            )
+
+            if proc.returncode:
+
+                sys.stderr.write(proc.stderr[-2000:])
+
+                return {'module': module, 'error': True}
+
+            result = json.loads(proc.stdout.strip().split('\n')[-1])
+            times.append(result['time'])
+            connections.update(result['connections'])
+
+            for name, self_us in self._importtime(proc.stderr):
+
+                slowest[name] = max(slowest.get(name, 0), self_us)
+
+        return {
+            'module': module,
+            'time_s': statistics.median(times),
+            'min_time_s': min(times),
+            'connections': sorted(connections),
+            'slowest': sorted(
+                slowest.items(),
+                key = lambda it: it[1],
+                reverse = True,
+            )[:self.top],
+        }
+
+
+    @staticmethod
+    def _importtime(stderr):
+        """
+        Self import times in microseconds from the output of
+        ``python -X importtime``.
+        """
+
+        for line in stderr.split('\n'):
+
+            if not line.startswith('import time:') or '|' not in line:
+
+                continue
+
+            self_us, _, name = line[12:].split('|')
+
+            if self_us.strip().isdigit():
+
+                yield name.strip(), int(self_us)
+
+
+    def report(self):
+
+        print(
+            tabulate.tabulate(
+                [
+                    [
+                        res['module'],
+                        res.get('time_s', 'error'),
+                        res.get('min_time_s', ''),
+                        len(res.get('connections', ())),
+                        ', '.join(
+                            '%s (%.0f ms)' % (name, us / 1000)
+                            for name, us in res.get('slowest', ())[:3]
+                        ),
+                    ]
+                    for res in self.results
+                ],
+                headers = [
+                    'module', 'time_s', 'min_time_s',
+                    'connections', 'slowest (self time)',
+                ],
+                floatfmt = '.3f',
+            )
+        )
+
+        for res in self.results:
+
+            if res.get('connections'):
+
+                print(
+                    'Network access while importing `%s`: %s' % (
+                        res['module'],
+                        ', '.join(res['connections']),
+                    )
+                )
+
+
+    def export(self, path):
+
+        with open(path, 'w') as fp:
+
+            json.dump({'results': self.results}, fp, indent = 2)
+
+
+    def compare(self, baseline, tolerance = .2):
+        """
+        Compares the results to a previous run.
+
+        :param str baseline:
+            Path to a JSON file saved by ``export``.
+        :param float tolerance:
+            Relative increase of the import time considered as a
+            regression.
+
+        :return:
+            List of regressions, each a tuple of module, baseline and
+            current import time.
+        """
+
+        with open(baseline) as fp:
+
+            previous = {
+                res['module']: res
+                for res in json.load(fp)['results']
+            }
+
+        return [
+            (res['module'], prev['time_s'], res['time_s'])
+            for res in self.results
+            for prev in (previous.get(res['module'], {}),)
+            if (
+                'time_s' in res and
+                prev.get('time_s') and
+                res['time_s'] > prev['time_s'] * (1 + tolerance)
+            )
+        ]
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description = 'Import time benchmark of the main modules.',
+    )
+    parser.add_argument(
+        '--modules',
+        default = ','.join(MODULES),
+        help = 'Comma separated list of modules.',
+    )
+    parser.add_argument('--repeat', type = int, default = 3)
+    parser.add_argument('--top', type = int, default = 5)
+    parser.add_argument('--output', help = 'Save the results to JSON.')
+    parser.add_argument('--baseline', help = 'Compare to saved results.')
+    parser.add_argument('--tolerance', type = float, default = .2)
+    parser.add_argument(
+        '--offline',
+        action = 'store_true',
+        help = 'Fail if any import accesses the network.',
+    )
+    args = parser.parse_args()
+
+    bench = ImportBenchmark(
+        modules = tuple(args.modules.split(',')),
+        repeat = args.repeat,
+        top = args.top,
+    )
+    bench.main()
+
+    if args.output:
+
+        bench.export(args.output)
+
+    failed = any(res.get('error') for res in bench.results)
+
+    if args.offline:
+
+        failed = failed or any(res.get('connections') for res in bench.results)
+
+    if args.baseline:
+
+        regressions = bench.compare(args.baseline, args.tolerance)
+
+        for module, prev, cur in regressions:
+
+            print('Regression: %s: %.3f -> %.3f s' % (module, prev, cur))
+
+        failed = failed or bool(regressions)
+
+    if failed:
+
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+
+    main()
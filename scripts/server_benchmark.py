@@ -0,0 +1,790 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  This file is part of the `pypath` python module
+#
+#  Copyright
+#  2014-2023
+#  EMBL, EMBL-EBI, Uniklinik RWTH Aachen, Heidelberg University
+#
+#  File author(s): Dénes Türei (turei.denes@gmail.com)
+#
+#  Distributed under the GPLv3 License.
+#  See accompanying file LICENSE.txt or copy at
+#      http://www.gnu.org/licenses/gpl-3.0.html
+#
+#  Website: http://pypath.omnipathdb.org/
+#
+
+"""
+Load time and latency benchmark of the web service.
+
+Creates synthetic tables of configurable size, starts a ``TableServer``
+on them in a separate process, replays a mix of queries and reports the
+latency percentiles, throughput and peak memory of the server by query
+type and format. The results can be saved and compared to a previous run
+to catch performance regressions before deployment.
+
+Examples:
+
+    python scripts/server_benchmark.py --interactions 1000000 \\
+        --annotations 20000000 --output bench.json
+
+    python scripts/server_benchmark.py --baseline bench.json \\
+        --tolerance 0.2
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+import collections
+import urllib.request
+import concurrent.futures
+
+import numpy as np
+import pandas as pd
+import psutil
+import tabulate
+
+
+SIZES = {
+    'interactions': 100000,
+    'enzsub': 50000,
+    'complexes': 10000,
+    'annotations': 1000000,
+    'intercell': 100000,
+}
+
+RESOURCES = {
+    'interactions': (
+        'SIGNOR', 'SignaLink3', 'SPIKE', 'KEGG', 'DoRothEA',
+        'CollecTRI', 'HPRD', 'BioGRID', 'IntAct', 'Reactome',
+    ),
+    'enzsub': ('PhosphoSite', 'SIGNOR', 'HPRD-phos', 'ProtMapper'),
+    'complexes': ('CORUM', 'ComplexPortal', 'Signor', 'hu.MAP'),
+    'annotations': (
+        'HPA_subcellular', 'CancerSEA', 'UniProt_location',
+        'Phobius', 'SignaLink_pathway',
+    ),
+    'intercell': ('CellPhoneDB', 'OmniPath', 'HPMR', 'Ramilowski2015'),
+}
+
+INPUT_FILES = {
+    'interactions': 'omnipath_webservice_interactions.tsv',
+    'enzsub': 'omnipath_webservice_enz_sub.tsv',
+    'annotations': 'omnipath_webservice_annotations.tsv',
+    'complexes': 'omnipath_webservice_complexes.tsv',
+    'intercell': 'omnipath_webservice_intercell.tsv',
+}
+
+DATASETS = (
+    'omnipath', 'kinaseextra', 'ligrecextra', 'pathwayextra',
+    'mirnatarget', 'dorothea', 'collectri', 'tf_target', 'lncrna_mrna',
+    'tf_mirna', 'small_molecule',
+)
+
+# query type, weight, parameters; `{proteins}` is replaced by random
+# identifiers; the response cache of the server is disabled by default,
+# otherwise the queries without random parameters would be answered from
+# the cache after the first request
+QUERY_MIX = (
+    ('interactions', 4, {'partners': '{proteins}', 'genesymbols': '1'}),
+    ('interactions', 2, {'datasets': 'omnipath', 'fields': 'sources'}),
+    (
+        'interactions', 2,
+        {
+            'datasets': 'dorothea',
+            'dorothea_levels': 'A,B',
+            'fields': 'sources,dorothea_level',
+            'license': 'commercial',
+        },
+    ),
+    ('interactions', 1, {'resources': 'SIGNOR,KEGG', 'fields': 'references'}),
+    ('enzsub', 2, {'enzymes': '{proteins}', 'fields': 'sources'}),
+    ('enzsub', 1, {'resources': 'PhosphoSite', 'license': 'commercial'}),
+    ('complexes', 1, {'proteins': '{proteins}'}),
+    ('annotations', 4, {'proteins': '{proteins}'}),
+    ('annotations', 1, {'resources': 'CancerSEA'}),
+    ('intercell', 2, {'proteins': '{proteins}'}),
+    ('intercell', 1, {'categories': 'receptor', 'scope': 'generic'}),
+)
+
+SERVER_CODE = """
+import sys, json
+from pypath.omnipath.server import run
+args = json.loads(sys.argv[1])
+run.Rest(
+    args['port'],
+    serverclass = run.TableServer,
+    input_files = args['input_files'],
+    **args['server_args'],
+)
+"""
+
+
+class ServerBenchmark(object):
+    """
+    Benchmarks the web service on synthetic tables.
+
+    :param str outdir:
+        Directory for the synthetic tables. By default a temporary
+        directory. Existing tables in this directory are reused.
+    :param dict sizes:
+        Number of rows by table, missing tables are not created.
+    :param int requests:
+        Number of requests to send in total, distributed by the weights
+        in ``QUERY_MIX``.
+    :param int concurrency:
+        Number of requests sent in parallel.
+    :param tuple formats:
+        Formats to request, ``tsv`` and/or ``json``.
+    :param dict server_args:
+        Arguments for ``TableServer``, e.g. ``workers`` or ``table_format``.
+        The response cache is disabled unless ``cache_size`` is provided.
+    :param str encoding:
+        Value of the ``Accept-Encoding`` header, if any.
+    """
+
+    def __init__(
+            self,
+            outdir = None,
+            port = 33334,
+            sizes = None,
+            requests = 200,
+            concurrency = 4,
+            formats = ('tsv', 'json'),
+            server_args = None,
+            encoding = None,
+            seed = 0,
+        ):
+
+        self.outdir = outdir or tempfile.mkdtemp(prefix = 'pypath-bench-')
+        self.port = port
+        self.sizes = SIZES.copy() if sizes is None else sizes
+        self.requests = requests
+        self.concurrency = concurrency
+        self.formats = formats
+        self.server_args = {'cache_size': 0}
+        self.server_args.update(server_args or {})
+        self.encoding = encoding
+        self.seed = seed
+        self.results = []
+
+
+    def main(self):
+
+        self.make_tables()
+
+        try:
+
+            self.start_server()
+            self.replay()
+
+        finally:
+
+            self.stop_server()
+
+        self.report()
+
+
+    def make_tables(self):
+        """
+        Creates the synthetic tables, unless they already exist, and
+        converts them to Arrow if the server reads Arrow files.
+        """
+
+        os.makedirs(self.outdir, exist_ok = True)
+        self.input_files = {}
+        rng = np.random.default_rng(self.seed)
+        n_proteins = max(1000, self.sizes.get('interactions', 0) // 50)
+        self._proteins = np.array(
+            ['P%06u' % i for i in range(n_proteins)],
+            dtype = object,
+        )
+
+        for name, size in self.sizes.items():
+
+            path = os.path.join(self.outdir, INPUT_FILES[name])
+            self.input_files[name] = path
+
+            created = not os.path.exists(path)
+
+            if created:
+
+                print('Creating table `%s` of %u rows.' % (name, size))
+                method = getattr(self, '_table_%s' % name)
+                header = True
+
+                for start in range(0, size, 1000000):
+
+                    chunk = method(rng, min(1000000, size - start), start)
+                    chunk.to_csv(
+                        path,
+                        sep = '\t',
+                        index = False,
+                        header = header,
+                        mode = 'w' if header else 'a',
+                    )
+                    header = False
+
+            if self.server_args.get('table_format') == 'arrow':
+
+                from pypath.omnipath.server import columnar, run
+
+                if not created and os.path.exists(columnar.arrow_path(path)):
+
+                    continue
+
+                print('Converting table `%s` to Arrow.' % name)
+                columnar.tsv_to_arrow(
+                    path,
+                    name,
+                    dtype = run.TableServer.default_dtypes[name],
+                )
+
+
+    def _choice(self, rng, values, n):
+
+        values = np.array(values, dtype = object)
+
+        return values[rng.integers(0, len(values), n)]
+
+
+    def _resources(self, rng, name, n, k = 3):
+        """
+        Random `;` separated resource lists with matching references.
+        """
+
+        res = RESOURCES[name]
+        combos = sorted({
+            ';'.join(sorted(set(rng.choice(res, rng.integers(1, k + 1)))))
+            for _ in range(100)
+        })
+        sources = self._choice(rng, combos, n)
+        pmids = rng.integers(1000000, 40000000, n)
+        references = [
+            ';'.join('%s:%u' % (r, pmid) for r in s.split(';'))
+            for s, pmid in zip(sources, pmids)
+        ]
+
+        return sources, references
+
+
+    def _table_interactions(self, rng, n, start):
+
+        source = self._choice(rng, self._proteins, n)
+        target = self._choice(rng, self._proteins, n)
+        sources, references = self._resources(rng, 'interactions', n)
+        tbl = pd.DataFrame({
+            'source': source,
+            'target': target,
+            'source_genesymbol': 'G' + source,
+            'target_genesymbol': 'G' + target,
+            'is_directed': rng.integers(0, 2, n),
+            'is_stimulation': rng.integers(0, 2, n),
+            'is_inhibition': rng.integers(0, 2, n),
+            'consensus_direction': rng.integers(0, 2, n),
+            'consensus_stimulation': rng.integers(0, 2, n),
+            'consensus_inhibition': rng.integers(0, 2, n),
+            'sources': sources,
+            'references': references,
+        })
+
+        for dataset in DATASETS:
+
+            tbl[dataset] = rng.random(n) < .3
+
+        for col in ('curated', 'chipseq', 'tfbs', 'coexp'):
+
+            tbl['dorothea_%s' % col] = self._choice(
+                rng, [True, False, None], n,
+            )
+
+        tbl['dorothea_level'] = self._choice(
+            rng, ['A', 'B', 'C', 'D', 'A;B', None], n,
+        )
+        tbl['type'] = self._choice(
+            rng, ['post_translational', 'transcriptional'], n,
+        )
+        tbl['curation_effort'] = rng.integers(0, 10, n)
+        tbl['extra_attrs'] = '{}'
+        tbl['evidences'] = '{}'
+        tbl['ncbi_tax_id_source'] = 9606
+        tbl['ncbi_tax_id_target'] = 9606
+        tbl['entity_type_source'] = 'protein'
+        tbl['entity_type_target'] = 'protein'
+
+        return tbl
+
+
+    def _table_enzsub(self, rng, n, start):
+
+        enzyme = self._choice(rng, self._proteins, n)
+        substrate = self._choice(rng, self._proteins, n)
+        sources, references = self._resources(rng, 'enzsub', n)
+
+        return pd.DataFrame({
+            'enzyme': enzyme,
+            'substrate': substrate,
+            'enzyme_genesymbol': 'G' + enzyme,
+            'substrate_genesymbol': 'G' + substrate,
+            'isoforms': '1',
+            'residue_type': self._choice(rng, ['S', 'T', 'Y'], n),
+            'residue_offset': rng.integers(1, 2000, n),
+            'modification': self._choice(
+                rng, ['phosphorylation', 'dephosphorylation'], n,
+            ),
+            'sources': sources,
+            'references': references,
+            'curation_effort': rng.integers(0, 10, n),
+            'ncbi_tax_id': 9606,
+        })
+
+
+    def _table_complexes(self, rng, n, start):
+
+        components = [
+            '_'.join(sorted(set(self._choice(rng, self._proteins, k))))
+            for k in rng.integers(2, 6, n)
+        ]
+        sources, references = self._resources(rng, 'complexes', n, k = 2)
+
+        return pd.DataFrame({
+            'name': ['Complex%u' % i for i in range(start, start + n)],
+            'components': components,
+            'components_genesymbols': [
+                '_'.join('G%s' % c for c in comp.split('_'))
+                for comp in components
+            ],
+            'stoichiometry': '1:1',
+            'sources': sources,
+            'references': [r.split(';')[0].split(':')[1] for r in references],
+            'identifiers': references,
+        })
+
+
+    def _table_annotations(self, rng, n, start):
+
+        uniprot = self._choice(rng, self._proteins, n)
+
+        return pd.DataFrame({
+            'uniprot': uniprot,
+            'genesymbol': 'G' + uniprot,
+            'entity_type': 'protein',
+            'source': self._choice(rng, RESOURCES['annotations'], n),
+            'label': self._choice(
+                rng, ['location', 'score', 'pathway', 'tumor'], n,
+            ),
+            'value': self._choice(
+                rng, ['membrane', 'cytoplasm', '0.5', '1.25', 'Apoptosis'], n,
+            ),
+            'record_id': np.arange(start, start + n),
+        })
+
+
+    def _table_intercell(self, rng, n, start):
+
+        uniprot = self._choice(rng, self._proteins, n)
+        tbl = pd.DataFrame({
+            'category': self._choice(rng, ['receptor', 'ligand', 'ecm'], n),
+            'parent': self._choice(rng, ['receptor', 'ligand'], n),
+            'database': self._choice(rng, RESOURCES['intercell'], n),
+            'scope': self._choice(rng, ['generic', 'specific'], n),
+            'aspect': self._choice(rng, ['functional', 'locational'], n),
+            'source': self._choice(
+                rng, ['resource_specific', 'composite'], n,
+            ),
+            'uniprot': uniprot,
+            'genesymbol': 'G' + uniprot,
+            'entity_type': 'protein',
+            'consensus_score': rng.integers(0, 20, n),
+        })
+
+        for col in (
+            'transmitter', 'receiver', 'secreted',
+            'plasma_membrane_transmembrane', 'plasma_membrane_peripheral',
+        ):
+
+            tbl[col] = rng.random(n) < .5
+
+        return tbl
+
+
+    def start_server(self, timeout = 3600):
+        """
+        Starts the server in a new process and waits until it responds.
+        """
+
+        args = json.dumps({
+            'port': self.port,
+            'input_files': self.input_files,
+            'server_args': dict(
+                self.server_args,
+                only_tables = list(self.input_files),
+            ),
+        })
+
+        print('Starting the server on port %u.' % self.port)
+        t0 = time.time()
+        self._server = subprocess.Popen(
+            [sys.executable, '-c', SERVER_CODE, args],
+            stdout = subprocess.DEVNULL,
+            stderr = subprocess.DEVNULL,
+        )
+        self._process = psutil.Process(self._server.pid)
+        peak = 0
+
+        while True:
+
+            if self._server.poll() is not None:
+
+                raise RuntimeError('The server exited during startup.')
+
+            peak = max(peak, self._rss())
+
+            try:
+
+                urllib.request.urlopen(self._url('status'), timeout = 1)
+                break
+
+            except OSError:
+
+                if time.time() - t0 > timeout:
+
+                    raise RuntimeError('The server did not start in time.')
+
+                time.sleep(.2)
+
+        self.load_time = time.time() - t0
+        self.load_rss = max(peak, self._rss())
+        print(
+            'Server ready in %.01f s, using %.01f MB.' % (
+                self.load_time,
+                self.load_rss / 1024 ** 2,
+            )
+        )
+
+
+    def stop_server(self):
+
+        if getattr(self, '_server', None) and self._server.poll() is None:
+
+            self._server.terminate()
+            self._server.wait()
+
+
+    def _rss(self):
+        """
+        Resident memory of the server process and its children.
+        """
+
+        try:
+
+            return sum(
+                proc.memory_info().rss
+                for proc in [self._process] + self._process.children(True)
+            )
+
+        except psutil.Error:
+
+            return 0
+
+
+    def _url(self, query_type, params = None):
+
+        return 'http://localhost:%u/%s%s' % (
+            self.port,
+            query_type,
+            (
+                '?%s' % '&'.join('%s=%s' % i for i in params.items())
+                    if params else
+                ''
+            ),
+        )
+
+
+    def queries(self):
+        """
+        Generates the URLs of the query mix, grouped by query type and
+        format.
+        """
+
+        rnd = random.Random(self.seed)
+        proteins = list(self._proteins)
+        total = sum(weight for _, weight, _ in QUERY_MIX) * len(self.formats)
+        groups = collections.defaultdict(list)
+
+        for fmt in self.formats:
+
+            for query_type, weight, params in QUERY_MIX:
+
+                for _ in range(max(1, round(self.requests * weight / total))):
+
+                    _params = {
+                        key: (
+                            ','.join(rnd.sample(proteins, 5))
+                                if value == '{proteins}' else
+                            value
+                        )
+                        for key, value in params.items()
+                    }
+
+                    if fmt == 'json':
+
+                        _params['format'] = 'json'
+
+                    groups[(query_type, fmt)].append(
+                        self._url(query_type, _params)
+                    )
+
+        return groups
+
+
+    def _request(self, url):
+
+        req = urllib.request.Request(url)
+
+        if self.encoding:
+
+            req.add_header('Accept-Encoding', self.encoding)
+
+        t0 = time.perf_counter()
+
+        with urllib.request.urlopen(req) as con:
+
+            size = len(con.read())
+
+        return time.perf_counter() - t0, size
+
+
+    def replay(self):
+        """
+        Sends the queries and records the latencies, throughput and peak
+        memory usage for each query type and format.
+        """
+
+        self.results = [{
+            'query': 'startup',
+            'format': '',
+            'requests': 0,
+            'load_time': self.load_time,
+            'peak_rss_mb': self.load_rss / 1024 ** 2,
+        }]
+
+        for (query_type, fmt), urls in sorted(self.queries().items()):
+
+            print(
+                'Sending %u `%s` queries in %s.' % (len(urls), query_type, fmt)
+            )
+            peak = [self._rss()]
+            done = threading.Event()
+
+            def sample():
+
+                while not done.wait(.02):
+
+                    peak[0] = max(peak[0], self._rss())
+
+            sampler = threading.Thread(target = sample, daemon = True)
+            sampler.start()
+            t0 = time.perf_counter()
+
+            with concurrent.futures.ThreadPoolExecutor(
+                self.concurrency,
+            ) as executor:
+
+                timings = list(executor.map(self._request, urls))
+
+            elapsed = time.perf_counter() - t0
+            done.set()
+            sampler.join()
+
+            latency = np.array([t for t, _ in timings]) * 1000
+            self.results.append({
+                'query': query_type,
+                'format': fmt,
+                'requests': len(urls),
+                'p50_ms': float(np.percentile(latency, 50)),
+                'p95_ms': float(np.percentile(latency, 95)),
+                'p99_ms': float(np.percentile(latency, 99)),
+                'throughput_rps': len(urls) / elapsed,
+                'mean_kb': float(np.mean([s for _, s in timings])) / 1024,
+                'peak_rss_mb': peak[0] / 1024 ** 2,
+            })
+
+
+    def report(self):
+
+        columns = [
+            'query', 'format', 'requests', 'p50_ms', 'p95_ms', 'p99_ms',
+            'throughput_rps', 'mean_kb', 'peak_rss_mb', 'load_time',
+        ]
+
+        print(
+            tabulate.tabulate(
+                [
+                    [res.get(col, '') for col in columns]
+                    for res in self.results
+                ],
+                headers = columns,
+                floatfmt = '.1f',
+            )
+        )
+
+
+    def export(self, path):
+
+        with open(path, 'w') as fp:
+
+            json.dump(
+                {
+                    'sizes': self.sizes,
+                    'server_args': self.server_args,
+                    'results': self.results,
+                },
+                fp,
+                indent = 2,
+            )
+
+
+    def compare(
+            self,
+            baseline,
+            tolerance = .2,
+            metrics = ('p50_ms', 'p95_ms', 'peak_rss_mb', 'load_time'),
+        ):
+        """
+        Compares the results to a previous run.
+
+        :param str baseline:
+            Path to a JSON file saved by ``export``.
+        :param float tolerance:
+            Relative increase of a metric considered as a regression.
+
+        :return:
+            List of regressions, each a tuple of query type, format, metric,
+            baseline value and current value.
+        """
+
+        with open(baseline) as fp:
+
+            previous = {
+                (res['query'], res['format']): res
+                for res in json.load(fp)['results']
+            }
+
+        regressions = []
+
+        for res in self.results:
+
+            prev = previous.get((res['query'], res['format']), {})
+
+            for metric in metrics:
+
+                if (
+                    metric in res and
+                    prev.get(metric) and
+                    res[metric] > prev[metric] * (1 + tolerance)
+                ):
+
+                    regressions.append((
+                        res['query'],
+                        res['format'],
+                        metric,
+                        prev[metric],
+                        res[metric],
+                    ))
+
+        return regressions
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description = 'Load time and latency benchmark of the web service.',
+    )
+
+    for name, size in SIZES.items():
+
+        parser.add_argument(
+            '--%s' % name,
+            type = int,
+            default = size,
+            help = 'Number of rows in the `%s` table.' % name,
+        )
+
+    parser.add_argument('--outdir', help = 'Directory for the tables.')
+    parser.add_argument('--port', type = int, default = 33334)
+    parser.add_argument('--requests', type = int, default = 200)
+    parser.add_argument('--concurrency', type = int, default = 4)
+    parser.add_argument('--formats', default = 'tsv,json')
+    parser.add_argument('--encoding', help = 'Accept-Encoding header.')
+    parser.add_argument('--workers', type = int)
+    parser.add_argument('--table-format', choices = ('tsv', 'arrow'))
+    parser.add_argument(
+        '--cache-size',
+        type = int,
+        help = 'Size of the response cache in bytes; by default disabled.',
+    )
+    parser.add_argument('--output', help = 'Save the results to JSON.')
+    parser.add_argument('--baseline', help = 'Compare to saved results.')
+    parser.add_argument('--tolerance', type = float, default = .2)
+    args = parser.parse_args()
+
+    server_args = {
+        key: value
+        for key, value in (
+            ('workers', args.workers),
+            ('table_format', args.table_format),
+            ('cache_size', args.cache_size),
+        )
+        if value is not None
+    }
+
+    bench = ServerBenchmark(
+        outdir = args.outdir,
+        port = args.port,
+        sizes = {
+            name: getattr(args, name)
+            for name in SIZES
+            if getattr(args, name)
+        },
+        requests = args.requests,
+        concurrency = args.concurrency,
+        formats = tuple(args.formats.split(',')),
+        server_args = server_args,
+        encoding = args.encoding,
+    )
+    bench.main()
+
+    if args.output:
+
+        bench.export(args.output)
+
+    if args.baseline:
+
+        regressions = bench.compare(args.baseline, args.tolerance)
+
+        for query, fmt, metric, prev, cur in regressions:
+
+            print(
+                'Regression: %s %s %s: %.1f -> %.1f' % (
+                    query, fmt, metric, prev, cur,
+                )
+            )
+
+        if regressions:
+
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+
+    main()
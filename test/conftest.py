@@ -0,0 +1,171 @@
+"""Shared fixtures of the tests."""
+
+import pytest
+
+
+def _network_resource(name, rows, via = None, **kwargs):
+    """
+    A network resource of small molecules with PubChem IDs, reading its
+    interactions from ``rows``. By default the columns of the rows are the
+    two partners, the sign (``+`` or ``-``) and ``1`` if the interaction
+    is directed; ``kwargs`` override the arguments of ``NetworkInput``.
+    """
+
+    import pypath.internals.input_formats as input_formats
+    import pypath.internals.resource as resource_formats
+
+    input_args = {
+        'id_type_a': 'pubchem',
+        'id_type_b': 'pubchem',
+        'entity_type_a': 'small_molecule',
+        'entity_type_b': 'small_molecule',
+        'is_directed': (3, {'1'}),
+        'sign': (2, '+', '-'),
+        'must_have_references': False,
+    }
+    input_args.update(kwargs)
+
+    return resource_formats.NetworkResource(
+        name = name,
+        interaction_type = 'post_translational',
+        data_model = 'activity_flow',
+        resource_attrs = {},
+        via = via,
+        networkinput = input_formats.NetworkInput(
+            name = name,
+            # lambdas can not be pickled, worker processes inherit them
+            # by fork
+            input = lambda: rows,
+            **input_args
+        ),
+    )
+
+
+def _network(rows, name = 'Resource', **kwargs):
+    """
+    A network of one resource, see ``_network_resource``.
+    """
+
+    from pypath.core import network
+
+    return network.Network(
+        resources = [_network_resource(name, rows, **kwargs)],
+    )
+
+
+@pytest.fixture
+def make_resource():
+    """
+    Factory of network resources with the interactions from a list of
+    rows, see ``_network_resource``.
+    """
+
+    return _network_resource
+
+
+@pytest.fixture
+def make_network():
+    """
+    Factory of networks of one resource with the interactions from a list
+    of rows, see ``_network_resource``.
+    """
+
+    return _network
+
+
+class _Request:
+    """
+    Stand-in of the Twisted request for the web service tests: records the
+    response code, headers and body.
+    """
+
+    def __init__(self, path, args = None, headers = None):
+
+        import types
+        import threading
+
+        self.uri = path.encode('utf-8')
+        self.postpath = [p.encode('utf-8') for p in path.split('/') if p]
+        self.args = {
+            k.encode('utf-8'): [v.encode('utf-8')]
+            for k, v in (args or {}).items()
+        }
+        self.code = 200
+        self.headers = {}
+        self.request_headers = headers or {}
+        self.body = b''
+        self.done = threading.Event()
+        self.responseHeaders = types.SimpleNamespace(
+            removeHeader = lambda name: self.headers.pop(name, None),
+        )
+
+    def getClientAddress(self):
+
+        return '127.0.0.1'
+
+    def getAllHeaders(self):
+
+        return self.request_headers
+
+    def getHeader(self, name):
+
+        return self.request_headers.get(name)
+
+    def setHeader(self, name, value):
+
+        self.headers[name] = value
+
+    def setResponseCode(self, code):
+
+        self.code = code
+
+    def notifyFinish(self):
+
+        import twisted.internet.defer as defer
+
+        return defer.Deferred()
+
+    def write(self, data):
+
+        self.body += data
+
+    def finish(self):
+
+        self.done.set()
+
+
+def _server(**attrs):
+    """
+    A web service with the query handlers and settings in ``attrs``.
+    """
+
+    from pypath.omnipath.server import run
+    import pypath.share.session as session_mod
+
+    def __init__(self):
+
+        session_mod.Logger.__init__(self, name = 'server')
+        run.BaseServer.__init__(self)
+
+    attrs['__init__'] = __init__
+
+    return type('Server', (run.BaseServer,), attrs)()
+
+
+@pytest.fixture
+def make_request():
+    """
+    Factory of requests to the web service, see ``_Request``.
+    """
+
+    return _Request
+
+
+@pytest.fixture
+def make_server():
+    """
+    Factory of web services with the query handlers and settings provided
+    as keyword arguments.
+    """
+
+    return _server
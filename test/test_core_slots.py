@@ -0,0 +1,73 @@
+"""Compact entities, evidences and interactions."""
+
+import sys
+import pickle
+
+
+def _interaction():
+    import pypath.core.entity as entity
+    import pypath.core.evidence as evidence
+    import pypath.core.interaction as interaction
+    import pypath.internals.resource as resource_formats
+
+    a, b = (
+        entity.Entity(
+            identifier,
+            id_type = 'pubchem',
+            entity_type = 'small_molecule',
+            taxon = 0,
+        )
+        for identifier in ('1', '2')
+    )
+    resource = resource_formats.NetworkResource(
+        name = 'Resource',
+        interaction_type = 'post_translational',
+    )
+    ia = interaction.Interaction(a, b)
+    ia.add_evidence(
+        evidence.Evidences((
+            evidence.Evidence(resource = resource, references = ['12345']),
+        )),
+        direction = (a, b),
+    )
+
+    return ia
+
+
+def test_no_dict():
+
+    ia = _interaction()
+    ev = next(iter(ia.get_evidences()))
+
+    for obj in (ia, ia.a, ia.evidences, ev, next(iter(ev.references))):
+
+        assert not hasattr(obj, '__dict__')
+
+
+def test_interned():
+
+    import pypath.core.entity as entity
+    import pypath.internals.refs as refs
+
+    a = entity.Entity(
+        ''.join(['12', '3']),
+        id_type = ''.join(['pub', 'chem']),
+        entity_type = 'small_molecule',
+        taxon = 0,
+    )
+
+    assert a.identifier is sys.intern('123')
+    assert a.id_type is sys.intern('pubchem')
+    assert refs.Reference(12345) is refs.Reference(' 12345')
+
+
+def test_pickle():
+
+    ia = _interaction()
+    ia2 = pickle.loads(pickle.dumps(ia))
+    ev = next(iter(ia2.get_evidences()))
+
+    assert ia2 == ia
+    assert ia2.a.label == '1'
+    assert ev.resource.name == 'Resource'
+    assert next(iter(ev.references)).pmid == '12345'
@@ -0,0 +1,42 @@
+"""Batch construction of entities."""
+
+
+def test_from_many():
+    import pypath.core.entity as entity
+
+    cache = {}
+    entities = entity.Entity.from_many(
+        ['1', '2', '1'],
+        entity_type = 'small_molecule',
+        id_type = 'pubchem',
+        taxon = 0,
+        cache = cache,
+    )
+
+    assert [e.identifier for e in entities] == ['1', '2', '1']
+    assert entities[0] is entities[2]
+    assert entities[0] == entity.Entity(
+        '1',
+        entity_type = 'small_molecule',
+        id_type = 'pubchem',
+        taxon = 0,
+    )
+    assert entities[0].key == entities[0]._key
+    assert len(cache) == 2
+
+
+def test_from_many_attrs():
+    import pypath.core.entity as entity
+
+    a, b = entity.Entity.from_many(
+        ('1', '1'),
+        entity_type = ('small_molecule', 'small_molecule'),
+        id_type = ('pubchem', 'pubchem'),
+        taxon = (0, 0),
+        attrs = ({'x': 1}, None),
+    )
+
+    assert a == b
+    assert a is not b
+    assert a.attrs == {'x': 1}
+    assert b.attrs == {}
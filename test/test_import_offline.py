@@ -0,0 +1,36 @@
+"""Importing the ID translation modules without network access."""
+
+
+def test_import_no_network():
+    import sys
+    import subprocess
+
+    # only connections and name lookups, local sockets are fine
+    code = (
+        'import sys\n'
+        'events = []\n'
+        'sys.addaudithook(\n'
+        '    lambda e, a:\n'
+        '        e in ("socket.connect", "socket.getaddrinfo") and\n'
+        '        events.append(e)\n'
+        ')\n'
+        'import pypath.utils.mapping, pypath.utils.taxonomy\n'
+        'print(len(events))\n'
+    )
+    proc = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output = True,
+        text = True,
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip().split('\n')[-1] == '0'
+
+
+def test_lazy_attributes():
+    import pypath.utils.taxonomy as taxonomy
+    import pypath.utils.mapping as mapping
+
+    assert taxonomy.phosphoelm_taxids[9606] == 'Homo sapiens'
+    assert isinstance(taxonomy.taxids2, dict)
+    assert 'pubchem' in mapping.SMALLMOLECULE_ID_TYPES
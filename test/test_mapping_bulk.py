@@ -0,0 +1,64 @@
+"""Translation of columns of identifiers."""
+
+
+def _mapper():
+    import pypath.utils.mapping as mapping
+
+    mapper = mapping.Mapper()
+    key = mapper.get_table_key('hgnc', 'entrez', 9606)
+    mapper.tables[key] = mapping.MappingTable(
+        data = {'HGNC:1': {'1'}, 'HGNC:2': {'2', '3'}},
+        id_type = 'hgnc',
+        target_id_type = 'entrez',
+        ncbi_tax_id = 9606,
+    )
+
+    return mapper
+
+
+NAMES = ['HGNC:1', 'hgnc:2', 'X', 'HGNC:1']
+
+
+def test_map_names_bulk():
+    import pandas as pd
+
+    mapper = _mapper()
+    names = pd.Series(NAMES, index = list('abcd'))
+    pairs = mapper.map_names_bulk(names, 'hgnc', 'entrez')
+
+    assert list(pairs.index) == ['a', 'b', 'b', 'd']
+    assert sorted(zip(pairs.source, pairs.target)) == [
+        ('HGNC:1', '1'),
+        ('HGNC:1', '1'),
+        ('hgnc:2', '2'),
+        ('hgnc:2', '3'),
+    ]
+
+
+def test_map_names_bulk_sets():
+    import numpy as np
+    import pyarrow as pa
+
+    mapper = _mapper()
+    expected = [mapper.map_name(name, 'hgnc', 'entrez') for name in NAMES]
+
+    for names in (NAMES, np.array(NAMES, dtype = object), pa.array(NAMES)):
+
+        result = mapper.map_names_bulk(
+            names,
+            'hgnc',
+            'entrez',
+            explode = False,
+        )
+
+        assert list(result) == expected
+
+
+def test_map_names_bulk_copies():
+
+    mapper = _mapper()
+    result = mapper.map_names_bulk(NAMES, 'hgnc', 'entrez', explode = False)
+    result[0].add('999')
+
+    assert result[3] == {'1'}
+    assert mapper.map_name('HGNC:1', 'hgnc', 'entrez') == {'1'}
@@ -0,0 +1,99 @@
+"""Precomposed tables for ID translation in two steps."""
+
+
+def _mapper(tables):
+    import pypath.utils.mapping as mapping
+
+    mapper = mapping.Mapper()
+
+    for (id_type, target_id_type), data in tables.items():
+
+        table = mapping.MappingTable(
+            data = data,
+            id_type = id_type,
+            target_id_type = target_id_type,
+            ncbi_tax_id = 9606,
+        )
+        mapper.tables[table.key] = table
+
+    return mapper
+
+
+_TABLES = {
+    ('idx', 'idy'): {'x1': {'y1'}, 'x2': {'y2', 'y3'}, 'x3': {'y9'}},
+    ('idy', 'idz'): {'y1': {'z1'}, 'y2': {'z2'}, 'y3': {'z3', 'z1'}},
+}
+
+
+def test_compose_table(tmp_path):
+    import pypath.share.settings as settings
+    import pypath.utils.mapping as mapping
+
+    with settings.settings.context(
+        cachedir = str(tmp_path),
+        mapping_use_cache = True,
+    ):
+
+        mapper = _mapper(_TABLES)
+        table = mapper.compose_table('idx', 'idz', by_id_type = 'idy')
+        key = mapping.MappingTableKey('idx', 'idz', 9606)
+
+        assert dict(table.items()) == {
+            'x1': {'z1'},
+            'x2': {'z1', 'z2', 'z3'},
+        }
+        assert mapper.chains[key] == 'idy'
+        assert mapper.which_table('idx', 'idz', load = False) is table
+        assert mapper.chain_map('x2', 'idx', 'idy', 'idz') == {
+            'z1', 'z2', 'z3',
+        }
+        # composed via another ID type, the table is not used
+        via_idw = _mapper({
+            ('idx', 'idw'): {'x2': {'w2'}},
+            ('idw', 'idz'): {'w2': {'z7'}},
+        })
+        mapper.tables.update(via_idw.tables)
+        assert mapper.chain_map('x2', 'idx', 'idw', 'idz') == {'z7'}
+
+        # loaded again from the cache, without the original tables
+        mapper = _mapper({})
+        mapper.chains[key] = 'idy'
+        table = mapper.which_table('idx', 'idz')
+
+        assert table['x1'] == {'z1'}
+
+        # a corrupt cache file is removed and the table composed again
+        arrowfile = '%s.arrow' % mapper._chain_cachefile(
+            'idx', 'idy', 'idz', 9606,
+        )
+
+        with open(arrowfile, 'wb') as fp:
+
+            fp.write(b'ARROW1')
+
+        mapper = _mapper(_TABLES)
+        table = mapper.compose_table('idx', 'idz', by_id_type = 'idy')
+
+        assert table['x2'] == {'z1', 'z2', 'z3'}
+        assert mapper._read_chain_cache(arrowfile[:-6])['x1'] == {'z1'}
+
+
+def test_cheapest_path(tmp_path):
+    import pypath.share.settings as settings
+
+    with settings.settings.context(
+        cachedir = str(tmp_path),
+        mapping_use_cache = False,
+    ):
+
+        mapper = _mapper(_TABLES)
+        table = mapper.compose_table(
+            'idx',
+            'idz',
+            by_id_type = ['idw', 'idy'],
+        )
+
+        assert table['x3'] == set()
+        assert table['x2'] == {'z1', 'z2', 'z3'}
+        assert mapper._chain_cost('idx', 'idy', 'idz', 9606) == (0, 3)
+        assert mapper._chain_cost('idx', 'idw', 'idz', 9606)[0] == 2
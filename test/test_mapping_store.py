@@ -0,0 +1,79 @@
+"""Memory mapped storage of ID translation tables."""
+
+import pickle
+
+import pytest
+
+
+DATA = {
+    'HGNC:1': {'1'},
+    'HGNC:2': {'2', '3'},
+    'HGNC:3': {'3'},
+    'HGNC:ö': set(),
+}
+
+
+def test_mapping_store(tmp_path):
+    import pypath.utils.mapping_store as mapping_store
+
+    path = str(tmp_path / 'table.arrow')
+    mapping_store.write(DATA, path)
+    store = mapping_store.MappingStore(path)
+
+    assert len(store) == len(DATA)
+    assert dict(store.items()) == DATA
+    assert set(store) == set(DATA)
+    assert store['HGNC:2'] == {'2', '3'}
+    assert 'HGNC:ö' in store
+    assert 'HGNC:4' not in store
+    assert 4 not in store
+    assert store.get('HGNC:4') is None
+
+    with pytest.raises(KeyError):
+
+        store['HGNC:4']
+
+    assert pickle.loads(pickle.dumps(store))['HGNC:1'] == {'1'}
+
+
+def test_mapping_store_storable():
+    import pypath.utils.mapping_store as mapping_store
+
+    assert mapping_store.storable(DATA)
+    assert not mapping_store.storable({'a': {1}})
+    assert not mapping_store.storable({1: {'a'}})
+
+
+def test_mapping_table_from_store(tmp_path):
+    import pypath.utils.mapping as mapping
+    import pypath.utils.mapping_store as mapping_store
+
+    path = str(tmp_path / 'table.arrow')
+    mapping_store.write(DATA, path)
+    table = mapping.MappingTable(
+        data = mapping_store.MappingStore(path),
+        id_type = 'hgnc',
+        target_id_type = 'entrez',
+        ncbi_tax_id = 9606,
+    )
+    reverse = mapping.Mapper.reverse_mapping(table)
+
+    assert table['HGNC:2'] == {'2', '3'}
+    assert table['HGNC:4'] == set()
+    assert reverse['3'] == {'HGNC:2', 'HGNC:3'}
+
+
+def test_mapping_store_corrupt(tmp_path):
+    import pypath.utils.mapping_store as mapping_store
+
+    path = tmp_path / 'table.arrow'
+    mapping_store.write(DATA, str(path))
+
+    # no temporary files left behind
+    assert [p.name for p in tmp_path.iterdir()] == ['table.arrow']
+    assert mapping_store.read(str(path))['HGNC:1'] == {'1'}
+
+    path.write_bytes(path.read_bytes()[:100])
+
+    assert mapping_store.read(str(path)) is None
+    assert not path.exists()
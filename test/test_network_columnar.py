@@ -0,0 +1,42 @@
+"""Arrow storage of the network."""
+
+
+def test_arrow_roundtrip(tmp_path, make_network):
+    from pypath.core import network, network_columnar
+
+    net = make_network(
+        [
+            ['1', '2', '+', '1', '12345;23456'],
+            ['2', '3', '-', '1', ''],
+            ['3', '1', '', '0', '34567'],
+        ],
+        references = (4, ';'),
+    )
+    path = str(tmp_path / 'network.arrow')
+
+    net.save_to_arrow(path)
+    net2 = network.Network.from_arrow(path)
+
+    assert set(net2.interactions) == set(net.interactions)
+    assert set(net2.nodes) == set(net.nodes)
+    assert net2.nodes_by_label.keys() == net.nodes_by_label.keys()
+
+    for key, ia in net.interactions.items():
+
+        ia2 = net2.interactions[key]
+
+        assert ia2 == ia
+        assert ia2.get_references() == ia.get_references()
+        assert ia2.get_resource_names() == ia.get_resource_names()
+        assert ia2.is_directed() == ia.is_directed()
+        assert ia2.is_stimulation() == ia.is_stimulation()
+        assert ia2.is_inhibition() == ia.is_inhibition()
+
+    tables = network_columnar.read_tables(path)
+
+    assert tables['interactions'].num_rows == 3
+
+    net3 = network.Network()
+    net3.load_from_arrow(path, references = False)
+
+    assert all(not ia.get_references() for ia in net3)
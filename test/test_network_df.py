@@ -0,0 +1,68 @@
+"""Columnwise construction of the interactions data frame."""
+
+import pytest
+
+
+def _value(v):
+    import pandas as pd
+
+    if isinstance(v, set):
+
+        return tuple(sorted(v))
+
+    # the data frame has NaN where the records have None
+    return None if pd.api.types.is_scalar(v) and pd.isna(v) else v
+
+
+def _rows(records):
+
+    return sorted(
+        (tuple(_value(v) for v in rec) for rec in records),
+        key = repr,
+    )
+
+
+@pytest.mark.parametrize('by_source', [False, True])
+@pytest.mark.parametrize('with_references', [False, True])
+def test_make_df(by_source, with_references, make_resource):
+    from pypath.core import network
+
+    rows = [
+        ['1', '2', '+', '1', '12345;23456'],
+        ['2', '3', '-', '1', ''],
+        ['3', '1', '', '0', '34567'],
+        ['3', '4', '', '1', ''],
+    ]
+    net = network.Network(
+        resources = [
+            make_resource(name, rows, references = (4, ';'))
+            for name in ('Resource1', 'Resource2')
+        ],
+    )
+    net.make_df(by_source = by_source, with_references = with_references)
+    expected = list(net.generate_df_records(
+        by_source = by_source,
+        with_references = with_references,
+    ))
+
+    assert list(net.df.columns) == list(expected[0]._fields)
+    assert _rows(net.df.itertuples(index = False)) == _rows(expected)
+    assert net.df.id_a.dtype == 'category'
+    assert net.df.effect.dtype == 'int8'
+    assert _rows(net.records) == _rows(expected)
+
+
+def test_records_outdated(make_network):
+
+    rows = [['1', '2', '+', '1'], ['2', '3', '-', '1']]
+    net = make_network(rows)
+    net.make_df()
+    net.remove_interaction('1', '2')
+
+    # generated now they would not match the data frame
+    assert net.records is None
+    assert len(net.df) == 2
+
+    net.make_df()
+
+    assert len(net.records) == len(net.df) == 1
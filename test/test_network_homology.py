@@ -0,0 +1,47 @@
+"""Translation of networks by orthology."""
+
+
+def _edges(net):
+
+    return {
+        (
+            ia.a.identifier,
+            ia.b.identifier,
+            ia.is_directed(),
+            ia.is_stimulation(),
+            ia.is_inhibition(),
+        )
+        for ia in net
+    }
+
+
+def test_translate_entities(make_network):
+    import pypath.core.entity as entity
+
+    net = make_network([['1', '2', '+', '1']])
+    ia = next(iter(net))
+    x, y = entity.Entity.from_many(
+        ['4', '3'],
+        id_type = 'pubchem',
+        entity_type = 'small_molecule',
+        taxon = 0,
+    )
+    new = ia.translate_entities(x, y)
+
+    assert (new.a.identifier, new.b.identifier) == ('3', '4')
+    assert new.direction[(x, y)]
+    assert not new.direction[(y, x)]
+    assert new.positive[(x, y)]
+
+
+def test_homology_translate_not_organism_specific(make_network):
+
+    net = make_network([
+        ['1', '2', '+', '1'],
+        ['2', '3', '-', '1'],
+        ['3', '1', '', '0'],
+    ])
+    new = net.homology_translate(taxon = 10090)
+
+    assert _edges(new) == _edges(net)
+    assert set(new.nodes) == set(net.nodes)
@@ -0,0 +1,64 @@
+"""Array based index of the network graph."""
+
+import random
+
+
+def _network(make_resource):
+    from pypath.core import network
+
+    rnd = random.Random(2)
+    resources = []
+
+    for name, directed in (('Directed', True), ('Undirected', False)):
+
+        rows = [
+            [str(rnd.randint(1, 20)), str(rnd.randint(1, 20)), rnd.choice('+-')]
+            for _ in range(60)
+        ]
+        resources.append(
+            make_resource(
+                name,
+                rows,
+                is_directed = directed,
+                sign = (2, '+', '-') if directed else False,
+            )
+        )
+
+    return network.Network(resources = resources, allow_loops = True)
+
+
+def test_adjacency(make_resource):
+
+    net = _network(make_resource)
+    idx = net.index
+
+    assert idx.alive.sum() == len(net.interactions)
+
+    for entity in net.nodes.values():
+
+        for mode in ('OUT', 'IN'):
+
+            assert set(idx.neighbors(entity, mode)) == set(
+                net.partners(entity, mode = mode, direction = True)
+            )
+
+        assert set(idx.neighbors(entity, 'ALL')) == set(
+            net.partners(entity, mode = 'ALL')
+        )
+
+    assert idx.has_resources('Undirected').sum() == sum(
+        'Undirected' in ia.get_resource_names()
+        for ia in net
+    )
+
+
+def test_sync(make_resource):
+
+    net = _network(make_resource)
+    idx = net.index
+    ia = next(iter(net))
+    net.remove_interaction(ia.a, ia.b)
+
+    assert net.index is idx
+    assert idx.alive.sum() == len(net.interactions)
+    assert ia.b not in idx.neighbors(ia.a)
@@ -0,0 +1,80 @@
+"""Loading network resources in worker processes."""
+
+import random
+
+
+def test_parallel_load(make_resource):
+    from pypath.core import network
+
+    rnd = random.Random(1)
+    resources = [
+        make_resource(
+            'Resource%u' % i,
+            [
+                [
+                    str(rnd.randint(1, 30)),
+                    str(rnd.randint(1, 30)),
+                    rnd.choice('+-'),
+                    str(rnd.randint(1, 999)),
+                    str(rnd.random()),
+                ]
+                for _ in range(100)
+            ],
+            is_directed = True,
+            references = (3, ';'),
+            extra_edge_attrs = {'score': (4, lambda x: float(x))},
+        )
+        for i in range(3)
+    ]
+
+    sequential = network.Network(resources = resources)
+    parallel = network.Network(resources = resources, workers = 2)
+
+    assert parallel.ecount == sequential.ecount > 0
+    assert parallel.vcount == sequential.vcount
+
+    for key, ia in sequential.interactions.items():
+
+        other = parallel.interactions[key]
+
+        assert other.direction == ia.direction
+        assert other.get_references() == ia.get_references()
+        assert other.get_resources() == ia.get_resources()
+
+    # the evidences refer to the resource objects of the main process
+    assert {
+        ev.resource.networkinput is res.networkinput
+        for ia in parallel
+        for ev in ia.evidences
+        for res in resources
+        if ev.resource.name == res.name
+    } == {True}
+
+
+def test_parallel_keep_raw(make_resource):
+    from pypath.core import network
+
+    resources = [
+        make_resource('Resource%u' % i, [[str(i), str(i + 1), '+', '1']])
+        for i in range(3)
+    ]
+    kept = []
+
+    class Network(network.Network):
+
+        def _add_resource(self, resource, **kwargs):
+
+            # `raw_data` is emptied after adding each resource
+            kept.append(set(self.raw_data))
+            network.Network._add_resource(self, resource, **kwargs)
+
+    for workers in (None, 2):
+
+        net = Network()
+        net.load(resources = resources, keep_raw = True, workers = workers)
+
+    assert kept == [
+        {res.networkinput.name}
+        for _ in range(2)
+        for res in resources
+    ]
@@ -0,0 +1,37 @@
+"""Path search in the network."""
+
+
+def _ids(paths):
+
+    return sorted(tuple(e.identifier for e in path) for path in paths)
+
+
+def test_find_paths(make_network):
+
+    net = make_network([
+        ['1', '2', '+', '1'],
+        ['2', '3', '-', '1'],
+        ['3', '1', '+', '1'],
+        ['1', '3', '', '0'],
+        ['3', '4', '+', '1'],
+    ])
+
+    # the directed evidence 3 -> 1 overrides the undirected one
+    assert _ids(net.find_paths('1', '3', maxlen = 2)) == [('1', '2', '3')]
+    assert _ids(net.find_paths('1', '3', maxlen = 2, direction = False)) == [
+        ('1', '3'),
+    ]
+    assert _ids(net.find_paths('1', maxlen = 3, effect = 'positive')) == []
+    assert _ids(net.find_paths('2', maxlen = 2)) == [
+        ('2', '3', '1'),
+        ('2', '3', '4'),
+    ]
+    assert _ids(
+        net.find_paths('1', loops = True, minlen = 2, maxlen = 3)
+    ) == [('1', '2', '3', '1')]
+    assert _ids(net.find_paths('1', maxlen = 2, mode = 'ALL')) == [
+        ('1', '2', '3'),
+        ('1', '3', '2'),
+        ('1', '3', '4'),
+    ]
+    assert len(net.find_paths('1', maxlen = 2, mode = 'ALL', max_paths = 1)) == 1
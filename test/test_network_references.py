@@ -0,0 +1,78 @@
+"""Interactions by literature references and high-throughput filtering."""
+
+
+_ROWS = [
+    ['1', '2', '+', '1', '1001;1002'],
+    ['2', '3', '-', '1', '1001'],
+    ['3', '4', '', '0', '1001;1003'],
+    ['4', '5', '', '0', '1001'],
+    ['5', '6', '', '0', ''],
+    ['6', '7', '+', '1', '1003'],
+]
+
+
+def _htp_interactions(net, threshold, ignore_directed):
+
+    counts = net.numof_interactions_per_reference()
+    htp_refs = {ref for ref, cnt in counts.items() if cnt > threshold}
+
+    return {
+        key
+        for key, ia in net.interactions.items()
+        if (
+            (not ignore_directed or not ia.is_directed()) and
+            not ia.get_references() - htp_refs
+        )
+    }
+
+
+def _pmids(refs):
+
+    return {ref.pmid for ref in refs}
+
+
+def test_reference_index(make_network):
+
+    net = make_network(_ROWS, references = (4, ';'))
+
+    counts = {
+        ref.pmid: cnt
+        for ref, cnt in net.numof_interactions_per_reference().items()
+    }
+
+    assert counts == {'1001': 4, '1002': 1, '1003': 2}
+    assert _pmids(net.htp_references(threshold = 1)) == {'1001', '1003'}
+    assert _pmids(net.htp_references(threshold = 3)) == {'1001'}
+    assert not net.htp_references(threshold = 4)
+
+    for threshold in range(5):
+
+        for ignore_directed in (False, True):
+
+            assert (
+                net.htp_interactions(
+                    threshold = threshold,
+                    ignore_directed = ignore_directed,
+                ) ==
+                _htp_interactions(net, threshold, ignore_directed)
+            )
+
+
+def test_reference_index_update(make_network):
+
+    net = make_network(_ROWS, references = (4, ';'))
+    by_ref = net.interactions_by_reference()
+    net.remove_interaction('3', '4')
+    net.remove_interaction('6', '7')
+
+    counts = {
+        ref.pmid: cnt
+        for ref, cnt in net.numof_interactions_per_reference().items()
+    }
+
+    assert counts == {'1001': 3, '1002': 1}
+    assert len(by_ref) == 3
+
+    net.remove_htp(threshold = 2)
+
+    assert {(ia.a.identifier, ia.b.identifier) for ia in net} == {('1', '2')}
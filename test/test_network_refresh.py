@@ -0,0 +1,43 @@
+"""Removing and reloading one resource of the network."""
+
+
+def _pairs(net):
+
+    return {(ia.a.identifier, ia.b.identifier) for ia in net}
+
+
+def test_remove_refresh_resource(make_resource):
+    from pypath.core import network
+
+    net = network.Network(
+        resources = [
+            make_resource('Resource1', [
+                ['1', '2', '+', '1'],
+                ['2', '3', '-', '1'],
+            ]),
+            make_resource('Resource2', [
+                ['2', '3', '', '0'],
+                ['3', '4', '+', '1'],
+            ]),
+        ],
+    )
+
+    assert _pairs(net) == {('1', '2'), ('2', '3'), ('3', '4')}
+
+    net.remove_resource('Resource1')
+
+    assert _pairs(net) == {('2', '3'), ('3', '4')}
+    assert set(net.nodes) == {'2', '3', '4'}
+    assert net.resource_names == {'Resource2'}
+    assert not net.interactions[
+        (net.nodes['2'], net.nodes['3'])
+    ].is_directed()
+
+    net.refresh_resource(make_resource('Resource2', [['4', '5', '+', '1']]))
+
+    assert _pairs(net) == {('4', '5')}
+    assert set(net.nodes) == {'4', '5'}
+    assert (
+        net._interaction_keys_by_resource()['Resource2'] ==
+        set(net.interactions)
+    )
@@ -0,0 +1,79 @@
+"""Summaries of the network by resources."""
+
+
+_RESOURCES = (
+    ('Resource1', [['1', '2', '+', '1'], ['2', '3', '-', '1']]),
+    ('Resource2', [['2', '3', '', '0'], ['3', '4', '+', '1']]),
+    ('Resource3', [['4', '5', '', '1'], ['1', '2', '', '0']]),
+)
+
+
+def test_shared_unique_foreach():
+    import pypath.share.common as common
+    from pypath.core import network
+
+    dct = {'a': {1, 2, 3}, 'b': {3, 4}, 'c': {4, 5}, 'd': set()}
+
+    for op in ('shared', 'unique'):
+
+        assert (
+            network.NetworkEntityCollection._shared_unique_foreach(dct, op)
+                ==
+            common.shared_unique_foreach(dct, op = op)
+        )
+
+
+def test_incremental_summaries(make_resource):
+    from pypath.core import network
+
+    net = network.Network(
+        resources = [make_resource(*r) for r in _RESOURCES[:2]],
+    )
+    net.update_summaries()
+    net.load(resources = make_resource(*_RESOURCES[2]))
+    net.update_summaries()
+
+    full = network.Network(resources = [make_resource(*r) for r in _RESOURCES])
+    full.update_summaries()
+
+    assert net.summaries == full.summaries
+
+    net.remove_resource('Resource3')
+    net.update_summaries()
+    full = network.Network(
+        resources = [make_resource(*r) for r in _RESOURCES[:2]],
+    )
+    full.update_summaries()
+
+    assert net.summaries == full.summaries
+
+
+def test_incremental_summaries_secondary(make_resource):
+    from pypath.core import network
+
+    resources = [
+        make_resource(*_RESOURCES[0]),
+        make_resource('Resource4', [['2', '3', '+', '1']], via = 'Primary'),
+    ]
+    collect_args = {'via': None}
+
+    net = network.Network(resources = resources[:1])
+    net.update_summaries(collect_args = collect_args)
+    net.load(resources = resources[1])
+    net.update_summaries(collect_args = collect_args)
+
+    full = network.Network(resources = resources)
+    full.update_summaries(collect_args = collect_args)
+
+    assert net.summaries == full.summaries
+    assert any(
+        rec[('resource', 'Resource')] == 'Resource4'
+        for rec in net.summaries
+    )
+
+    net.remove_resource('Resource4')
+    net.update_summaries(collect_args = collect_args)
+    full = network.Network(resources = resources[:1])
+    full.update_summaries(collect_args = collect_args)
+
+    assert net.summaries == full.summaries
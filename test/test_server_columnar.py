@@ -0,0 +1,34 @@
+"""Arrow storage of the web service tables."""
+
+import pandas as pd
+
+
+def test_arrow_roundtrip(tmp_path):
+    from pypath.omnipath.server import columnar
+
+    df = pd.DataFrame({
+        'source': ['P00533', 'P04637', 'P00533'],
+        'target': ['P04637', 'Q00987', 'P01112'],
+        'is_directed': [1, 0, 1],
+        'sources': ['SIGNOR;SPIKE', 'HPRD', 'SIGNOR;SPIKE'],
+        'dorothea_level': ['A;B', None, 'C'],
+    })
+    path = str(tmp_path / 'interactions.arrow')
+
+    columnar.write_arrow(df, path, 'interactions')
+    table = columnar.read_arrow(path)
+    result = columnar.to_pandas(table, 'interactions')
+
+    assert str(table.schema.field('sources').type).startswith('list')
+    assert list(result.columns) == list(df.columns)
+    assert list(result.sources) == list(df.sources)
+    assert list(result.dorothea_level[[0, 2]]) == ['A;B', 'C']
+    assert pd.isnull(result.dorothea_level[1])
+    assert list(result.is_directed) == [1, 0, 1]
+
+
+def test_arrow_path():
+    from pypath.omnipath.server import columnar
+
+    assert columnar.arrow_path('a/b.tsv.gz') == 'a/b.arrow'
+    assert columnar.arrow_path('a/b.tsv') == 'a/b.arrow'
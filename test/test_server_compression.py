@@ -0,0 +1,24 @@
+"""Compression of the web service responses."""
+
+import gzip
+
+
+def test_negotiate():
+    from pypath.omnipath.server import compression
+
+    assert compression.negotiate(b'gzip, deflate') == 'gzip'
+    assert compression.negotiate('br') is None
+    assert compression.negotiate(None) is None
+    assert compression.negotiate('zstd;q=0, gzip;q=0.5') == 'gzip'
+    assert compression.negotiate('*', offered = ['gzip']) == 'gzip'
+    assert compression.negotiate('gzip;q=0', offered = ['gzip']) is None
+
+
+def test_compress_chunks():
+    from pypath.omnipath.server import compression
+
+    chunks = ['source\ttarget\n', b'P00533\tP04637\n', '']
+    body = b''.join(compression.compress_chunks(chunks, 'gzip'))
+
+    assert gzip.decompress(body) == b'source\ttarget\nP00533\tP04637\n'
+    assert gzip.decompress(compression.compress('abc', 'gzip')) == b'abc'
@@ -0,0 +1,47 @@
+"""Batched encoding of the web service responses."""
+
+import json
+
+import pandas as pd
+
+
+def _table():
+
+    return pd.DataFrame({
+        'source': ['P00533', 'P04637', 'P00533'],
+        'is_directed': [1, 0, 1],
+        'sources': pd.Series(
+            ['SIGNOR;SPIKE', 'HPRD', None],
+            dtype = 'category',
+        ),
+        'references': ['SIGNOR:123;SPIKE:456', None, 'HPRD:9'],
+    })
+
+
+def test_encode_tsv_batches():
+    from pypath.omnipath.server.run import TableServer
+
+    tbl = _table()
+    chunks = list(TableServer._encode_dataframe(tbl, batch_size = 2))
+
+    assert len(chunks) == 2
+    assert ''.join(chunks) == tbl.to_csv(sep = '\t', index = False)
+
+
+def test_encode_json_batches():
+    from pypath.omnipath.server.run import TableServer
+
+    tbl = _table()
+    chunks = list(
+        TableServer._encode_dataframe(tbl, json_format = True, batch_size = 1)
+    )
+    result = json.loads(''.join(chunks))
+
+    assert len(chunks) == 5
+    assert result[0]['sources'] == ['SIGNOR', 'SPIKE']
+    assert result[1]['references'] == []
+    assert result[2]['sources'] == []
+    assert result[2]['is_directed'] == 1
+    assert ''.join(
+        TableServer._encode_dataframe(tbl.head(0), json_format = True)
+    ) == '[]'
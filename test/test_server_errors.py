@@ -0,0 +1,23 @@
+"""Error pages of the web service."""
+
+
+def _boom(self, req):
+
+    raise ValueError('boom')
+
+
+def test_error_uncompressed(make_server, make_request):
+
+    server = make_server(
+        query_types = {'boom'},
+        compression = ['gzip'],
+        boom = _boom,
+    )
+    request = make_request('/boom', headers = {'Accept-Encoding': 'gzip'})
+    server.render_GET(request)
+
+    assert request.done.is_set()
+    assert request.code == 500
+    assert 'Content-Encoding' not in request.headers
+    assert b'500' in request.body
+    assert request.headers['Content-Length'] == str(len(request.body))
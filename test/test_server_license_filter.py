@@ -0,0 +1,50 @@
+"""Precomputed license filters of the web service tables."""
+
+import numpy as np
+import pandas as pd
+
+
+def test_make_license_filter():
+    from pypath.omnipath.server.run import TableServer
+    import pypath.resources as resources_mod
+
+    res_ctrl = resources_mod.get_controller()
+    tbl = pd.DataFrame({
+        'sources': ['SIGNOR;KEGG', 'KEGG', 'SIGNOR', None],
+        'references': ['SIGNOR:1;KEGG:2', None, 'SIGNOR:3', None],
+    }).astype('category')
+    enabled = frozenset(
+        res
+        for res in ('SIGNOR', 'KEGG')
+        if res_ctrl.license(res).enables('commercial')
+    )
+
+    mask, columns = TableServer._make_license_filter(
+        tbl,
+        tbl.sources,
+        enabled,
+        simple = False,
+        prefix_col = 'references',
+    )
+
+    expected = [
+        bool(set(str(s).split(';')) & enabled) if isinstance(s, str) else False
+        for s in tbl.sources
+    ]
+
+    assert mask.tolist() == expected
+    assert not mask[3]
+
+    for i in np.where(mask)[0]:
+
+        kept = set(columns['sources'][i].split(';'))
+
+        assert kept <= enabled
+
+        if isinstance(columns['references'][i], str):
+
+            assert {
+                ref.split(':')[0]
+                for ref in columns['references'][i].split(';')
+                if ref
+            } <= kept
@@ -0,0 +1,55 @@
+"""Timings of the web service requests."""
+
+
+def test_request_timer():
+    from pypath.omnipath.server import metrics
+
+    timer = metrics.RequestTimer('interactions')
+
+    with timer.phase('filter'):
+
+        sum(range(1000))
+
+    body = b''.join(timer.chunks(['source\ttarget\n', b'P00533\tP04637\n']))
+    total = timer.finish()
+
+    assert timer.bytes == len(body) == 28
+    assert set(timer.phases) == {'filter', 'serialize', 'write'}
+    assert abs(sum(timer.phases.values()) - total) < 1e-6
+    assert timer.finish() == total
+
+
+def test_render():
+    from pypath.omnipath.server import metrics
+
+    m = metrics.Metrics()
+    timer = metrics.RequestTimer('enzsub')
+    timer.rows_in, timer.rows_out = 100, 7
+    m.observe(timer)
+    text = m.render({'queries_queued': ('Queued.', {(('query', 'enzsub'),): 2})})
+    lines = text.split('\n')
+
+    assert 'pypath_server_requests_total{query="enzsub"} 1' in lines
+    assert 'pypath_server_rows_out_total{query="enzsub"} 7' in lines
+    assert (
+        'pypath_server_request_duration_seconds_bucket'
+        '{query="enzsub",le="+Inf"} 1'
+    ) in lines
+    assert 'pypath_server_queries_queued{query="enzsub"} 2' in lines
+
+
+def test_metrics_query_type():
+    import types
+
+    from pypath.omnipath.server.run import TableServer
+
+    server = types.SimpleNamespace(
+        query_types={'interactions', 'status'},
+        data={'enzsub': None},
+    )
+
+    assert TableServer._metrics_query_type(server, 'interactions') == (
+        'interactions'
+    )
+    assert TableServer._metrics_query_type(server, 'enzsub') == 'enzsub'
+    assert TableServer._metrics_query_type(server, 'wp-login.php') == 'other'
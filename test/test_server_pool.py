@@ -0,0 +1,125 @@
+"""Processing the queries of the web service in a thread pool."""
+
+import json
+import threading
+
+import pytest
+
+pytest.importorskip('twisted')
+
+
+class _Reactor:
+    """
+    Runs at once what the reactor would run, as the reactor does not run
+    in the tests.
+    """
+
+    def callWhenRunning(self, f, *args, **kwargs):
+
+        f(*args, **kwargs)
+
+    def addSystemEventTrigger(self, *args, **kwargs):
+
+        pass
+
+    def callFromThread(self, f, *args, **kwargs):
+
+        f(*args, **kwargs)
+
+
+@pytest.fixture
+def pool_server(monkeypatch, make_server):
+    from pypath.omnipath.server import run
+
+    monkeypatch.setattr(run, 'twisted_reactor', _Reactor())
+    servers = []
+
+    def make(**attrs):
+
+        attrs.setdefault('query_types', {'interactions', 'status'})
+        attrs.setdefault('threaded_queries', {'interactions'})
+        server = make_server(workers = 2, **attrs)
+        servers.append(server)
+
+        return server
+
+    yield make
+
+    for server in servers:
+
+        server._pool.stop()
+
+
+def test_pool_dispatch(pool_server, make_request):
+
+    threads = []
+
+    def interactions(self, req):
+
+        threads.append(threading.current_thread().name)
+
+        return 'source\ttarget\nP00533\tP04637\n'
+
+    server = pool_server(interactions = interactions)
+    request = make_request('/interactions')
+    server.render_GET(request)
+
+    assert request.done.wait(5)
+    assert request.body == b'source\ttarget\nP00533\tP04637\n'
+    assert request.code == 200
+    assert 'pypath-server' in threads[0]
+
+
+def test_status(pool_server, make_request):
+
+    release = threading.Event()
+
+    def interactions(self, req):
+
+        release.wait(5)
+
+        return 'source\ttarget\n'
+
+    def status(server, **args):
+
+        request = make_request('/status', args = args)
+        server.render_GET(request)
+
+        assert request.done.is_set()
+
+        return request.body.decode('utf-8')
+
+    server = pool_server(interactions = interactions, concurrency = 1)
+    requests = [make_request('/interactions') for _ in range(3)]
+
+    for request in requests:
+
+        server.render_GET(request)
+
+    assert json.loads(status(server, format = 'json')) == {
+        'interactions': {'running': 1, 'queued': 2},
+    }
+
+    release.set()
+
+    assert all(request.done.wait(5) for request in requests)
+    assert status(server) == 'query\trunning\tqueued\ninteractions\t0\t0'
+
+
+def test_pool_error(pool_server, make_request):
+
+    def interactions(self, req):
+
+        raise ValueError('boom')
+
+    server = pool_server(interactions = interactions, compression = ['gzip'])
+    request = make_request(
+        '/interactions',
+        headers = {'Accept-Encoding': 'gzip'},
+    )
+    server.render_GET(request)
+
+    assert request.done.wait(5)
+    assert request.code == 500
+    assert 'Content-Encoding' not in request.headers
+    assert b'500' in request.body
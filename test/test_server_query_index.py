@@ -0,0 +1,31 @@
+"""Inverted indexes of the web service tables."""
+
+import pandas as pd
+
+
+def test_inverted_index():
+    from pypath.omnipath.server import query_index
+
+    sources = pd.Series(['SIGNOR;SPIKE', 'HPRD', None, 'SPIKE'])
+    idx = query_index.InvertedIndex.from_columns(sources, sep = ';')
+
+    assert set(idx.keys()) == {'SIGNOR', 'SPIKE', 'HPRD'}
+    assert list(idx.rows({'SPIKE'})) == [0, 3]
+    assert list(idx.rows({'SIGNOR', 'HPRD', 'KEGG'})) == [0, 1]
+    assert idx.count('SPIKE') == 2
+    assert list(idx.isin({'HPRD'}, [1, 3])) == [True, False]
+
+
+def test_inverted_index_multiple_columns():
+    from pypath.omnipath.server import query_index
+
+    uniprot = pd.Series(['P00533', 'P04637', 'P00533'], dtype = 'category')
+    genesymbol = pd.Series(['EGFR', 'TP53', 'P00533'])
+    idx = query_index.InvertedIndex.from_columns(uniprot, genesymbol)
+
+    assert list(idx.rows({'P00533'})) == [0, 2]
+    assert list(idx.rows({'EGFR', 'TP53'})) == [0, 1]
+    assert list(query_index.intersect(None, idx.rows({'TP53'}))) == [1]
+    assert list(
+        query_index.intersect(idx.rows({'P00533'}), idx.rows({'EGFR'}))
+    ) == [0]
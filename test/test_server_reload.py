@@ -0,0 +1,43 @@
+"""Reloading the tables of the web service."""
+
+
+def test_reload_tables():
+    from pypath.omnipath.server.run import TableServer
+    import pypath.share.session as session_mod
+
+    servers = []
+    served = []
+
+    class Server(TableServer):
+
+        def __init__(self):
+
+            session_mod.Logger.__init__(self, name = 'server')
+            self.version = 0
+            self._cache = None
+            self._load_tables()
+
+        def _load_tables(self):
+
+            if servers:
+
+                # the queries meanwhile see the tables of the running server
+                served.append(servers[0].data)
+
+            self.version += 1
+            self.data = {'interactions': self.version}
+            self._arrow_tables = {}
+            self._indexes = {'interactions': self.version}
+            self._license_filters = {}
+            self._license_filter_groups = {}
+            self._resources_dict = {}
+            self._data_version = str(self.version)
+
+    server = Server()
+    servers.append(server)
+    server._reload_tables()
+
+    assert served[-1] == {'interactions': 1}
+    assert server.data == {'interactions': 2}
+    assert server._indexes == {'interactions': 2}
+    assert server._data_version == '2'
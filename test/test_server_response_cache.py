@@ -0,0 +1,63 @@
+"""Response cache of the web service."""
+
+
+def test_query_key():
+    from pypath.omnipath.server.response_cache import query_key
+
+    key1 = query_key(
+        ['interactions'],
+        {
+            b'resources': [b'SIGNOR,KEGG'],
+            b'fields': [b'sources,references'],
+            b'password': [b'secret'],
+        },
+    )
+    key2 = query_key(
+        ['interactions'],
+        {b'fields': [b'sources,references'], b'resources': [b'KEGG,SIGNOR']},
+    )
+    key3 = query_key(
+        ['interactions'],
+        {b'fields': [b'references,sources'], b'resources': [b'KEGG,SIGNOR']},
+    )
+
+    assert key1 == key2
+    assert key1 != key3
+    assert hash(key1) == hash(key2)
+
+
+def test_lru_eviction_and_spill(tmp_path):
+    from pypath.omnipath.server.response_cache import ResponseCache
+
+    cache = ResponseCache(
+        max_bytes = 10,
+        max_entry_bytes = 10,
+        spill_dir = str(tmp_path),
+    )
+    cache.set('a', b'aaaa')
+    cache.set('b', b'bbbb')
+    cache.get('a')
+    cache.set('c', b'cccc')
+    cache.set('large', b'x' * 11)
+
+    assert cache.size == 8
+    assert 'large' not in cache
+    assert cache.stats()['disk_entries'] == 1
+    assert cache.get('b') == b'bbbb'
+    assert cache.get('d') is None
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_collect():
+    from pypath.omnipath.server.response_cache import ResponseCache
+
+    cache = ResponseCache(max_bytes = 100, max_entry_bytes = 6)
+
+    assert list(cache.collect('a', ['ab', b'cd'])) == ['ab', b'cd']
+    assert cache.get('a') == b'abcd'
+    assert list(cache.collect('b', [b'abcd', b'efgh'])) == [b'abcd', b'efgh']
+    assert 'b' not in cache
@@ -0,0 +1,84 @@
+"""Memory budgeted cache of mapping and taxonomy tables."""
+
+
+def _table(n, prefix):
+    import pypath.utils.mapping as mapping
+
+    return mapping.MappingTable(
+        data = {f'{prefix}{i}': {f'P{i:05}'} for i in range(n)},
+        id_type = prefix,
+        target_id_type = 'uniprot',
+        ncbi_tax_id = 9606,
+    )
+
+
+def test_sizeof():
+    import pypath.share.tablecache as tablecache
+
+    small = _table(100, 'a')
+    large = _table(10000, 'a')
+
+    assert 0 < small.nbytes < large.nbytes
+    assert 50 < large.nbytes / small.nbytes < 200
+    assert tablecache.sizeof({'a': {'b'}}) > tablecache.sizeof({})
+
+
+def test_lru_eviction():
+    import pypath.share.tablecache as tablecache
+
+    tables = [_table(1000, prefix) for prefix in 'abc']
+    cache = tablecache.TableCache(
+        budget = int(tables[0].nbytes * 2.5),
+    )
+    ns = cache.namespace('mapping')
+    ns['a'] = tables[0]
+    ns['b'] = tables[1]
+    ns['a']
+    ns['c'] = tables[2]
+
+    assert set(ns) == {'a', 'c'}
+    assert cache.nbytes <= cache.budget
+    assert ns.stats()['evictions'] == 1
+    assert ns.stats()['tables'] == 2
+
+    cache.set_budget(1)
+
+    # the most recently used table is kept even above the budget
+    assert set(ns) == {'c'}
+
+
+def test_mapper_stats():
+    import pypath.utils.mapping as mapping
+
+    mapper = mapping.Mapper()
+    table = _table(10, 'a')
+    mapper.tables[table.key] = table
+
+    for _ in range(3):
+
+        mapper.which_table('a', 'uniprot', ncbi_tax_id = 9606)
+
+    stats = mapper.cache_stats()
+
+    assert stats['hits'] == 3
+    assert stats['misses'] == 0
+    assert stats['tables'] == 1
+    assert stats['nbytes'] == table.nbytes
+
+    del mapper.tables[table.key]
+
+    assert not mapper.has_mapping_table('a', 'uniprot', ncbi_tax_id = 9606)
+
+
+def test_which_table_reverse():
+    import pypath.utils.mapping as mapping
+
+    mapper = mapping.Mapper()
+    table = _table(10, 'a')
+    mapper.tables[table.key] = table
+
+    rev = mapper.which_table('uniprot', 'a', ncbi_tax_id = 9606)
+
+    assert rev.id_type == 'uniprot'
+    assert rev['P00001'] == {'a1'}
+    assert mapper._loaded_size('uniprot', 'a', 9606) == 10